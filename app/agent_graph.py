@@ -1,8 +1,10 @@
 from __future__ import annotations
+import asyncio
 import json
 import logging
+import operator
 import os
-from typing import Any, Dict, List, Optional, TypedDict
+from typing import Annotated, Any, Dict, List, Optional, Tuple, TypedDict
 
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import AzureChatOpenAI
@@ -14,6 +16,7 @@ from .schemas import (
     CompanySpec,
     MarketSnapshot,
     RetrievalSpec,
+    SectionDiff,
     SectionExtract,
     SourceRef,
 )
@@ -23,23 +26,42 @@ from .tools.yahoo_client import YahooClient
 logger = logging.getLogger(__name__)
 
 
+def _merge(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    return {**(left or {}), **(right or {})}
+
+
 class AgentState(TypedDict, total=False):
+    """Graph state.
+
+    FetchEDGAR and FetchYahoo run in parallel, so ``extracts``, ``diffs``,
+    ``market`` and ``messages`` have reducers: nodes return only what they
+    add and LangGraph merges the writes.
+    """
+
     query: str
     companies: List[CompanySpec]
     retrieval: RetrievalSpec
-    extracts: List[SectionExtract]
-    market: Dict[str, MarketSnapshot]
+    extracts: Annotated[List[SectionExtract], operator.add]
+    diffs: Annotated[Dict[str, SectionDiff], _merge]
+    market: Annotated[Dict[str, MarketSnapshot], _merge]
     analysis: Dict[str, str]
     combined_summary: str
     citations: List[SourceRef]
     markdown: str
-    messages: List[Dict[str, Any]]
+    messages: Annotated[List[Dict[str, Any]], operator.add]
     job_id: str
 
 
 _sec_client = SECTools()
 _yahoo_client = YahooClient()
 
+ANALYSIS_PREVIEW_CHARS = 2000
+EXTRACT_IN_FLIGHT = 4
+YAHOO_IN_FLIGHT = 4
+# Formularios anuales cuyo Item 1A / 3D se compara con el filing anterior
+DIFF_FORMS = ("10-K", "20-F")
+REPORT_SECTION_CHARS = 3000
+
 
 def _get_llm() -> Optional[AzureChatOpenAI]:
     endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -85,28 +107,35 @@ async def _llm_plan(query: str, companies: List[CompanySpec]) -> str:
 
 async def plan_node(state: AgentState) -> AgentState:
     plan = await _llm_plan(state.get("query", ""), state.get("companies", []))
-    messages = list(state.get("messages", []))
+    messages: List[Dict[str, Any]] = []
     messages.append({"role": "system", "content": plan})
     return {"messages": messages}
 
 
 async def resolve_entities(state: AgentState) -> AgentState:
-    companies: List[CompanySpec] = []
-    for comp in state.get("companies", []):
-        if comp.cik and comp.ticker:
-            companies.append(comp)
-            continue
+    pending = [c for c in state.get("companies", []) if not (c.cik and c.ticker)]
+    by_ticker: Dict[str, Dict[str, str]] = {}
+    by_cik: Dict[str, Dict[str, str]] = {}
+    if pending:
         try:
-            if not comp.cik and comp.ticker:
-                cik = await _sec_client.get_cik(comp.ticker)
-                comp = CompanySpec(ticker=comp.ticker, cik=cik)
-            elif not comp.ticker and comp.cik:
-                ticker = await _sec_client.ticker_from_cik(comp.cik)
-                comp = CompanySpec(ticker=ticker, cik=comp.cik)
+            resolved = await _sec_client.get_ciks(
+                tickers=[c.ticker for c in pending if c.ticker and not c.cik],
+                ciks=[c.cik for c in pending if c.cik and not c.ticker],
+            )
+            by_ticker = resolved.get("tickers", {})
+            by_cik = resolved.get("ciks", {})
+            for key in resolved.get("missing", []):
+                logger.warning("Failed to resolve entity %s", key)
         except Exception as exc:  # noqa: BLE001
-            logger.exception("Failed to resolve entity", exc_info=exc)
+            logger.exception("Failed to resolve entities", exc_info=exc)
+    companies: List[CompanySpec] = []
+    for comp in state.get("companies", []):
+        if not comp.cik and comp.ticker and comp.ticker in by_ticker:
+            comp = CompanySpec(ticker=comp.ticker, cik=by_ticker[comp.ticker].get("cik"))
+        elif not comp.ticker and comp.cik and comp.cik in by_cik:
+            comp = CompanySpec(ticker=by_cik[comp.cik].get("ticker"), cik=comp.cik)
         companies.append(comp)
-    messages = list(state.get("messages", []))
+    messages: List[Dict[str, Any]] = []
     messages.append({
         "role": "status",
         "content": "Identidades de compañías resueltas.",
@@ -118,63 +147,145 @@ async def fetch_edgar(state: AgentState) -> AgentState:
     retrieval = state.get("retrieval")
     if not retrieval:
         return {}
-    extracts: List[SectionExtract] = list(state.get("extracts", []))
-    for company in state.get("companies", []):
-        if not company.cik:
-            continue
+    extracts: List[SectionExtract] = []
+    companies = [c for c in state.get("companies", []) if c.cik]
+    # Un listado y un índice de documentos por lote en vez de una llamada por compañía/filing
+    listed: Dict[str, Any] = {}
+    if companies:
         try:
-            filings = await _sec_client.list_filings(
-                cik=company.cik,
+            listed = await _sec_client.list_filings_many(
+                ciks=[c.cik for c in companies],
                 forms=retrieval.forms,
                 years=retrieval.years,
             )
         except Exception as exc:  # noqa: BLE001
             logger.exception("Unable to list filings", exc_info=exc)
-            continue
-        for filing in filings or []:
+    for cik, error in listed.get("errors", {}).items():
+        logger.error("Unable to list filings for %s: %s", cik, error)
+    pending: List[tuple[CompanySpec, Dict[str, Any], str]] = []
+    for company in companies:
+        for filing in listed.get("filings", {}).get(company.cik) or []:
             accession = filing.get("accession") or filing.get("adsh")
-            if not accession:
-                continue
-            try:
-                docs = await _sec_client.get_filing_docs(
-                    cik=company.cik,
-                    accession=accession,
-                    prefer_html=True,
-                )
+            if accession:
+                pending.append((company, filing, accession))
+    docs_by_accession: Dict[str, List[str]] = {}
+    if pending:
+        try:
+            fetched = await _sec_client.get_filing_docs_many(
+                filings=[{"cik": company.cik, "accession": accession} for company, _, accession in pending],
+                prefer_html=True,
+            )
+            docs_by_accession = fetched.get("docs", {})
+            for accession, error in fetched.get("errors", {}).items():
+                logger.error("Unable to list documents for %s: %s", accession, error)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Unable to list filing documents", exc_info=exc)
+    # Las extracciones viajan en paralelo por la misma sesión MCP
+    in_flight = asyncio.Semaphore(EXTRACT_IN_FLIGHT)
+
+    async def extract(company: CompanySpec, filing: Dict[str, Any], accession: str) -> Optional[SectionExtract]:
+        docs = docs_by_accession.get(accession)
+        if docs is None:
+            return None
+        try:
+            async with in_flight:
                 section_data = await _sec_client.extract_sections(
                     urls=docs,
                     form=filing.get("form", ""),
                     accession=accession,
                     cik=company.cik,
+                    inline=False,
                 )
-                section = SectionExtract(**section_data)
-                if not section.company.ticker and company.ticker:
-                    section.company = CompanySpec(ticker=company.ticker, cik=company.cik)
-                extracts.append(section)
-            except Exception as exc:  # noqa: BLE001
-                logger.exception("Failed to process filing", exc_info=exc)
-    messages = list(state.get("messages", []))
+            section = SectionExtract(**section_data)
+            if not section.company.ticker and company.ticker:
+                section.company = CompanySpec(ticker=company.ticker, cik=company.cik)
+            return section
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Failed to process filing", exc_info=exc)
+            return None
+
+    sections = await asyncio.gather(*(extract(*item) for item in pending))
+    fetched_extracts = [section for section in sections if section is not None]
+    extracts.extend(fetched_extracts)
+
+    known_diffs = state.get("diffs", {})
+    diffs: Dict[str, SectionDiff] = {}
+
+    async def diff(extract: SectionExtract) -> None:
+        try:
+            async with in_flight:
+                data = await _sec_client.diff_sections(
+                    cik=extract.company.cik or "",
+                    accession=extract.accession,
+                    form=extract.form,
+                    section="risk_factors",
+                )
+            diffs[extract.accession] = SectionDiff(**data)
+        except Exception as exc:  # noqa: BLE001
+            # Primer filing del emisor o Item 1A ausente en el anterior: no hay diff
+            logger.warning("No risk factor diff for %s: %s", extract.accession, exc)
+
+    if retrieval.diff_risk_factors:
+        await asyncio.gather(
+            *(
+                diff(extract)
+                for extract in fetched_extracts
+                if extract.form in DIFF_FORMS
+                and extract.accession not in known_diffs
+                and extract.has_section("risk_factors")
+            )
+        )
+    messages: List[Dict[str, Any]] = []
     messages.append({
         "role": "status",
         "content": f"Descarga de filings completada ({len(extracts)} extractos).",
     })
-    return {"extracts": extracts, "messages": messages}
+    return {"extracts": extracts, "diffs": diffs, "messages": messages}
+
+
+async def _section_texts(
+    extracts: List[SectionExtract], limit: int
+) -> Dict[Tuple[str, str], str]:
+    """Read the first ``limit`` characters of every referenced section in one MCP call."""
+    texts: Dict[Tuple[str, str], str] = {}
+    keys: List[Tuple[str, str]] = []
+    ranges: List[Dict[str, Any]] = []
+    for extract in extracts:
+        for key, text in extract.sections.items():
+            if text:
+                texts[(extract.accession, key)] = text[:limit]
+        for key, ref in extract.section_refs.items():
+            if (extract.accession, key) not in texts:
+                keys.append((extract.accession, key))
+                ranges.append({"digest": ref.digest, "offset": 0, "length": limit})
+    if not ranges:
+        return texts
+    try:
+        fetched = await _sec_client.read_sections(ranges)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Unable to read section text", exc_info=exc)
+        return texts
+    for key, item in zip(keys, fetched):
+        if item.get("text"):
+            texts[key] = item["text"]
+    return texts
 
 
 async def fetch_yahoo(state: AgentState) -> AgentState:
-    market: Dict[str, MarketSnapshot] = dict(state.get("market", {}))
-    for company in state.get("companies", []):
-        ticker = company.ticker
-        if not ticker:
-            continue
-        if ticker in market:
-            continue
+    known = state.get("market", {})
+    market: Dict[str, MarketSnapshot] = {}
+    in_flight = asyncio.Semaphore(YAHOO_IN_FLIGHT)
+
+    async def fetch(ticker: str) -> None:
         try:
-            snapshot = await _yahoo_client.snapshot(ticker)
-            market[ticker] = snapshot
+            async with in_flight:
+                market[ticker] = await _yahoo_client.snapshot(ticker)
         except Exception as exc:  # noqa: BLE001
             logger.exception("Failed to fetch Yahoo snapshot", exc_info=exc)
-    messages = list(state.get("messages", []))
+
+    tickers = {c.ticker for c in state.get("companies", []) if c.ticker and c.ticker not in known}
+    await asyncio.gather(*(fetch(ticker) for ticker in sorted(tickers)))
+    messages: List[Dict[str, Any]] = []
     messages.append({
         "role": "status",
         "content": "Métricas de mercado recuperadas de Yahoo Finance.",
@@ -185,6 +296,7 @@ async def fetch_yahoo(state: AgentState) -> AgentState:
 async def analyze(state: AgentState) -> AgentState:
     analysis = dict(state.get("analysis", {}))
     llm = _get_llm()
+    texts = await _section_texts(state.get("extracts", []), ANALYSIS_PREVIEW_CHARS)
     for company in state.get("companies", []):
         ticker = company.ticker or company.cik or "Empresa"
         if ticker in analysis:
@@ -197,7 +309,17 @@ async def analyze(state: AgentState) -> AgentState:
                 "Incluye riesgos y señales cuantitativas cuando existan.\n"
             )
             context: Dict[str, Any] = {
-                "extracts": [e.model_dump() for e in extracts],
+                "extracts": [
+                    {
+                        **e.model_dump(exclude={"sections", "section_refs"}),
+                        "sections": {
+                            key: texts[(e.accession, key)]
+                            for key in {*e.sections, *e.section_refs}
+                            if (e.accession, key) in texts
+                        },
+                    }
+                    for e in extracts
+                ],
                 "market": market.model_dump() if market else {},
             }
             try:
@@ -212,11 +334,11 @@ async def analyze(state: AgentState) -> AgentState:
                 analysis_text = result.content if hasattr(result, "content") else str(result)
             except Exception as exc:  # noqa: BLE001
                 logger.exception("LLM analysis failed", exc_info=exc)
-                analysis_text = _heuristic_analysis(extracts, market)
+                analysis_text = _heuristic_analysis(extracts, market, texts)
         else:
-            analysis_text = _heuristic_analysis(extracts, market)
+            analysis_text = _heuristic_analysis(extracts, market, texts)
         analysis[ticker] = analysis_text
-    messages = list(state.get("messages", []))
+    messages: List[Dict[str, Any]] = []
     messages.append({
         "role": "status",
         "content": "Análisis sintetizado.",
@@ -225,7 +347,8 @@ async def analyze(state: AgentState) -> AgentState:
 
 
 async def write_report(state: AgentState) -> AgentState:
-    markdown, cites = build_markdown_report(state)
+    texts = await _section_texts(state.get("extracts", []), REPORT_SECTION_CHARS)
+    markdown, cites = build_markdown_report(state, texts)
     citations = list(state.get("citations", [])) + list(cites)
     combined_summary = state.get("combined_summary", "")
     if not combined_summary:
@@ -233,7 +356,7 @@ async def write_report(state: AgentState) -> AgentState:
         for ticker, summary in state.get("analysis", {}).items():
             combined.append(f"### {ticker}\n{summary}")
         combined_summary = "\n\n".join(combined)
-    messages = list(state.get("messages", []))
+    messages: List[Dict[str, Any]] = []
     messages.append({
         "role": "final",
         "content": "Reporte generado.",
@@ -246,7 +369,11 @@ async def write_report(state: AgentState) -> AgentState:
     }
 
 
-def _heuristic_analysis(extracts: List[SectionExtract], market: Optional[MarketSnapshot]) -> str:
+def _heuristic_analysis(
+    extracts: List[SectionExtract],
+    market: Optional[MarketSnapshot],
+    texts: Optional[Dict[Tuple[str, str], str]] = None,
+) -> str:
     bullets: List[str] = []
     if market and market.price is not None:
         bullets.append(f"Precio actual: {market.price:.2f} USD")
@@ -258,31 +385,38 @@ def _heuristic_analysis(extracts: List[SectionExtract], market: Optional[MarketS
             "risk_factors": "Riesgos",
             "mdna": "MD&A",
         }.items():
-            text = latest.sections.get(key)
+            text = latest.sections.get(key) or (texts or {}).get((latest.accession, key))
             if text:
                 bullets.append(f"{label}: {text[:200]}...")
     bullets.append("Nota: análisis heurístico sin LLM.")
     return "\n".join(f"- {b}" for b in bullets)
 
 
-# Build the graph
-builder = StateGraph(AgentState)
-
-builder.add_node("Plan", plan_node)
-builder.add_node("ResolveEntities", resolve_entities)
-builder.add_node("FetchEDGAR", fetch_edgar)
-builder.add_node("FetchYahoo", fetch_yahoo)
-builder.add_node("Analyze", analyze)
-builder.add_node("WriteReport", write_report)
+def build_graph(nodes: Optional[Dict[str, Any]] = None):
+    """Compila el grafo; ``nodes`` sustituye nodos por nombre (p. ej. en tests)."""
+    handlers: Dict[str, Any] = {
+        "Plan": plan_node,
+        "ResolveEntities": resolve_entities,
+        "FetchEDGAR": fetch_edgar,
+        "FetchYahoo": fetch_yahoo,
+        "Analyze": analyze,
+        "WriteReport": write_report,
+        **(nodes or {}),
+    }
+    builder = StateGraph(AgentState)
+    for name, handler in handlers.items():
+        builder.add_node(name, handler)
 
-builder.set_entry_point("Plan")
+    builder.set_entry_point("Plan")
 
-builder.add_edge("Plan", "ResolveEntities")
-builder.add_edge("ResolveEntities", "FetchEDGAR")
-builder.add_edge("FetchEDGAR", "FetchYahoo")
-builder.add_edge("FetchYahoo", "Analyze")
-builder.add_edge("Analyze", "WriteReport")
-builder.add_edge("WriteReport", END)
+    builder.add_edge("Plan", "ResolveEntities")
+    # SEC y Yahoo son independientes: ramas en paralelo que se unen antes de Analyze
+    builder.add_edge("ResolveEntities", "FetchEDGAR")
+    builder.add_edge("ResolveEntities", "FetchYahoo")
+    builder.add_edge(["FetchEDGAR", "FetchYahoo"], "Analyze")
+    builder.add_edge("Analyze", "WriteReport")
+    builder.add_edge("WriteReport", END)
+    return builder.compile()
 
 
-graph = builder.compile()
+graph = build_graph()
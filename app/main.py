@@ -1,16 +1,25 @@
 from __future__ import annotations
 import json
 import uuid
-from typing import Any, AsyncGenerator, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Dict, Optional
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import PlainTextResponse, StreamingResponse
 
-from .agent_graph import AgentState, graph
+from .agent_graph import AgentState, _sec_client, graph
 from .schemas import CompanySpec, ReportBundle, RetrievalSpec
 
-app = FastAPI(title="xFinance Agent")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None, None]:
+    yield
+    # Cierra los subprocesos MCP de la SEC en vez de dejarlos huérfanos
+    await _sec_client.shutdown()
+
+
+app = FastAPI(title="xFinance Agent", lifespan=lifespan)
 
 REPORT_STORE: Dict[str, ReportBundle] = {}
 
@@ -20,6 +29,24 @@ async def health() -> Dict[str, bool]:
     return {"ok": True}
 
 
+@app.get("/api/diagnostics/sec-tools")
+async def sec_tools_stats() -> Dict[str, Any]:
+    return {**_sec_client.latency_stats(), "cache": _sec_client.cache_stats()}
+
+
+@app.delete("/api/diagnostics/sec-tools/cache")
+async def invalidate_sec_tools_cache(
+    tool: Optional[str] = None,
+    ticker: Optional[str] = None,
+    cik: Optional[str] = None,
+    accession: Optional[str] = None,
+) -> Dict[str, int]:
+    if tool is not None and tool not in _sec_client.cache_stats():
+        raise HTTPException(status_code=404, detail=f"Tool sin caché: {tool}")
+    removed = _sec_client.invalidate_cache(tool, ticker=ticker, cik=cik, accession=accession)
+    return {"removed": removed}
+
+
 async def _serialize_state(state: AgentState) -> str:
     payload = jsonable_encoder(state)
     return json.dumps(payload, ensure_ascii=False)
@@ -43,6 +70,7 @@ async def run_agent(request: Request) -> StreamingResponse:
             "companies": [CompanySpec(**c) for c in body.get("companies", [])],
             "retrieval": RetrievalSpec(**retrieval_payload),
             "extracts": [],
+            "diffs": {},
             "market": {},
             "analysis": {},
             "citations": [],
@@ -59,6 +87,7 @@ async def run_agent(request: Request) -> StreamingResponse:
                 companies=last_state.get("companies", []),
                 retrieval=last_state.get("retrieval"),
                 extracts=last_state.get("extracts", []),
+                diffs=last_state.get("diffs", {}),
                 market=last_state.get("market", {}),
                 analysis=last_state.get("analysis", {}),
                 combined_summary=last_state.get("combined_summary", ""),
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from ..schemas import ReportBundle, SourceRef
+from ..schemas import ReportBundle, SectionDiff, SourceRef
 
 
-def build_markdown_report(state) -> Tuple[str, List[SourceRef]]:
+def build_markdown_report(
+    state, texts: Optional[Dict[Tuple[str, str], str]] = None
+) -> Tuple[str, List[SourceRef]]:
+    """``texts`` maps ``(accession, section)`` to text read from section references."""
+    texts = texts or {}
     lines: List[str] = []
     cites: List[SourceRef] = []
     hdr = f"# Reporte de empresa(s) — {date.today().isoformat()}\n"
@@ -25,15 +29,22 @@ def build_markdown_report(state) -> Tuple[str, List[SourceRef]]:
         ]
         for ex in extracts:
             lines.append(f"### {ex.form} ({ex.accession})\n")
-            if ex.sections.get("risk_factors"):
+            sections = {
+                key: ex.sections.get(key) or texts.get((ex.accession, key), "")
+                for key in ("risk_factors", "mdna", "financials")
+            }
+            if sections["risk_factors"]:
                 lines.append(
-                    "#### Riesgos (Item 1A / 3D)\n" + ex.sections["risk_factors"][:3000] + "\n"
+                    "#### Riesgos (Item 1A / 3D)\n" + sections["risk_factors"][:3000] + "\n"
                 )
-            if ex.sections.get("mdna"):
-                lines.append("#### MD&A (Item 7)\n" + ex.sections["mdna"][:3000] + "\n")
-            if ex.sections.get("financials"):
+            diff = state.get("diffs", {}).get(ex.accession)
+            if diff:
+                lines.append(_risk_diff_markdown(diff))
+            if sections["mdna"]:
+                lines.append("#### MD&A (Item 7)\n" + sections["mdna"][:3000] + "\n")
+            if sections["financials"]:
                 lines.append(
-                    "#### Estados financieros (Item 8)\n" + ex.sections["financials"][:3000] + "\n"
+                    "#### Estados financieros (Item 8)\n" + sections["financials"][:3000] + "\n"
                 )
             cites.extend(ex.sources)
     lines.append("\n## Mercado\n")
@@ -45,3 +56,21 @@ def build_markdown_report(state) -> Tuple[str, List[SourceRef]]:
         cites.extend(snap.sources)
     markdown = "\n".join(lines)
     return markdown, cites
+
+
+def _risk_diff_markdown(diff: SectionDiff, limit: int = 5, chars: int = 400) -> str:
+    stats = diff.stats
+    lines = [
+        f"#### Cambios en riesgos frente a {diff.base_accession}\n",
+        f"{stats.get('added', 0)} párrafos nuevos, {stats.get('modified', 0)} modificados y "
+        f"{stats.get('removed', 0)} eliminados ({stats.get('unchanged', 0)} sin cambios).\n",
+    ]
+    if diff.partial:
+        lines.append("_La sección supera el tope de extracción: el final no se comparó._\n")
+    for change in diff.added[:limit]:
+        lines.append(f"- **Nuevo:** {change.text[:chars]}")
+    for change in diff.modified[:limit]:
+        lines.append(f"- **Modificado:** {change.text[:chars]}")
+    for change in diff.removed[:limit]:
+        lines.append(f"- **Eliminado:** {change.text[:chars]}")
+    return "\n".join(lines) + "\n"
@@ -15,6 +15,9 @@ class RetrievalSpec(BaseModel):
         default_factory=lambda: ["10-K", "10-Q", "20-F"], description="SEC form types"
     )
     years: List[int]
+    diff_risk_factors: bool = Field(
+        default=True, description="Compare Item 1A of annual filings with the previous filing"
+    )
 
     def model_post_init(self, __context: Dict[str, object] | None) -> None:  # type: ignore[override]
         # Normalise forms to uppercase and trim whitespace
@@ -28,14 +31,50 @@ class SourceRef(BaseModel):
     meta: Dict[str, str] = Field(default_factory=dict)
 
 
+class SectionRef(BaseModel):
+    """Section body kept server-side; read lazily by digest and character range."""
+
+    uri: str
+    digest: str
+    length: int
+
+
 class SectionExtract(BaseModel):
     accession: str
     form: str
     filing_date: str
     company: CompanySpec
-    sections: Dict[str, str]
+    sections: Dict[str, str] = Field(default_factory=dict)
+    section_refs: Dict[str, SectionRef] = Field(default_factory=dict)
     sources: List[SourceRef] = Field(default_factory=list)
 
+    def has_section(self, key: str) -> bool:
+        return bool(self.sections.get(key)) or key in self.section_refs
+
+
+class ParagraphChange(BaseModel):
+    index: int
+    text: str
+    base_index: Optional[int] = None
+    base_text: Optional[str] = None
+    similarity: Optional[float] = None
+
+
+class SectionDiff(BaseModel):
+    """Paragraph-level changes of one section against an earlier filing."""
+
+    cik: str
+    section: str
+    form: str
+    accession: str
+    base_accession: str
+    stats: Dict[str, int] = Field(default_factory=dict)
+    added: List[ParagraphChange] = Field(default_factory=list)
+    removed: List[ParagraphChange] = Field(default_factory=list)
+    modified: List[ParagraphChange] = Field(default_factory=list)
+    truncated: bool = False
+    partial: bool = False
+
 
 class MarketSnapshot(BaseModel):
     ticker: str
@@ -51,6 +90,7 @@ class ReportBundle(BaseModel):
     companies: List[CompanySpec]
     retrieval: RetrievalSpec
     extracts: List[SectionExtract] = Field(default_factory=list)
+    diffs: Dict[str, SectionDiff] = Field(default_factory=dict)
     market: Dict[str, MarketSnapshot] = Field(default_factory=dict)
     analysis: Dict[str, str] = Field(default_factory=dict)
     combined_summary: str = ""
@@ -0,0 +1,8 @@
+"""La app se importa como ``app.*`` desde la raíz del repositorio, igual que con uvicorn."""
+
+import sys
+from pathlib import Path
+
+ROOT = str(Path(__file__).resolve().parents[2])
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
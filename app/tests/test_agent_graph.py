@@ -0,0 +1,68 @@
+import asyncio
+
+from app.agent_graph import build_graph
+
+
+def test_fetch_branches_run_in_parallel_and_join_before_analyze():
+    events = []
+    analyzed = []
+
+    async def plan(state):
+        return {"messages": [{"role": "system", "content": "plan"}]}
+
+    async def resolve(state):
+        return {"messages": [{"role": "status", "content": "resolve"}]}
+
+    async def fetch_edgar(state):
+        events.append("edgar:start")
+        await asyncio.sleep(0.02)
+        events.append("edgar:end")
+        return {
+            "extracts": ["10-K 2023"],
+            "diffs": {"acc-2023": "diff"},
+            "messages": [{"role": "status", "content": "edgar"}],
+        }
+
+    async def fetch_yahoo(state):
+        events.append("yahoo:start")
+        await asyncio.sleep(0.01)
+        events.append("yahoo:end")
+        return {"market": {"AAPL": "snapshot"}, "messages": [{"role": "status", "content": "yahoo"}]}
+
+    async def analyze(state):
+        analyzed.append(dict(state))
+        return {"analysis": {"AAPL": "ok"}}
+
+    async def write_report(state):
+        return {"markdown": "# report"}
+
+    graph = build_graph(
+        {
+            "Plan": plan,
+            "ResolveEntities": resolve,
+            "FetchEDGAR": fetch_edgar,
+            "FetchYahoo": fetch_yahoo,
+            "Analyze": analyze,
+            "WriteReport": write_report,
+        }
+    )
+    final = asyncio.run(
+        graph.ainvoke(
+            {
+                "query": "q",
+                "extracts": ["10-K 2022"],
+                "diffs": {"acc-2022": "old diff"},
+                "market": {"MSFT": "cached"},
+            }
+        )
+    )
+
+    # Ambas ramas arrancan antes de que termine ninguna
+    assert sorted(events[:2]) == ["edgar:start", "yahoo:start"]
+    assert len(analyzed) == 1
+    seen = analyzed[0]
+    assert seen["extracts"] == ["10-K 2022", "10-K 2023"]
+    assert seen["diffs"] == {"acc-2022": "old diff", "acc-2023": "diff"}
+    assert seen["market"] == {"MSFT": "cached", "AAPL": "snapshot"}
+    assert sorted(m["content"] for m in seen["messages"]) == ["edgar", "plan", "resolve", "yahoo"]
+    assert final["markdown"] == "# report" and final["analysis"] == {"AAPL": "ok"}
@@ -0,0 +1,114 @@
+import asyncio
+
+from mcp import types
+
+from app.tools import result_cache
+from app.tools.result_cache import TTLCache
+from app.tools.sec_mcp_client import SECTools, _accession_key, _cik_key, _ticker_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(result_cache.time, "monotonic", clock)
+    cache = TTLCache(ttl=10, maxsize=4)
+    cache.put("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.snapshot() == {
+        "size": 0,
+        "maxsize": 4,
+        "ttl": 10,
+        "hits": 1,
+        "misses": 1,
+        "expired": 1,
+        "evicted": 0,
+        "invalidated": 0,
+    }
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" pasa a ser el menos usado
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats["evicted"] == 1
+
+
+def test_invalidate_by_predicate_or_everything():
+    cache = TTLCache(ttl=60, maxsize=10)
+    for key in ("x1", "x2", "y1"):
+        cache.put(key, key)
+    assert cache.invalidate(lambda key: key.startswith("x")) == 2
+    assert cache.get("y1") == "y1"
+    assert cache.invalidate() == 1
+    assert len(cache) == 0 and cache.stats["invalidated"] == 3
+
+
+def test_key_helpers_normalize_identifiers():
+    assert _ticker_key(" aapl ") == _ticker_key("AAPL") == "AAPL"
+    assert _cik_key("320193") == _cik_key("0000320193") == _cik_key(320193) == "0000320193"
+    assert _cik_key("CIK320193") == "CIK320193"
+    assert _accession_key(" 0000320193-23-000106 ") == "000032019323000106"
+
+
+def _tools_with_counter():
+    tools = SECTools(workers=1, transport="stdio")
+    calls = []
+
+    async def call_tool(name, arguments):
+        calls.append(name)
+        if name == "get_cik":
+            value = {"ticker": arguments["ticker"].strip().upper(), "cik": "0000320193"}
+        elif name == "ticker_from_cik":
+            value = {"ticker": "AAPL", "cik": "0000320193"}
+        else:
+            value = [{"accession": "0000320193-23-000106"}]
+        return types.CallToolResult(content=[], structuredContent={"result": value})
+
+    tools._workers[0].call_tool = call_tool
+    return tools, calls
+
+
+def test_sec_tools_share_entries_across_spellings():
+    tools, calls = _tools_with_counter()
+
+    async def run():
+        assert await tools.get_cik("aapl") == "0000320193"
+        assert await tools.get_cik("AAPL ") == "0000320193"
+        assert await tools.ticker_from_cik("320193") == "AAPL"
+        assert await tools.ticker_from_cik("0000320193") == "AAPL"
+        await tools.list_filings("320193", ["10-k", "10-Q"], [2023, 2022])
+        await tools.list_filings("0000320193", ["10-Q", "10-K"], [2022, 2023, 2023])
+
+    asyncio.run(run())
+    assert calls == ["get_cik", "ticker_from_cik", "list_filings"]
+    assert tools.cache_stats()["get_cik"]["hits"] == 1
+
+
+def test_invalidate_cache_by_normalized_identifier():
+    tools, calls = _tools_with_counter()
+
+    async def run():
+        await tools.get_cik("AAPL")
+        await tools.list_filings("320193", ["10-K"], [2023])
+        assert tools.invalidate_cache("list_filings", cik="0000320193") == 1
+        assert tools.invalidate_cache(ticker=" aapl") == 1
+        await tools.list_filings("320193", ["10-K"], [2023])
+        await tools.get_cik("AAPL")
+
+    asyncio.run(run())
+    assert calls == ["get_cik", "list_filings", "list_filings", "get_cik"]
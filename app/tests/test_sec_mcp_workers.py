@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from mcp import types
+
+from app.tools.sec_mcp_client import _ServerWorker
+
+
+class FakeSession:
+    """Sesión MCP mínima: cuenta los ``tools/list`` y responde a ``tools/call``."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.list_calls = 0
+        self.calls = []
+
+    async def list_tools(self):
+        self.list_calls += 1
+        return types.ListToolsResult(tools=[types.Tool(name=name, inputSchema={"type": "object"}) for name in self.names])
+
+    async def call_tool(self, name, arguments):
+        self.calls.append((name, arguments))
+        return types.CallToolResult(content=[], structuredContent={"result": name})
+
+
+def _worker(session):
+    worker = _ServerWorker(0, 8.0)
+    # Estado tras ``initialize``: sesión viva y catálogo ya pedido
+    worker.session = session
+    worker._tools = set(session.names)
+    return worker
+
+
+def test_catalog_is_cached_between_calls():
+    session = FakeSession(["get_cik"])
+    worker = _worker(session)
+
+    async def run():
+        for _ in range(3):
+            await worker.call_tool("get_cik", {"ticker": "AAPL"})
+
+    asyncio.run(run())
+    assert session.list_calls == 0
+    assert len(session.calls) == 3
+
+
+def test_list_changed_notification_invalidates_catalog():
+    session = FakeSession(["get_cik"])
+    worker = _worker(session)
+    notification = types.ServerNotification(
+        types.ToolListChangedNotification(method="notifications/tools/list_changed")
+    )
+
+    async def run():
+        await worker._on_message(notification)
+        assert worker._tools is None
+        session.names.append("diff_sections")
+        await worker.call_tool("diff_sections", {})
+        await worker.call_tool("get_cik", {})
+
+    asyncio.run(run())
+    assert session.list_calls == 1
+    assert worker._tools == {"get_cik", "diff_sections"}
+
+
+def test_unknown_tool_refreshes_catalog_once_before_failing():
+    session = FakeSession(["get_cik"])
+    worker = _worker(session)
+
+    async def run():
+        with pytest.raises(RuntimeError, match="no expuesto"):
+            await worker.call_tool("missing_tool", {})
+        # Una tool añadida sin notificación se descubre con el refresco
+        session.names.append("new_tool")
+        return await worker.call_tool("new_tool", {})
+
+    result = asyncio.run(run())
+    assert result.structuredContent == {"result": "new_tool"}
+    assert session.list_calls == 2
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+from mcp import types
+
+from app.tools.sec_mcp_client import SECTools
+
+
+def _result(value):
+    # Misma forma que devuelve FastMCP: el JSON en texto y el resultado estructurado envuelto
+    text = types.TextContent(type="text", text=json.dumps(value))
+    return types.CallToolResult(content=[text], structuredContent={"result": value})
+
+
+def _tools(handlers):
+    tools = SECTools(workers=1, transport="stdio")
+    calls = []
+
+    async def call_tool(name, arguments):
+        calls.append((name, arguments))
+        return _result(handlers[name](arguments))
+
+    tools._workers[0].call_tool = call_tool
+    return tools, calls
+
+
+def test_list_filings_many_merges_cache_and_server_in_input_order():
+    def list_filings_many(arguments):
+        filings = {cik: [{"accession": f"acc-{cik}"}] for cik in arguments["ciks"] if cik != "3"}
+        return {"filings": filings, "errors": {"3": "ValueError: boom"} if "3" in arguments["ciks"] else {}}
+
+    tools, calls = _tools({"list_filings_many": list_filings_many})
+
+    async def run():
+        await tools.list_filings_many(["2"], ["10-K"], [2023])
+        return await tools.list_filings_many(["1", "0000000002", "3"], ["10-K"], [2023])
+
+    result = asyncio.run(run())
+    # "2" ya estaba en caché (con el CIK sin rellenar): sólo se piden los que faltan
+    assert [arguments["ciks"] for _, arguments in calls] == [["2"], ["1", "3"]]
+    assert list(result["filings"]) == ["1", "0000000002"]
+    assert result["filings"]["0000000002"] == [{"accession": "acc-2"}]
+    assert result["errors"] == {"3": "ValueError: boom"}
+
+
+def test_get_filing_docs_many_unwraps_and_caches_per_accession():
+    def get_filing_docs_many(arguments):
+        docs = {item["accession"]: [f"https://x/{item['accession']}.htm"] for item in arguments["filings"]}
+        return {"docs": docs, "errors": {}}
+
+    tools, calls = _tools({"get_filing_docs_many": get_filing_docs_many})
+    filings = [{"cik": "1", "accession": "a-1"}, {"cik": "2", "accession": "a-2"}]
+
+    async def run():
+        first = await tools.get_filing_docs_many(filings)
+        again = await tools.get_filing_docs_many(list(reversed(filings)))
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert len(calls) == 1
+    assert first == {"docs": {"a-1": ["https://x/a-1.htm"], "a-2": ["https://x/a-2.htm"]}, "errors": {}}
+    assert list(again["docs"]) == ["a-2", "a-1"]
+
+
+def test_get_ciks_remembers_identities_for_single_lookups():
+    def get_ciks(arguments):
+        return {
+            "tickers": {"aapl": {"ticker": "AAPL", "cik": "0000320193"}},
+            "ciks": {"789019": {"ticker": "MSFT", "cik": "0000789019"}},
+            "missing": ["NOPE"],
+        }
+
+    tools, calls = _tools({"get_ciks": get_ciks})
+
+    async def run():
+        batch = await tools.get_ciks(tickers=["aapl", "NOPE"], ciks=["789019"])
+        return batch, await tools.get_cik("AAPL"), await tools.ticker_from_cik("0000789019")
+
+    batch, cik, ticker = asyncio.run(run())
+    assert batch == {
+        "tickers": {"aapl": {"ticker": "AAPL", "cik": "0000320193"}},
+        "ciks": {"789019": {"ticker": "MSFT", "cik": "0000789019"}},
+        "missing": ["NOPE"],
+    }
+    assert (cik, ticker) == ("0000320193", "MSFT")
+    assert [name for name, _ in calls] == ["get_ciks"]
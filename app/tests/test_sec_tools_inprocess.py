@@ -0,0 +1,105 @@
+import asyncio
+import sys
+import types
+
+from app.tools.sec_mcp_client import SECTools, _InProcessServer
+
+
+class _Tool:
+    def __init__(self, name):
+        self.name = name
+
+
+def _stub_server(calls):
+    """Módulo con la forma de ``mcp_servers/sec_edgar/main.py``: ``mcp.list_tools`` y las tools."""
+    module = types.ModuleType(f"{_InProcessServer.package_name}.main")
+
+    async def get_cik(ticker):
+        calls.append(("get_cik", ticker))
+        return {"ticker": ticker.upper(), "cik": "0000320193"}
+
+    async def list_filings(cik, forms, years):
+        calls.append(("list_filings", cik))
+        return [{"accession": "0000320193-23-000106", "form": forms[0]}]
+
+    class Client:
+        closed = False
+
+        async def aclose(self):
+            Client.closed = True
+
+    async def list_tools():
+        return [_Tool("get_cik"), _Tool("list_filings")]
+
+    module.get_cik = get_cik
+    module.list_filings = list_filings
+    module.mcp = types.SimpleNamespace(list_tools=list_tools)
+    module._client = Client()
+    module.Client = Client
+    return module
+
+
+def test_inprocess_transport_calls_the_server_functions(monkeypatch):
+    calls = []
+    server = _stub_server(calls)
+    package = types.ModuleType(_InProcessServer.package_name)
+    package.__path__ = []
+    monkeypatch.setitem(sys.modules, _InProcessServer.package_name, package)
+    monkeypatch.setitem(sys.modules, server.__name__, server)
+    path_before = list(sys.path)
+
+    async def run():
+        tools = SECTools(transport="inprocess")
+        assert tools.latency_stats()["workers"] == []
+        first = await tools.get_cik("aapl")
+        again = await tools.get_cik(" AAPL ")  # servido por la caché de resultados
+        filings = await tools.list_filings("320193", ["10-K"], [2023])
+        stats = tools.latency_stats()
+        await tools.shutdown()
+        return first, again, filings, stats
+
+    first, again, filings, stats = asyncio.run(run())
+    assert first == again == "0000320193"
+    assert filings == [{"accession": "0000320193-23-000106", "form": "10-K"}]
+    assert calls == [("get_cik", "aapl"), ("list_filings", "320193")]
+    assert stats["transport"] == "inprocess"
+    assert stats["tools"]["get_cik"]["calls"] == 1
+    assert server.Client.closed and server._client is None
+    assert sys.path == path_before
+
+
+def test_inprocess_loader_keeps_server_modules_in_their_own_package():
+    name = _InProcessServer.package_name
+    loaded_before = {key for key in sys.modules if key == name or key.startswith(f"{name}.")}
+    path_before = list(sys.path)
+    server = _InProcessServer()
+    try:
+        tools = asyncio.run(server._load())
+        assert {"get_cik", "extract_sections", "read_sections", "diff_sections"} <= set(tools)
+        assert server._module.__name__ == f"{name}.main"
+        assert server._module.SectionSegmenter.__module__ == f"{name}.segmenter"
+        assert sys.path == path_before
+    finally:
+        asyncio.run(server.shutdown())
+        for key in [key for key in sys.modules if key == name or key.startswith(f"{name}.")]:
+            if key not in loaded_before:
+                del sys.modules[key]
+
+
+def test_benchmark_seeds_through_the_inprocess_package(tmp_path):
+    from app.tools import bench_transport
+
+    name = _InProcessServer.package_name
+    loaded_before = set(sys.modules)
+    path_before = list(sys.path)
+    try:
+        digest = bench_transport._seed_section(str(tmp_path / "sections.sqlite"), 100)
+        cache_module = sys.modules[f"{name}.section_cache"]
+        assert cache_module.SectionCache(str(tmp_path / "sections.sqlite"), "bench").read_blob(digest, 0, 0) == ("", 100)
+        # Ni sys.path ni una segunda copia del módulo con nombre de primer nivel
+        assert sys.path == path_before
+        assert "section_cache" not in set(sys.modules) - loaded_before
+    finally:
+        for key in [key for key in sys.modules if key == name or key.startswith(f"{name}.")]:
+            if key not in loaded_before:
+                del sys.modules[key]
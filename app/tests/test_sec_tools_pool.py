@@ -0,0 +1,105 @@
+import asyncio
+
+import anyio
+import pytest
+from mcp import types
+from mcp.shared.exceptions import McpError
+
+from app.tools.sec_mcp_client import SECTools, _connection_lost, _ServerWorker
+
+
+def _result(value):
+    return types.CallToolResult(content=[], structuredContent={"result": value})
+
+
+def test_connection_lost_classification():
+    assert _connection_lost(anyio.ClosedResourceError())
+    assert _connection_lost(anyio.BrokenResourceError())
+    assert _connection_lost(McpError(types.ErrorData(code=types.CONNECTION_CLOSED, message="closed")))
+    assert not _connection_lost(McpError(types.ErrorData(code=types.INTERNAL_ERROR, message="boom")))
+    assert not _connection_lost(RuntimeError("boom"))
+
+
+def test_calls_go_to_the_least_busy_worker():
+    tools = SECTools(workers=3, transport="stdio")
+    release = asyncio.Event()
+    served = {worker.index: 0 for worker in tools._workers}
+
+    def stub(worker):
+        async def call_tool(name, arguments):
+            served[worker.index] += 1
+            await release.wait()
+            return _result(worker.index)
+
+        return call_tool
+
+    for worker in tools._workers:
+        worker.call_tool = stub(worker)
+
+    async def run():
+        calls = [asyncio.create_task(tools._call("get_cik", ticker="AAPL")) for _ in range(6)]
+        await asyncio.sleep(0)
+        in_flight = [worker.in_flight for worker in tools._workers]
+        peak = tools.latency_stats()["in_flight"]
+        release.set()
+        return in_flight, peak, await asyncio.gather(*calls)
+
+    in_flight, peak, results = asyncio.run(run())
+    assert in_flight == [2, 2, 2]
+    assert peak == 6
+    assert sorted(results) == [0, 0, 1, 1, 2, 2]
+    assert all(worker.in_flight == 0 for worker in tools._workers)
+    assert tools.latency_stats()["tools"]["get_cik"]["calls"] == 6
+
+
+def test_lost_connection_is_retried_once_on_another_worker():
+    tools = SECTools(workers=2, transport="stdio")
+    first, second = tools._workers
+
+    async def crashed(name, arguments):
+        raise anyio.ClosedResourceError()
+
+    async def healthy(name, arguments):
+        return _result({"cik": "0000320193"})
+
+    first.call_tool, second.call_tool = crashed, healthy
+    assert asyncio.run(tools._call("get_cik", ticker="AAPL")) == {"cik": "0000320193"}
+    assert (first.calls, second.calls) == (1, 1)
+    assert tools.latency_stats()["tools"]["get_cik"]["errors"] == 1
+
+    # Dos caídas seguidas o un error que no es de conexión se propagan
+    second.call_tool = crashed
+    with pytest.raises(anyio.ClosedResourceError):
+        asyncio.run(tools._call("get_cik", ticker="AAPL"))
+
+    async def failing(name, arguments):
+        raise ValueError("bad arguments")
+
+    first.call_tool = failing
+    with pytest.raises(ValueError):
+        asyncio.run(tools._call("get_cik", ticker="AAPL"))
+    assert first.calls == 3 and second.calls == 2
+
+
+def test_worker_drops_dead_session_so_next_call_restarts_it():
+    class DeadSession:
+        async def call_tool(self, name, arguments):
+            raise anyio.BrokenResourceError()
+
+    worker = _ServerWorker(0, 8.0)
+    worker.session = DeadSession()
+    worker._tools = {"get_cik"}
+    with pytest.raises(anyio.BrokenResourceError):
+        asyncio.run(worker.call_tool("get_cik", {}))
+    assert worker.session is None
+
+
+def test_error_results_raise():
+    tools = SECTools(workers=1, transport="stdio")
+
+    async def error(name, arguments):
+        return types.CallToolResult(content=[types.TextContent(type="text", text="CIK no encontrado")], isError=True)
+
+    tools._workers[0].call_tool = error
+    with pytest.raises(RuntimeError, match="CIK no encontrado"):
+        asyncio.run(tools._call("get_cik", ticker="ZZZZ"))
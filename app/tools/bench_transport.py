@@ -0,0 +1,87 @@
+"""Benchmark del coste por llamada de los transportes de ``SECTools``.
+
+Uso (desde la raíz del repositorio)::
+
+    python -m app.tools.bench_transport --calls 200 --concurrency 16
+
+Compara ``stdio`` (subproceso + JSON-RPC) con ``inprocess`` sobre tools que no
+salen a la red: ``read_sections`` de un hash inexistente (coste fijo de la
+llamada) y de una sección de 20.000 caracteres (coste de serializar el
+cuerpo). Las secciones se siembran en una caché SQLite temporal.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from .sec_mcp_client import SECTools, _InProcessServer
+
+
+def _seed_section(path: str, chars: int) -> str:
+    # Mismo paquete que usa el transporte inprocess: una sola copia de los módulos del servidor
+    SectionCache = _InProcessServer.import_server_module("section_cache").SectionCache
+
+    cache = SectionCache(path, "bench")
+    (digest,) = cache.put_blobs(["Item 1A. Risk Factors " + "x" * (chars - 22)])
+    return digest
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "p50_us": statistics.median(ordered) * 1e6,
+        "p95_us": ordered[int(len(ordered) * 0.95) - 1] * 1e6,
+    }
+
+
+async def _bench(transport: str, digest: str, calls: int, concurrency: int) -> Dict[str, float]:
+    tools = SECTools(workers=1, transport=transport)
+    started = time.perf_counter()
+    await tools.read_sections([{"digest": "0" * 64}])
+    result = {"first_call_ms": (time.perf_counter() - started) * 1e3}
+    for label, ranges in (
+        ("empty", [{"digest": "0" * 64}]),
+        ("20k", [{"digest": digest, "offset": 0, "length": 20000}]),
+    ):
+        samples = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            await tools.read_sections(ranges)
+            samples.append(time.perf_counter() - started)
+        for key, value in _summary(samples).items():
+            result[f"{label}_{key}"] = value
+    started = time.perf_counter()
+    for offset in range(0, calls, concurrency):
+        batch = range(offset, min(offset + concurrency, calls))
+        await asyncio.gather(*(tools.read_sections([{"digest": "0" * 64}]) for _ in batch))
+    result["concurrent_calls_per_s"] = calls / (time.perf_counter() - started)
+    await tools.shutdown()
+    return result
+
+
+async def _main(args: argparse.Namespace) -> None:
+    digest = _seed_section(os.environ["SECTION_CACHE_PATH"], 20000)
+    rows = {transport: await _bench(transport, digest, args.calls, args.concurrency) for transport in ("stdio", "inprocess")}
+    print(f"{'métrica':<26}{'stdio':>14}{'inprocess':>14}")
+    for key in rows["stdio"]:
+        print(f"{key:<26}{rows['stdio'][key]:>14,.1f}{rows['inprocess'][key]:>14,.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de transportes de SECTools")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        # El subproceso hereda estas rutas: ambos transportes leen la misma caché
+        os.environ["SECTION_CACHE_PATH"] = os.path.join(tmp, "sections.sqlite")
+        os.environ.setdefault("COMPANY_MAP_PATH", os.path.join(tmp, "company_map.bin"))
+        asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
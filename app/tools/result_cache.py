@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """Caché LRU con caducidad por entrada para resultados de tools MCP.
+
+    Sólo se guarda lo que la tool devolvió con éxito; las claves las normaliza
+    quien llama. No es segura entre hilos: vive en el event loop de la API.
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evicted": 0, "invalidated": 0}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.stats["evicted"] += 1
+
+    def invalidate(self, match: Optional[Callable[[Hashable], bool]] = None) -> int:
+        """Borra las claves que cumplen ``match`` (todas si es None); devuelve cuántas."""
+        if match is None:
+            removed = len(self._entries)
+            self._entries.clear()
+        else:
+            keys = [key for key in self._entries if match(key)]
+            for key in keys:
+                del self._entries[key]
+            removed = len(keys)
+        self.stats["invalidated"] += removed
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"size": len(self._entries), "maxsize": self.maxsize, "ttl": self.ttl, **self.stats}
+
+
+__all__ = ["TTLCache"]
@@ -1,94 +1,533 @@
 from __future__ import annotations
 
+import asyncio
+import importlib
+import importlib.machinery
+import importlib.util
 import json
+import logging
 import os
+import sys
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from mcp import ClientSession, StdioServerParameters
+import anyio
+from mcp import ClientSession, StdioServerParameters, types
 from mcp.client.stdio import get_default_environment, stdio_client
+from mcp.shared.exceptions import McpError
 
+from .result_cache import TTLCache
 
-class SECTools:
-    """Cliente asíncrono para el servidor MCP de la SEC."""
+logger = logging.getLogger(__name__)
 
-    def __init__(self) -> None:
-        self._session_cm: Optional[Any] = None
-        self._client_session_cm: Optional[Any] = None
+
+_SEC_RATE_LIMIT = float(os.getenv("SEC_RATE_LIMIT", "8"))
+# (TTL en segundos, entradas) de la caché de resultados por tool. Los documentos de un
+# accession no cambian; los listados sí reciben filings nuevos.
+RESULT_CACHE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "get_cik": (24 * 3600, 10_000),
+    "ticker_from_cik": (24 * 3600, 10_000),
+    "list_filings": (3600, 2_000),
+    "get_filing_docs": (7 * 24 * 3600, 5_000),
+}
+# Ajusta la ruta si tu server MCP vive en otra carpeta
+_SERVER_DIR = Path(__file__).resolve().parents[2] / "mcp_servers" / "sec_edgar"
+
+
+def _ticker_key(ticker: str) -> str:
+    return ticker.strip().upper()
+
+
+def _cik_key(cik: str) -> str:
+    cik = str(cik).strip()
+    return str(int(cik)).zfill(10) if cik.isdigit() else cik
+
+
+def _accession_key(accession: str) -> str:
+    return accession.strip().replace("-", "")
+
+
+def _in_order(mapping: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
+    # Caché y servidor responden por separado: el resultado sigue el orden de la petición
+    return {key: mapping[key] for key in dict.fromkeys(keys) if key in mapping}
+
+
+def _connection_lost(exc: BaseException) -> bool:
+    if isinstance(exc, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)):
+        return True
+    return isinstance(exc, McpError) and exc.error.code == types.CONNECTION_CLOSED
+
+
+class _ServerWorker:
+    """Un subproceso ``sec_edgar`` con su sesión stdio.
+
+    Las peticiones ``call_tool`` concurrentes viajan en paralelo por la sesión
+    (JSON-RPC con id por petición) y el servidor las atiende a la vez. El
+    catálogo de tools se pide una vez tras ``initialize`` y se invalida con
+    ``notifications/tools/list_changed``.
+    """
+
+    def __init__(self, index: int, rate_limit: float) -> None:
+        self.index = index
+        self.rate_limit = rate_limit
         self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.calls = 0
+        self.restarts = 0
+        self._lock = asyncio.Lock()
+        self._runner: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._tools: Optional[Set[str]] = None
 
-    async def _ensure(self) -> None:
-        """Inicializa una sesión MCP por stdio hacia el server 'sec_edgar'."""
-        if self.session is not None:
-            return
+    async def ensure(self) -> ClientSession:
+        """Arranca el subproceso si no hay sesión viva."""
+        async with self._lock:
+            if self.session is None:
+                if self._runner is not None:
+                    # El subproceso murió: se recoge la tarea anterior antes de relanzar
+                    self._stop.set()
+                    await asyncio.gather(self._runner, return_exceptions=True)
+                    self.restarts += 1
+                ready: asyncio.Future = asyncio.get_running_loop().create_future()
+                self._stop = asyncio.Event()
+                self._runner = asyncio.create_task(self._run(ready, self._stop))
+                await ready
+            return self.session
+
+    async def _on_message(self, message: Any) -> None:
+        if isinstance(message, types.ServerNotification) and isinstance(
+            message.root, types.ToolListChangedNotification
+        ):
+            self._tools = None
+
+    def _server_params(self) -> StdioServerParameters:
+        server_path = _SERVER_DIR / "main.py"
 
-        # Ajusta la ruta si tu server MCP vive en otra carpeta
-        repo_root = Path(__file__).resolve().parents[2]
-        server_path = repo_root / "mcp_servers" / "sec_edgar" / "main.py"
+        env = {
+            **get_default_environment(),
+            "SEC_USER_AGENT": os.getenv(
+                "SEC_USER_AGENT",
+                "xFinance/0.1 (contacto@example.com)",
+            ),
+            "SEC_RATE_LIMIT": str(self.rate_limit),
+        }
+        # Catálogo local de filings (submissions.zip) compartido con el backend
+        if os.getenv("DUCKDB_PATH"):
+            env["DUCKDB_PATH"] = str(Path(os.environ["DUCKDB_PATH"]).resolve())
+        # Cachés en disco del servidor (compartidas por los workers y el modo inprocess)
+        for name in ("SECTION_CACHE_PATH", "COMPANY_MAP_PATH"):
+            if os.getenv(name):
+                env[name] = str(Path(os.environ[name]).resolve())
+        # Presupuesto de peticiones a la SEC compartido con el backend
+        if os.getenv("REDIS_URL"):
+            env["REDIS_URL"] = os.environ["REDIS_URL"]
 
-        server = StdioServerParameters(
+        return StdioServerParameters(
             command="python",
             args=[str(server_path)],
             cwd=str(server_path.parent),
-            env={
-                **get_default_environment(),
-                "SEC_USER_AGENT": os.getenv(
-                    "SEC_USER_AGENT",
-                    "xFinance/0.1 (contacto@example.com)",
-                ),
-            },
+            env=env,
         )
 
-        # Correcto: pasar StdioServerParameters a stdio_client
-        self._session_cm = stdio_client(server)
-        stdio, write = await self._session_cm.__aenter__()
-        self._client_session_cm = ClientSession(stdio, write)
-        self.session = await self._client_session_cm.__aenter__()
-        await self.session.initialize()
+    async def _run(self, ready: asyncio.Future, stop: asyncio.Event) -> None:
+        # stdio_client y ClientSession usan task groups de anyio: se abren y se
+        # cierran en esta misma tarea, sea cual sea la que pidió la sesión.
+        try:
+            async with stdio_client(self._server_params()) as (stdio, write):
+                async with ClientSession(stdio, write, message_handler=self._on_message) as session:
+                    await session.initialize()
+                    self._tools = {tool.name for tool in (await session.list_tools()).tools}
+                    self.session = session
+                    ready.set_result(None)
+                    await stop.wait()
+        except Exception as exc:  # noqa: BLE001
+            if not ready.done():
+                ready.set_exception(exc)
+            else:
+                logger.exception("Worker MCP %s de la SEC terminado", self.index, exc_info=exc)
+        finally:
+            self.session = None
+            self._tools = None
+            if not ready.done():
+                ready.cancel()
 
-    async def _call(self, tool_name: str, **kwargs: Any) -> Any:
-        await self._ensure()
-        if not self.session:
-            raise RuntimeError("Sesión MCP no inicializada")
-        tools = await self.session.list_tools()
-        if tool_name not in [t.name for t in tools.tools]:
+    async def _catalog(self, session: ClientSession, refresh: bool = False) -> Set[str]:
+        if self._tools is None or refresh:
+            self._tools = {tool.name for tool in (await session.list_tools()).tools}
+        return self._tools
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> types.CallToolResult:
+        session = await self.ensure()
+        try:
+            if tool_name not in await self._catalog(session):
+                # El servidor pudo añadir tools sin que llegase aún la notificación
+                if tool_name not in await self._catalog(session, refresh=True):
+                    raise RuntimeError(f"Tool {tool_name} no expuesto por MCP")
+            return await session.call_tool(tool_name, arguments)
+        except Exception as exc:
+            if _connection_lost(exc) and self.session is session:
+                # La siguiente llamada relanza el subproceso
+                self.session = None
+            raise
+
+    async def shutdown(self) -> None:
+        async with self._lock:
+            runner, self._runner = self._runner, None
+            self.session = None
+            if runner is None:
+                return
+            self._stop.set()
+            await asyncio.gather(runner, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "alive": self.session is not None,
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "restarts": self.restarts,
+        }
+
+
+class _InProcessServer:
+    """Las tools del servidor importadas y esperadas en el propio event loop.
+
+    Sin subproceso ni JSON-RPC: los argumentos y resultados son objetos Python
+    (que no se deben mutar: pueden ser los de las cachés del servidor) y el
+    ``httpx.AsyncClient`` del servidor vive en este proceso.
+    """
+
+    # Los módulos del servidor (main, segmenter, section_cache, ...) se cargan como
+    # submódulos de este paquete: no se toca sys.path ni tapan imports del proceso
+    package_name = "sec_edgar_server"
+
+    def __init__(self) -> None:
+        self._module: Optional[Any] = None
+        self._tools: Dict[str, Callable[..., Any]] = {}
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def import_server_module(cls, name: str) -> Any:
+        """Importa ``name`` (``main``, ``section_cache``, ...) del servidor dentro de su paquete."""
+        if cls.package_name not in sys.modules:
+            spec = importlib.machinery.ModuleSpec(cls.package_name, None, is_package=True)
+            spec.submodule_search_locations = [str(_SERVER_DIR)]
+            sys.modules[cls.package_name] = importlib.util.module_from_spec(spec)
+        return importlib.import_module(f"{cls.package_name}.{name}")
+
+    async def _load(self) -> Dict[str, Callable[..., Any]]:
+        async with self._lock:
+            if self._module is None:
+                module = self.import_server_module("main")
+                self._tools = {tool.name: getattr(module, tool.name) for tool in await module.mcp.list_tools()}
+                self._module = module
+        return self._tools
+
+    async def call(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        tools = self._tools or await self._load()
+        fn = tools.get(tool_name)
+        if fn is None:
             raise RuntimeError(f"Tool {tool_name} no expuesto por MCP")
-        result = await self.session.call_tool(tool_name, kwargs)
+        return await fn(**arguments)
+
+    async def shutdown(self) -> None:
+        client = getattr(self._module, "_client", None)
+        if client is not None:
+            self._module._client = None
+            await client.aclose()
+
+
+class SECTools:
+    """Cliente asíncrono para el servidor MCP de la SEC.
+
+    Con ``transport="stdio"`` (por defecto, ``SEC_MCP_TRANSPORT``) mantiene un
+    pool de ``workers`` subprocesos (``SEC_MCP_WORKERS``, 2 por defecto)
+    arrancados bajo demanda. Cada llamada va al worker con menos peticiones en
+    vuelo; si su subproceso ha muerto se relanza y la llamada se reintenta una
+    vez (todas las tools son de sólo lectura). Sin Redis el límite de
+    peticiones a la SEC se reparte entre los workers.
+
+    Con ``transport="inprocess"`` las tools se importan y se esperan en este
+    mismo proceso, con la misma interfaz.
+    """
+
+    def __init__(self, workers: Optional[int] = None, transport: Optional[str] = None) -> None:
+        self.transport = (transport or os.getenv("SEC_MCP_TRANSPORT", "stdio")).lower()
+        if self.transport not in ("stdio", "inprocess"):
+            raise ValueError(f"Transporte MCP desconocido: {self.transport}")
+        self._local = _InProcessServer() if self.transport == "inprocess" else None
+        size = 0 if self._local else max(workers or int(os.getenv("SEC_MCP_WORKERS", "2")), 1)
+        rate = _SEC_RATE_LIMIT if os.getenv("REDIS_URL") else _SEC_RATE_LIMIT / max(size, 1)
+        self._workers = [_ServerWorker(idx, rate) for idx in range(size)]
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._latency: Dict[str, Dict[str, float]] = {}
+        # Compartida por todos los jobs del proceso (una instancia de SECTools por proceso)
+        self._cache = {tool: TTLCache(ttl, maxsize) for tool, (ttl, maxsize) in RESULT_CACHE_LIMITS.items()}
+
+    def _pick(self) -> _ServerWorker:
+        return min(self._workers, key=lambda worker: (worker.in_flight, worker.calls))
+
+    def _record(self, tool_name: str, elapsed: float, ok: bool) -> None:
+        stats = self._latency.setdefault(
+            tool_name, {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+        )
+        ms = elapsed * 1000
+        stats["calls"] += 1
+        stats["errors"] += 0 if ok else 1
+        stats["total_ms"] += ms
+        stats["max_ms"] = max(stats["max_ms"], ms)
+        stats["last_ms"] = ms
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """Latencia por tool (ms, medida en el cliente), peticiones en vuelo y estado del pool."""
+        tools = {
+            name: {**stats, "mean_ms": round(stats["total_ms"] / stats["calls"], 3) if stats["calls"] else 0.0}
+            for name, stats in self._latency.items()
+        }
+        return {
+            "transport": self.transport,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._peak_in_flight,
+            "workers": [worker.snapshot() for worker in self._workers],
+            "tools": tools,
+        }
+
+    async def _call(self, tool_name: str, **kwargs: Any) -> Any:
+        if self._local is not None:
+            return await self._call_local(tool_name, kwargs)
+        for attempt in range(2):
+            worker = self._pick()
+            # Se cuenta antes de esperar al arranque para que las llamadas simultáneas se repartan
+            worker.in_flight += 1
+            worker.calls += 1
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = await worker.call_tool(tool_name, kwargs)
+                ok = not result.isError
+                break
+            except Exception as exc:
+                if attempt or not _connection_lost(exc):
+                    raise
+                logger.warning("Worker MCP %s sin conexión; se relanza", worker.index)
+            finally:
+                worker.in_flight -= 1
+                self._in_flight -= 1
+                self._record(tool_name, time.perf_counter() - started, ok)
+        structured = result.structuredContent
+        if not result.isError and isinstance(structured, dict) and set(structured) == {"result"}:
+            # FastMCP parte las listas en un bloque de contenido por elemento; el resultado
+            # estructurado llega entero
+            return structured["result"]
         if not result.content:
             return None
         payload = result.content[0].text
+        if result.isError:
+            raise RuntimeError(payload)
         try:
             return json.loads(payload)
         except json.JSONDecodeError:
             return payload
 
+    async def _call_local(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        self._in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        started = time.perf_counter()
+        ok = False
+        try:
+            data = await self._local.call(tool_name, arguments)
+            ok = True
+            return data
+        finally:
+            self._in_flight -= 1
+            self._record(tool_name, time.perf_counter() - started, ok)
+
+    # --- Caché de resultados ----------------------------------------------
+    def cache_stats(self) -> Dict[str, Any]:
+        return {tool: cache.snapshot() for tool, cache in self._cache.items()}
+
+    def invalidate_cache(
+        self,
+        tool: Optional[str] = None,
+        *,
+        ticker: Optional[str] = None,
+        cik: Optional[str] = None,
+        accession: Optional[str] = None,
+    ) -> int:
+        """Borra entradas de la caché de resultados; devuelve cuántas.
+
+        Sin filtros vacía ``tool`` (o todas). ``ticker``, ``cik`` y ``accession``
+        se normalizan igual que las claves y borran las entradas que los contienen.
+        """
+        wanted = set()
+        if ticker:
+            wanted.add(("ticker", _ticker_key(ticker)))
+        if cik:
+            wanted.add(("cik", _cik_key(cik)))
+        if accession:
+            wanted.add(("accession", _accession_key(accession)))
+
+        def match(key: Tuple[Any, ...]) -> bool:
+            return any(part in key for part in wanted)
+
+        caches = [self._cache[tool]] if tool else list(self._cache.values())
+        return sum(cache.invalidate(match if wanted else None) for cache in caches)
+
+    def _remember_identity(self, info: Dict[str, str], by_cik: bool) -> None:
+        if not info.get("cik") or not info.get("ticker"):
+            return
+        record = {"ticker": info["ticker"], "cik": info["cik"]}
+        self._cache["get_cik"].put((("ticker", _ticker_key(record["ticker"])),), record)
+        if by_cik:
+            # Sólo una consulta por CIK conoce el ticker principal del emisor
+            self._cache["ticker_from_cik"].put((("cik", _cik_key(record["cik"])),), record)
+
+    @staticmethod
+    def _filings_key(cik: str, forms: List[str], years: List[int]) -> Tuple[Any, ...]:
+        return (
+            ("cik", _cik_key(cik)),
+            tuple(sorted({form.strip().upper() for form in forms})),
+            tuple(sorted({int(year) for year in years})),
+        )
+
+    @staticmethod
+    def _docs_key(cik: str, accession: str, prefer_html: bool) -> Tuple[Any, ...]:
+        return (("cik", _cik_key(cik)), ("accession", _accession_key(accession)), bool(prefer_html))
+
+    # --- Tools -----------------------------------------------------------
     async def get_cik(self, ticker: str) -> str:
+        cached = self._cache["get_cik"].get((("ticker", _ticker_key(ticker)),))
+        if cached is not None:
+            return cached["cik"]
         data = await self._call("get_cik", ticker=ticker)
         if isinstance(data, dict):
+            self._remember_identity(data, by_cik=False)
             return data.get("cik") or ""
         return str(data)
 
     async def ticker_from_cik(self, cik: str) -> str:
+        cached = self._cache["ticker_from_cik"].get((("cik", _cik_key(cik)),))
+        if cached is not None:
+            return cached["ticker"]
         data = await self._call("ticker_from_cik", cik=cik)
         if isinstance(data, dict):
+            self._remember_identity(data, by_cik=True)
             return data.get("ticker") or ""
         return str(data)
 
     async def list_filings(self, cik: str, forms: List[str], years: List[int]) -> List[Dict[str, Any]]:
+        key = self._filings_key(cik, forms, years)
+        cached = self._cache["list_filings"].get(key)
+        if cached is not None:
+            return list(cached)
         data = await self._call("list_filings", cik=cik, forms=forms, years=years)
-        return data or []
+        if isinstance(data, list):
+            self._cache["list_filings"].put(key, data)
+        return list(data or [])
 
     async def get_filing_docs(self, cik: str, accession: str, prefer_html: bool = True) -> List[str]:
+        key = self._docs_key(cik, accession, prefer_html)
+        cached = self._cache["get_filing_docs"].get(key)
+        if cached is not None:
+            return list(cached)
         data = await self._call(
             "get_filing_docs",
             cik=cik,
             accession=accession,
             prefer_html=prefer_html,
         )
-        return data or []
+        if isinstance(data, list):
+            self._cache["get_filing_docs"].put(key, data)
+        return list(data or [])
+
+    async def get_ciks(
+        self, tickers: Optional[List[str]] = None, ciks: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"tickers": {}, "ciks": {}, "missing": []}
+        missing_tickers: List[str] = []
+        missing_ciks: List[str] = []
+        for ticker in tickers or []:
+            cached = self._cache["get_cik"].get((("ticker", _ticker_key(ticker)),))
+            if cached is not None:
+                out["tickers"][ticker] = dict(cached)
+            else:
+                missing_tickers.append(ticker)
+        for cik in ciks or []:
+            cached = self._cache["ticker_from_cik"].get((("cik", _cik_key(cik)),))
+            if cached is not None:
+                out["ciks"][cik] = dict(cached)
+            else:
+                missing_ciks.append(cik)
+        if not (missing_tickers or missing_ciks):
+            return out
+        data = await self._call("get_ciks", tickers=missing_tickers, ciks=missing_ciks) or {}
+        for ticker, info in (data.get("tickers") or {}).items():
+            self._remember_identity(info, by_cik=False)
+            out["tickers"][ticker] = info
+        for cik, info in (data.get("ciks") or {}).items():
+            self._remember_identity(info, by_cik=True)
+            out["ciks"][cik] = info
+        out["missing"].extend(data.get("missing") or [])
+        out["tickers"] = _in_order(out["tickers"], tickers or [])
+        out["ciks"] = _in_order(out["ciks"], ciks or [])
+        return out
+
+    async def list_filings_many(
+        self, ciks: List[str], forms: List[str], years: List[int]
+    ) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"filings": {}, "errors": {}}
+        missing: List[str] = []
+        for cik in ciks:
+            cached = self._cache["list_filings"].get(self._filings_key(cik, forms, years))
+            if cached is not None:
+                out["filings"][cik] = list(cached)
+            else:
+                missing.append(cik)
+        if not missing:
+            return out
+        data = await self._call("list_filings_many", ciks=missing, forms=forms, years=years) or {}
+        for cik, filings in (data.get("filings") or {}).items():
+            self._cache["list_filings"].put(self._filings_key(cik, forms, years), filings)
+            out["filings"][cik] = list(filings)
+        out["errors"].update(data.get("errors") or {})
+        out["filings"] = _in_order(out["filings"], ciks)
+        return out
+
+    async def get_filing_docs_many(
+        self, filings: List[Dict[str, str]], prefer_html: bool = True
+    ) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"docs": {}, "errors": {}}
+        missing: List[Dict[str, str]] = []
+        for item in filings:
+            cached = self._cache["get_filing_docs"].get(
+                self._docs_key(item["cik"], item["accession"], prefer_html)
+            )
+            if cached is not None:
+                out["docs"][item["accession"]] = list(cached)
+            else:
+                missing.append(item)
+        if not missing:
+            return out
+        data = await self._call(
+            "get_filing_docs_many",
+            filings=missing,
+            prefer_html=prefer_html,
+        ) or {}
+        cik_by_accession = {item["accession"]: item["cik"] for item in missing}
+        for accession, docs in (data.get("docs") or {}).items():
+            if accession in cik_by_accession:
+                key = self._docs_key(cik_by_accession[accession], accession, prefer_html)
+                self._cache["get_filing_docs"].put(key, docs)
+            out["docs"][accession] = list(docs)
+        out["errors"].update(data.get("errors") or {})
+        out["docs"] = _in_order(out["docs"], [item["accession"] for item in filings])
+        return out
 
     async def extract_sections(
-        self, urls: List[str], form: str, accession: str, cik: str
+        self, urls: List[str], form: str, accession: str, cik: str, inline: bool = True
     ) -> Dict[str, Any]:
         return await self._call(
             "extract_sections",
@@ -96,16 +535,37 @@ class SECTools:
             form=form,
             accession=accession,
             cik=cik,
+            inline=inline,
+        )
+
+    async def read_sections(self, ranges: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Lee rangos ``{digest, offset, length}`` de secciones devueltas con ``inline=False``."""
+        if not ranges:
+            return []
+        data = await self._call("read_sections", ranges=ranges)
+        return (data or {}).get("ranges", [])
+
+    async def diff_sections(
+        self,
+        cik: str,
+        accession: str,
+        base_accession: Optional[str] = None,
+        form: str = "10-K",
+        section: str = "risk_factors",
+    ) -> Dict[str, Any]:
+        return await self._call(
+            "diff_sections",
+            cik=cik,
+            accession=accession,
+            base_accession=base_accession,
+            form=form,
+            section=section,
         )
 
     async def get_companyfacts(self, cik: str) -> Dict[str, Any]:
         return await self._call("get_companyfacts", cik=cik)
 
     async def shutdown(self) -> None:
-        if self._client_session_cm is not None:
-            await self._client_session_cm.__aexit__(None, None, None)
-            self._client_session_cm = None
-        if self._session_cm is not None:
-            await self._session_cm.__aexit__(None, None, None)
-            self._session_cm = None
-        self.session = None
+        await asyncio.gather(*(worker.shutdown() for worker in self._workers))
+        if self._local is not None:
+            await self._local.shutdown()
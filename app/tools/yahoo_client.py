@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timezone
 from typing import List
 
@@ -10,6 +11,10 @@ from ..schemas import MarketSnapshot, SectionExtract, SourceRef
 
 class YahooClient:
     async def snapshot(self, ticker: str) -> MarketSnapshot:
+        # yfinance hace E/S bloqueante: fuera del event loop para no frenar la rama de la SEC
+        return await asyncio.to_thread(self._snapshot, ticker)
+
+    def _snapshot(self, ticker: str) -> MarketSnapshot:
         t = yf.Ticker(ticker)
         info = getattr(t, "fast_info", {}) or {}
         basics = getattr(t, "info", {}) or {}
@@ -50,7 +55,7 @@ class YahooClient:
         if pe is not None and pe < 15:
             bullets.append("Valoración P/E por debajo de 15 (aparente infravaloración relativa).")
         has_risks = any(
-            ex.sections.get("risk_factors") for ex in extracts if ex.company.ticker == ticker
+            ex.has_section("risk_factors") for ex in extracts if ex.company.ticker == ticker
         )
         if has_risks:
             bullets.append("Riesgos materiales identificados en 10-K/20-F recientes.")
@@ -12,14 +12,24 @@ from ..app.core.clients.edgar import download_form4_by_accession, list_recent_fi
 from ..app.core.clients.house import list_ptr_house
 from ..app.core.clients.senate import list_ptr_senate
 from ..app.core.clients.oge import search_filings
+from ..app.core.clients.pool import SourceProfile, http_clients
 from ..app.core.parsers.sec_form4 import parse_form4_xml
-from ..app.core.utils.rate_limit import RateLimiter
-
-_YAHOO_LIMITER = RateLimiter(rate=5, per=1.0)
-
-
-async def _fetch_form4(accession: str) -> dict[str, Any]:
-    xml = await download_form4_by_accession(accession)
+from ..app.core.utils.single_flight import SingleFlight, request_key
+from ..app.core.utils.throttle import host_throttle
+
+_YAHOO_THROTTLE = host_throttle("query1.finance.yahoo.com", rate=5, per=1.0)
+_YAHOO_PROFILE = http_clients.register(
+    SourceProfile(
+        name="yahoo",
+        timeout=httpx.Timeout(20.0, connect=5.0),
+        limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=30.0),
+    )
+)
+_YAHOO_FLIGHTS = SingleFlight("yahoo")
+
+
+async def _fetch_form4(accession: str, primary_doc: str | None = None) -> dict[str, Any]:
+    xml = await download_form4_by_accession(accession, primary_doc)
     txns = parse_form4_xml(xml)
     return {"accession": accession, "transactions": [txn.model_dump() for txn in txns]}
 
@@ -76,11 +86,16 @@ async def _fetch_yahoo_quote(ticker: str) -> dict[str, Any]:
     symbol = ticker.upper()
     url = "https://query1.finance.yahoo.com/v7/finance/quote"
     params = {"symbols": symbol}
-    async with _YAHOO_LIMITER.limit():
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            response = await client.get(url, params=params)
+
+    async def send() -> httpx.Response:
+        async with _YAHOO_THROTTLE.limit():
+            response = await http_clients.get(_YAHOO_PROFILE.name).get(url, params=params)
+            _YAHOO_THROTTLE.observe(response)
             response.raise_for_status()
-            payload = response.json()
+            return response
+
+    response = await _YAHOO_FLIGHTS.do(request_key("GET", url, params=params), send)
+    payload = response.json()
     results = payload.get("quoteResponse", {}).get("result", [])
     quote = results[0] if results else {}
     return {"ticker": symbol, "quote": quote}
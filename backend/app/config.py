@@ -3,9 +3,9 @@
 from functools import lru_cache
 from typing import Literal
 
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from starlette.responses import ORJSONResponse, Response
 
 
 class Settings(BaseSettings):
@@ -19,12 +19,37 @@ class Settings(BaseSettings):
         description="SQLAlchemy connection string",
     )
     duckdb_path: str = Field("./storage/xfinance.duckdb", description="DuckDB file path")
+    filing_catalog_max_age_hours: float = Field(
+        36.0,
+        description="How old the submissions.zip catalog may be before lookups fall back to the network",
+    )
     redis_url: str = Field("redis://localhost:6379/0", description="Redis cache URL")
+    rate_limit_backend: Literal["local", "redis"] = Field(
+        "local",
+        description="Set to 'redis' to share upstream rate limits across processes (falls back to local)",
+    )
 
     sec_user_agent: str = Field(
         "xFinance/0.1 (contact@example.com)",
         description="User-Agent header to send to the SEC",
     )
+    sec_rate_limit: float = Field(
+        8.0,
+        description="Requests per second to sec.gov; the SEC MCP server reads the same SEC_RATE_LIMIT",
+    )
+
+    edgar_cache_dir: str = Field(
+        "./storage/edgar_archive",
+        description="Directory for the content-addressed EDGAR archive cache",
+    )
+    edgar_cache_max_bytes: int = Field(
+        2 * 1024**3,
+        description="Size cap for the EDGAR archive cache before LRU eviction",
+    )
+    edgar_cached_only: bool = Field(
+        False,
+        description="Serve EDGAR archive documents from the local cache only (offline replays)",
+    )
 
     default_response_class: type[Response] = ORJSONResponse
 
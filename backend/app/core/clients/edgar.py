@@ -2,19 +2,46 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+import re
 from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
 from typing import Any, Iterable
 
 import httpx
-from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, retry_if_exception, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from ...config import get_settings
-from ..utils.rate_limit import RateLimiter
+from ..db.catalog import get_catalog
+from ..utils.archive_cache import ArchiveCache, ArchiveCacheMiss
+from ..utils.http_cache import RevalidatingCache
+from ..utils.single_flight import SingleFlight, request_key
+from ..utils.throttle import host_throttle
+from .pool import SourceProfile, http_clients
 
 _SETTINGS = get_settings()
 _BASE_ARCHIVES = "https://www.sec.gov/Archives/"
 _SUBMISSIONS_BASE = "https://data.sec.gov/submissions/"
-_RATE_LIMITER = RateLimiter(rate=10, per=1.0)
+_THROTTLE = host_throttle("sec.gov", rate=_SETTINGS.sec_rate_limit, per=1.0)
+_RETRY_BACKOFF = wait_exponential(multiplier=1, min=1, max=10)
+_PAGE_CONCURRENCY = 4
+_XSL_PREFIX_RE = re.compile(r"^xsl[^/]*/", re.IGNORECASE)
+_PROFILE = http_clients.register(
+    SourceProfile(
+        name="edgar",
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=30.0),
+        headers={"User-Agent": _SETTINGS.sec_user_agent},
+    )
+)
+_FLIGHTS = SingleFlight("edgar")
+_ARCHIVE_CACHE = ArchiveCache(
+    Path(_SETTINGS.edgar_cache_dir),
+    max_bytes=_SETTINGS.edgar_cache_max_bytes,
+    cached_only=_SETTINGS.edgar_cached_only,
+)
 
 
 @dataclass(slots=True)
@@ -25,14 +52,34 @@ class FilingDocument:
 
 
 async def _request(method: str, url: str, **kwargs: Any) -> httpx.Response:
-    headers = kwargs.pop("headers", {})
-    headers.setdefault("User-Agent", _SETTINGS.sec_user_agent)
-    async with _RATE_LIMITER.limit():
-        async with httpx.AsyncClient(timeout=kwargs.pop("timeout", 30.0), headers=headers, follow_redirects=True) as client:
-            response = await client.request(method, url, **kwargs)
+    async def send() -> httpx.Response:
+        async with _THROTTLE.limit():
+            response = await http_clients.get(_PROFILE.name).request(method, url, **kwargs)
+            _THROTTLE.observe(response)
             response.raise_for_status()
             return response
 
+    return await _FLIGHTS.do(request_key(method, url, **kwargs), send)
+
+
+async def _conditional_get(url: str, headers: dict[str, str]) -> httpx.Response:
+    async def send() -> httpx.Response:
+        async with _THROTTLE.limit():
+            response = await http_clients.get(_PROFILE.name).get(url, headers=headers)
+            _THROTTLE.observe(response)
+            return response
+
+    return await _FLIGHTS.do(request_key("GET", url, headers=headers), send)
+
+
+# Submissions change whenever the filer files something; serve them for a few
+# minutes and revalidate in the background for up to an hour after that.
+_SUBMISSIONS_CACHE = RevalidatingCache(_conditional_get, ttl=300.0, stale_ttl=3600.0)
+
+
+def submissions_cache() -> RevalidatingCache:
+    return _SUBMISSIONS_CACHE
+
 
 async def fetch_json(url: str) -> Any:
     response = await _request("GET", url)
@@ -53,32 +100,96 @@ def accession_to_cik(accession: str) -> str:
     return accession.split("-", 1)[0].lstrip("0") or "0"
 
 
-async def get_filing_index(accession: str) -> dict[str, Any]:
+def archive_url(accession: str, filename: str) -> str:
     cik = accession_to_cik(accession)
     acc_no = accession.replace("-", "")
-    url = f"{_BASE_ARCHIVES}edgar/data/{cik}/{acc_no}/index.json"
+    return f"{_BASE_ARCHIVES}edgar/data/{cik}/{acc_no}/{filename}"
+
 
-    retry = AsyncRetrying(
+async def fetch_archive(accession: str, filename: str) -> bytes:
+    """Return an archive document, served from the local cache when possible.
+
+    Documents under ``Archives/edgar/data`` never change once published, so a
+    cached copy is always valid.  In ``cached_only`` mode a miss raises
+    :class:`ArchiveCacheMiss` instead of touching the network.
+    """
+
+    cached = await asyncio.to_thread(_ARCHIVE_CACHE.get, accession, filename)
+    if cached is not None:
+        return cached
+    if _ARCHIVE_CACHE.cached_only:
+        raise ArchiveCacheMiss(f"{accession}/{filename} is not in the local EDGAR cache")
+    content = await fetch_bytes(archive_url(accession, filename))
+    await asyncio.to_thread(_ARCHIVE_CACHE.put, accession, filename, content)
+    return content
+
+
+def archive_cache() -> ArchiveCache:
+    return _ARCHIVE_CACHE
+
+
+def _archive_retrying(retry: Any = retry_if_exception_type(httpx.HTTPError)) -> AsyncRetrying:
+    return AsyncRetrying(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type(httpx.HTTPError),
+        wait=_THROTTLE.retry_wait(_RETRY_BACKOFF),
+        retry=retry,
         reraise=True,
     )
 
-    async for attempt in retry:
+
+def _is_transient(exc: BaseException) -> bool:
+    # A 404 on a guessed document name will not change on retry
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code != 404
+    return isinstance(exc, httpx.HTTPError)
+
+
+async def get_filing_index(accession: str) -> dict[str, Any]:
+    async for attempt in _archive_retrying():
         with attempt:
-            return await fetch_json(url)
+            return json.loads(await fetch_archive(accession, "index.json"))
     raise RuntimeError("Unable to fetch index")
 
 
 async def download_document(accession: str, filename: str) -> bytes:
-    cik = accession_to_cik(accession)
-    acc_no = accession.replace("-", "")
-    url = f"{_BASE_ARCHIVES}edgar/data/{cik}/{acc_no}/{filename}"
-    return await fetch_bytes(url)
+    return await fetch_archive(accession, filename)
 
 
-async def download_form4_by_accession(accession: str) -> str:
+def raw_document_name(primary_doc: str) -> str:
+    """Strip the ``xslF345X05/``-style rendering directory from a primary document."""
+
+    return _XSL_PREFIX_RE.sub("", primary_doc.strip())
+
+
+async def _download_primary_xml(accession: str, primary_doc: str) -> str | None:
+    filename = raw_document_name(primary_doc)
+    if not filename.lower().endswith(".xml"):
+        return None
+    try:
+        async for attempt in _archive_retrying(retry_if_exception(_is_transient)):
+            with attempt:
+                content = await download_document(accession, filename)
+    except httpx.HTTPStatusError as exc:
+        if exc.response.status_code == 404:
+            return None
+        raise
+    except ArchiveCacheMiss:
+        return None
+    text = content.decode("utf-8", errors="replace")
+    return text if "<ownershipDocument" in text else None
+
+
+async def download_form4_by_accession(accession: str, primary_doc: str | None = None) -> str:
+    """Download the Form 4 XML for ``accession``.
+
+    When the submissions feed already told us the ``primary_doc`` the XML is
+    fetched directly; ``index.json`` is only consulted if that guess fails.
+    """
+
+    if primary_doc:
+        xml = await _download_primary_xml(accession, primary_doc)
+        if xml is not None:
+            return xml
     index = await get_filing_index(accession)
     documents = index.get("directory", {}).get("item", [])
     candidates = [doc for doc in documents if doc["type"].endswith("xml") and "form4" in doc["name"].lower()]
@@ -89,31 +200,97 @@ async def download_form4_by_accession(accession: str) -> str:
     return content.decode("utf-8", errors="replace")
 
 
-async def list_recent_filings(cik: str, form_types: Iterable[str], limit: int = 10) -> list[dict[str, Any]]:
-    norm_cik = cik.zfill(10)
-    url = f"{_SUBMISSIONS_BASE}CIK{norm_cik}.json"
-    data = await fetch_json(url)
-    recent = data.get("filings", {}).get("recent", {})
+def _select_filings(
+    block: dict[str, Any],
+    forms: set[str],
+    start: date | None,
+    end: date | None,
+) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
-    for idx, form in enumerate(recent.get("form", [])):
-        if form not in form_types:
+    for idx, form in enumerate(block.get("form", [])):
+        if form not in forms:
+            continue
+        filed = block["filingDate"][idx]
+        if start is not None and filed < start.isoformat():
+            continue
+        if end is not None and filed > end.isoformat():
+            continue
+        out.append(
+            {
+                "accession": block["accessionNumber"][idx],
+                "form": form,
+                "filed": filed,
+                "primary_doc": block["primaryDocument"][idx],
+            }
+        )
+    return out
+
+
+def _pages_in_window(files: list[dict[str, Any]], start: date | None, end: date | None) -> list[dict[str, Any]]:
+    pages = []
+    for page in files:
+        if start is not None and page.get("filingTo", "9999") < start.isoformat():
             continue
-        entry = {
-            "accession": recent["accessionNumber"][idx],
-            "filed": recent["filingDate"][idx],
-            "primary_doc": recent["primaryDocument"][idx],
-        }
-        out.append(entry)
+        if end is not None and page.get("filingFrom", "0000") > end.isoformat():
+            continue
+        pages.append(page)
+    # Newest pages first so the walk can stop as soon as ``limit`` is reached.
+    return sorted(pages, key=lambda page: page.get("filingTo", ""), reverse=True)
+
+
+async def list_recent_filings(
+    cik: str,
+    form_types: Iterable[str],
+    limit: int = 10,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+) -> list[dict[str, Any]]:
+    """List filings newest first, following ``filings.files`` history pages.
+
+    A fresh local catalog loaded from ``submissions.zip`` answers first.
+    ``filings.recent`` only holds the latest ~1000 filings.  Older pages are
+    fetched ``_PAGE_CONCURRENCY`` at a time, and only while ``limit`` is not
+    yet satisfied and the page overlaps the ``start``..``end`` window, so a
+    shallow query still costs a single request.
+    """
+
+    forms = set(form_types)
+    cataloged = await asyncio.to_thread(get_catalog().query, cik, forms, start=start, end=end, limit=limit)
+    if cataloged is not None:
+        return cataloged
+
+    norm_cik = cik.zfill(10)
+    url = f"{_SUBMISSIONS_BASE}CIK{norm_cik}.json"
+    data = await _SUBMISSIONS_CACHE.get_json(url)
+    filings = data.get("filings", {})
+    out = _select_filings(filings.get("recent", {}), forms, start, end)
+    pages = _pages_in_window(filings.get("files", []), start, end)
+    for offset in range(0, len(pages), _PAGE_CONCURRENCY):
         if len(out) >= limit:
             break
-    return out
+        wave = pages[offset : offset + _PAGE_CONCURRENCY]
+        blocks = await asyncio.gather(
+            *(_SUBMISSIONS_CACHE.get_json(f"{_SUBMISSIONS_BASE}{page['name']}") for page in wave)
+        )
+        for block in blocks:
+            out.extend(_select_filings(block, forms, start, end))
+    out.sort(key=lambda entry: entry["filed"], reverse=True)
+    return out[:limit]
 
 
 __all__ = [
     "fetch_json",
     "fetch_text",
     "fetch_bytes",
+    "fetch_archive",
+    "archive_cache",
+    "archive_url",
+    "submissions_cache",
+    "download_document",
+    "ArchiveCacheMiss",
     "download_form4_by_accession",
+    "raw_document_name",
     "list_recent_filings",
     "get_filing_index",
     "FilingDocument",
@@ -10,17 +10,34 @@ from bs4 import BeautifulSoup
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from ...config import get_settings
-from ..utils.rate_limit import RateLimiter
+from ..utils.single_flight import SingleFlight, request_key
+from ..utils.throttle import host_throttle
 from ..utils.text import normalize_whitespace
+from .pool import SourceProfile, http_clients
 
 _SETTINGS = get_settings()
 _SEARCH_URL = "https://disclosures-clerk.house.gov/PublicDisclosure/FinancialDisclosure/ViewMemberSearchResult"
-_RATE_LIMITER = RateLimiter(rate=2, per=1.0)
+_THROTTLE = host_throttle("disclosures-clerk.house.gov", rate=2, per=1.0)
+_PROFILE = http_clients.register(
+    SourceProfile(
+        name="house",
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=2, keepalive_expiry=30.0),
+        headers={"User-Agent": _SETTINGS.sec_user_agent, "Referer": _SEARCH_URL},
+    )
+)
+_FLIGHTS = SingleFlight("house")
+
 
+async def _request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    async def send() -> httpx.Response:
+        async with _THROTTLE.limit():
+            response = await http_clients.get(_PROFILE.name).request(method, url, **kwargs)
+            _THROTTLE.observe(response)
+            response.raise_for_status()
+            return response
 
-async def _client() -> httpx.AsyncClient:
-    headers = {"User-Agent": _SETTINGS.sec_user_agent, "Referer": _SEARCH_URL}
-    return httpx.AsyncClient(timeout=30.0, headers=headers, follow_redirects=True)
+    return await _FLIGHTS.do(request_key(method, url, **kwargs), send)
 
 
 async def list_ptr_house(start: date, end: date) -> list[dict[str, Any]]:
@@ -34,18 +51,15 @@ async def list_ptr_house(start: date, end: date) -> list[dict[str, Any]]:
 
     retry = AsyncRetrying(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=8),
+        wait=_THROTTLE.retry_wait(wait_exponential(multiplier=1, min=1, max=8)),
         retry=retry_if_exception_type(httpx.HTTPError),
         reraise=True,
     )
 
     async for attempt in retry:
         with attempt:
-            async with _RATE_LIMITER.limit():
-                async with await _client() as client:
-                    response = await client.post(_SEARCH_URL, data=form_data)
-                    response.raise_for_status()
-                    return _parse_search_results(response.text)
+            response = await _request("POST", _SEARCH_URL, data=form_data)
+            return _parse_search_results(response.text)
     return []
 
 
@@ -71,11 +85,8 @@ def _parse_search_results(html: str) -> list[dict[str, Any]]:
 
 
 async def download_ptr_document(url: str) -> bytes:
-    async with await _client() as client:
-        async with _RATE_LIMITER.limit():
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.content
+    response = await _request("GET", url)
+    return response.content
 
 
 __all__ = ["list_ptr_house", "download_ptr_document"]
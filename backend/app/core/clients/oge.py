@@ -8,16 +8,33 @@ import httpx
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from ...config import get_settings
-from ..utils.rate_limit import RateLimiter
+from ..utils.single_flight import SingleFlight, request_key
+from ..utils.throttle import host_throttle
+from .pool import SourceProfile, http_clients
 
 _SETTINGS = get_settings()
 _SEARCH_ENDPOINT = "https://www.oge.gov/api/filing-search"
-_RATE_LIMITER = RateLimiter(rate=1, per=1.0)
+_THROTTLE = host_throttle("www.oge.gov", rate=1, per=1.0)
+_PROFILE = http_clients.register(
+    SourceProfile(
+        name="oge",
+        timeout=httpx.Timeout(45.0, connect=10.0),
+        limits=httpx.Limits(max_connections=2, max_keepalive_connections=2, keepalive_expiry=30.0),
+        headers={"User-Agent": _SETTINGS.sec_user_agent, "Accept": "application/json"},
+    )
+)
+_FLIGHTS = SingleFlight("oge")
+
 
+async def _request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    async def send() -> httpx.Response:
+        async with _THROTTLE.limit():
+            response = await http_clients.get(_PROFILE.name).request(method, url, **kwargs)
+            _THROTTLE.observe(response)
+            response.raise_for_status()
+            return response
 
-async def _client() -> httpx.AsyncClient:
-    headers = {"User-Agent": _SETTINGS.sec_user_agent, "Accept": "application/json"}
-    return httpx.AsyncClient(timeout=45.0, headers=headers, follow_redirects=True)
+    return await _FLIGHTS.do(request_key(method, url, **kwargs), send)
 
 
 async def search_filings(person: str | None = None, year: int | None = None, form_type: str | None = None) -> list[dict[str, Any]]:
@@ -32,28 +49,21 @@ async def search_filings(person: str | None = None, year: int | None = None, for
 
     retry = AsyncRetrying(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=8),
+        wait=_THROTTLE.retry_wait(wait_exponential(multiplier=1, min=1, max=8)),
         retry=retry_if_exception_type(httpx.HTTPError),
         reraise=True,
     )
 
     async for attempt in retry:
         with attempt:
-            async with await _client() as client:
-                async with _RATE_LIMITER.limit():
-                    response = await client.get(_SEARCH_ENDPOINT, params=params)
-                    response.raise_for_status()
-                    payload = response.json()
-                    return payload.get("results", [])
+            response = await _request("GET", _SEARCH_ENDPOINT, params=params)
+            return response.json().get("results", [])
     return []
 
 
 async def download_filing(document_url: str) -> bytes:
-    async with await _client() as client:
-        async with _RATE_LIMITER.limit():
-            response = await client.get(document_url)
-            response.raise_for_status()
-            return response.content
+    response = await _request("GET", document_url)
+    return response.content
 
 
 __all__ = ["search_filings", "download_filing"]
@@ -0,0 +1,147 @@
+"""Shared, pooled HTTP clients for the upstream data sources."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+try:  # HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on installed extras
+    _HTTP2_AVAILABLE = False
+
+
+@dataclass(slots=True)
+class SourceProfile:
+    """Connection settings for one upstream source."""
+
+    name: str
+    timeout: httpx.Timeout
+    limits: httpx.Limits
+    headers: dict[str, str] = field(default_factory=dict)
+    cookies: dict[str, str] = field(default_factory=dict)
+    http2: bool = True
+    transport: httpx.AsyncBaseTransport | None = None
+
+
+@dataclass(slots=True)
+class _SourceCounters:
+    requests: int = 0
+    responses: int = 0
+    errors: int = 0
+    clients_opened: int = 0
+
+
+class ClientManager:
+    """Owns one keep-alive ``httpx.AsyncClient`` per upstream source.
+
+    Each client module registers its :class:`SourceProfile` at import time.
+    Clients are created lazily on first use and live until :meth:`aclose`
+    is called, normally from the FastAPI lifespan.
+    """
+
+    def __init__(self) -> None:
+        self.profiles: dict[str, SourceProfile] = {}
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._counters: dict[str, _SourceCounters] = {}
+
+    def register(self, profile: SourceProfile) -> SourceProfile:
+        self.profiles[profile.name] = profile
+        self._counters.setdefault(profile.name, _SourceCounters())
+        return profile
+
+    def _build(self, profile: SourceProfile) -> httpx.AsyncClient:
+        counters = self._counters.setdefault(profile.name, _SourceCounters())
+
+        async def on_request(request: httpx.Request) -> None:
+            counters.requests += 1
+
+        async def on_response(response: httpx.Response) -> None:
+            counters.responses += 1
+            if response.status_code >= 400:
+                counters.errors += 1
+
+        counters.clients_opened += 1
+        return httpx.AsyncClient(
+            timeout=profile.timeout,
+            limits=profile.limits,
+            headers=profile.headers,
+            cookies=profile.cookies,
+            http2=profile.http2 and _HTTP2_AVAILABLE,
+            follow_redirects=True,
+            transport=profile.transport,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    def get(self, source: str) -> httpx.AsyncClient:
+        client = self._clients.get(source)
+        if client is None or client.is_closed:
+            profile = self.profiles.get(source)
+            if profile is None:
+                raise KeyError(f"Unknown HTTP source profile: {source}")
+            client = self._build(profile)
+            self._clients[source] = client
+        return client
+
+    def open(self) -> None:
+        for name in self.profiles:
+            self.get(name)
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        out: dict[str, dict[str, Any]] = {}
+        for name, profile in self.profiles.items():
+            counters = self._counters.get(name, _SourceCounters())
+            entry: dict[str, Any] = {
+                "open": name in self._clients and not self._clients[name].is_closed,
+                "http2": profile.http2 and _HTTP2_AVAILABLE,
+                "max_connections": profile.limits.max_connections,
+                "max_keepalive_connections": profile.limits.max_keepalive_connections,
+                "requests": counters.requests,
+                "responses": counters.responses,
+                "errors": counters.errors,
+                "clients_opened": counters.clients_opened,
+            }
+            entry.update(_connection_stats(self._clients.get(name)))
+            out[name] = entry
+        return out
+
+
+def _connection_stats(client: httpx.AsyncClient | None) -> dict[str, int]:
+    stats = {"connections": 0, "idle": 0, "active": 0, "http2_connections": 0}
+    if client is None or client.is_closed:
+        return stats
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    for conn in getattr(pool, "connections", []) or []:
+        stats["connections"] += 1
+        if conn.is_idle():
+            stats["idle"] += 1
+        else:
+            stats["active"] += 1
+        if "HTTP/2" in conn.info():
+            stats["http2_connections"] += 1
+    return stats
+
+
+http_clients = ClientManager()
+
+
+def get_client(source: str) -> httpx.AsyncClient:
+    """Return the shared pooled client for ``source``."""
+
+    return http_clients.get(source)
+
+
+def pool_stats() -> dict[str, dict[str, Any]]:
+    return http_clients.stats()
+
+
+__all__ = ["SourceProfile", "ClientManager", "http_clients", "get_client", "pool_stats"]
@@ -10,18 +10,35 @@ from bs4 import BeautifulSoup
 from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from ...config import get_settings
-from ..utils.rate_limit import RateLimiter
+from ..utils.single_flight import SingleFlight, request_key
+from ..utils.throttle import host_throttle
 from ..utils.text import normalize_whitespace
+from .pool import SourceProfile, http_clients
 
 _SETTINGS = get_settings()
 _BASE_URL = "https://efdsearch.senate.gov/search"
-_RATE_LIMITER = RateLimiter(rate=1, per=1.0)
+_THROTTLE = host_throttle("efdsearch.senate.gov", rate=1, per=1.0)
+_PROFILE = http_clients.register(
+    SourceProfile(
+        name="senate",
+        timeout=httpx.Timeout(45.0, connect=10.0),
+        limits=httpx.Limits(max_connections=2, max_keepalive_connections=2, keepalive_expiry=30.0),
+        headers={"User-Agent": _SETTINGS.sec_user_agent, "Referer": _BASE_URL},
+        cookies={"efd_consent": "true"},
+    )
+)
+_FLIGHTS = SingleFlight("senate")
+
 
+async def _request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    async def send() -> httpx.Response:
+        async with _THROTTLE.limit():
+            response = await http_clients.get(_PROFILE.name).request(method, url, **kwargs)
+            _THROTTLE.observe(response)
+            response.raise_for_status()
+            return response
 
-async def _client() -> httpx.AsyncClient:
-    headers = {"User-Agent": _SETTINGS.sec_user_agent, "Referer": _BASE_URL}
-    cookies = {"efd_consent": "true"}
-    return httpx.AsyncClient(timeout=45.0, headers=headers, follow_redirects=True, cookies=cookies)
+    return await _FLIGHTS.do(request_key(method, url, **kwargs), send)
 
 
 async def list_ptr_senate(start: date, end: date) -> list[dict[str, Any]]:
@@ -34,18 +51,15 @@ async def list_ptr_senate(start: date, end: date) -> list[dict[str, Any]]:
 
     retry = AsyncRetrying(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=8),
+        wait=_THROTTLE.retry_wait(wait_exponential(multiplier=1, min=1, max=8)),
         retry=retry_if_exception_type(httpx.HTTPError),
         reraise=True,
     )
 
     async for attempt in retry:
         with attempt:
-            async with await _client() as client:
-                async with _RATE_LIMITER.limit():
-                    response = await client.get(f"{_BASE_URL}/report/results/", params=params)
-                    response.raise_for_status()
-                    return _parse_results(response.text)
+            response = await _request("GET", f"{_BASE_URL}/report/results/", params=params)
+            return _parse_results(response.text)
     return []
 
 
@@ -72,11 +86,8 @@ def _parse_results(html: str) -> list[dict[str, Any]]:
 
 
 async def download_ptr_senate(url: str) -> bytes:
-    async with await _client() as client:
-        async with _RATE_LIMITER.limit():
-            response = await client.get(url)
-            response.raise_for_status()
-            return response.content
+    response = await _request("GET", url)
+    return response.content
 
 
 __all__ = ["list_ptr_senate", "download_ptr_senate"]
@@ -0,0 +1,167 @@
+"""Columnar filing catalog stored in the local DuckDB file."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pandas as pd
+
+from ...config import get_settings
+
+CATALOG_TABLE = "filing_catalog"
+META_TABLE = "filing_catalog_meta"
+COLUMNS = ("cik", "form", "accession", "filing_date", "primary_doc")
+
+
+class FilingCatalog:
+    """Read/replace access to the ``filing_catalog`` table.
+
+    The table is rebuilt wholesale from SEC's bulk ``submissions.zip`` and
+    stored sorted by ``(cik, form, filing_date)`` so DuckDB's zone maps prune
+    almost every row group for a single-issuer lookup.  Connections are opened
+    per call: DuckDB only allows one writer process per file, and readers must
+    not keep the nightly loader locked out.
+    """
+
+    def __init__(self, path: Path, *, max_age: timedelta):
+        self.path = path
+        self.max_age = max_age
+        self._meta: dict[str, Any] | None = None
+        self._meta_checked = 0.0
+
+    # --- Loading --------------------------------------------------------
+    def replace(self, batches: Iterable[pd.DataFrame], *, source: str) -> int:
+        """Swap in a new catalog built from ``batches`` of ``COLUMNS`` rows."""
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        total = 0
+        with duckdb.connect(str(self.path)) as con:
+            con.execute(
+                "CREATE OR REPLACE TEMP TABLE staging ("
+                "cik BIGINT, form VARCHAR, accession VARCHAR, filing_date DATE, primary_doc VARCHAR)"
+            )
+            for frame in batches:
+                con.register("batch", frame)
+                con.execute("INSERT INTO staging SELECT cik, form, accession, filing_date, primary_doc FROM batch")
+                con.unregister("batch")
+                total += len(frame)
+            con.execute("BEGIN TRANSACTION")
+            con.execute(f"DROP TABLE IF EXISTS {CATALOG_TABLE}")
+            con.execute(
+                f"CREATE TABLE {CATALOG_TABLE} AS "
+                "SELECT DISTINCT * FROM staging ORDER BY cik, form, filing_date DESC"
+            )
+            con.execute(
+                f"CREATE INDEX {CATALOG_TABLE}_cik_form_date ON {CATALOG_TABLE} (cik, form, filing_date)"
+            )
+            con.execute(
+                f"CREATE TABLE IF NOT EXISTS {META_TABLE} "
+                "(loaded_at TIMESTAMPTZ, source VARCHAR, filings BIGINT, ciks BIGINT)"
+            )
+            con.execute(f"DELETE FROM {META_TABLE}")
+            con.execute(
+                f"INSERT INTO {META_TABLE} SELECT ?, ?, count(*), count(DISTINCT cik) FROM {CATALOG_TABLE}",
+                [datetime.now(timezone.utc), source],
+            )
+            con.execute("COMMIT")
+        self._meta = None
+        return total
+
+    # --- Querying -------------------------------------------------------
+    def metadata(self) -> dict[str, Any] | None:
+        now = time.monotonic()
+        if self._meta is not None and now - self._meta_checked < 60:
+            return self._meta
+        self._meta_checked = now
+        self._meta = None
+        if not self.path.exists():
+            return None
+        try:
+            with duckdb.connect(str(self.path), read_only=True) as con:
+                row = con.execute(f"SELECT loaded_at, source, filings, ciks FROM {META_TABLE}").fetchone()
+        except duckdb.Error:
+            return None
+        if row:
+            self._meta = {"loaded_at": row[0], "source": row[1], "filings": row[2], "ciks": row[3]}
+        return self._meta
+
+    def is_fresh(self) -> bool:
+        meta = self.metadata()
+        if not meta:
+            return False
+        return datetime.now(timezone.utc) - meta["loaded_at"] <= self.max_age
+
+    def query(
+        self,
+        cik: str,
+        forms: Iterable[str],
+        *,
+        start: date | None = None,
+        end: date | None = None,
+        limit: int = 10,
+    ) -> list[dict[str, Any]] | None:
+        """Return filings newest first, or ``None`` when the catalog cannot answer."""
+
+        if not self.is_fresh():
+            return None
+        cik_num = int(cik)
+        form_list = list(forms)
+        clauses = ["cik = ?", f"form IN ({', '.join('?' for _ in form_list)})"]
+        params: list[Any] = [cik_num, *form_list]
+        if start is not None:
+            clauses.append("filing_date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("filing_date <= ?")
+            params.append(end)
+        sql = (
+            f"SELECT accession, form, filing_date, primary_doc FROM {CATALOG_TABLE} "
+            f"WHERE {' AND '.join(clauses)} ORDER BY filing_date DESC LIMIT ?"
+        )
+        try:
+            with duckdb.connect(str(self.path), read_only=True) as con:
+                known = con.execute(f"SELECT 1 FROM {CATALOG_TABLE} WHERE cik = ? LIMIT 1", [cik_num]).fetchone()
+                if not known:
+                    return None
+                rows = con.execute(sql, [*params, limit]).fetchall() if form_list else []
+        except duckdb.Error:
+            return None
+        return [
+            {"accession": acc, "form": form, "filed": filed.isoformat(), "primary_doc": doc}
+            for acc, form, filed, doc in rows
+        ]
+
+
+def frames_from_rows(rows: Iterable[tuple[int, str, str, str, str]], *, batch_size: int = 250_000) -> Iterator[pd.DataFrame]:
+    batch: list[tuple[int, str, str, str, str]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield _frame(batch)
+            batch = []
+    if batch:
+        yield _frame(batch)
+
+
+def _frame(batch: list[tuple[int, str, str, str, str]]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(batch, columns=list(COLUMNS))
+    frame["filing_date"] = pd.to_datetime(frame["filing_date"], errors="coerce").dt.date
+    return frame
+
+
+@lru_cache
+def get_catalog() -> FilingCatalog:
+    settings = get_settings()
+    return FilingCatalog(
+        Path(settings.duckdb_path),
+        max_age=timedelta(hours=settings.filing_catalog_max_age_hours),
+    )
+
+
+__all__ = ["FilingCatalog", "frames_from_rows", "get_catalog", "CATALOG_TABLE", "COLUMNS"]
@@ -17,7 +17,7 @@ class Base(DeclarativeBase):
 class Person(Base):
     __tablename__ = "person"
 
-    person_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4, init=False)
+    person_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     full_name: Mapped[str] = mapped_column(Text, nullable=False)
     chamber: Mapped[str | None] = mapped_column(String(32))
     role: Mapped[str | None] = mapped_column(String(128))
@@ -33,7 +33,7 @@ class Person(Base):
 class Issuer(Base):
     __tablename__ = "issuer"
 
-    issuer_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4, init=False)
+    issuer_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(Text, nullable=False)
     ticker: Mapped[str | None] = mapped_column(String(16))
     cik: Mapped[str | None] = mapped_column(String(20))
@@ -45,7 +45,7 @@ class Issuer(Base):
 class FilingRaw(Base):
     __tablename__ = "filing_raw"
 
-    filing_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4, init=False)
+    filing_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     source: Mapped[str] = mapped_column(String(32), nullable=False)
     source_key: Mapped[str] = mapped_column(Text, nullable=False)
     filed_date: Mapped[date | None] = mapped_column(Date)
@@ -63,7 +63,7 @@ class FilingRaw(Base):
 class Transaction(Base):
     __tablename__ = "transaction"
 
-    tx_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4, init=False)
+    tx_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     filing_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("filing_raw.filing_id"))
     person_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("person.person_id"))
     issuer_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("issuer.issuer_id"))
@@ -76,7 +76,7 @@ class Transaction(Base):
     cik: Mapped[str | None] = mapped_column(String(20))
     notes: Mapped[str | None] = mapped_column(Text)
 
-    filing: Mapped["FilingRaw" | None] = relationship(back_populates="transactions")
+    filing: Mapped[FilingRaw | None] = relationship(back_populates="transactions")
     person: Mapped[Person | None] = relationship()
     issuer: Mapped[Issuer | None] = relationship(back_populates="transactions")
 
@@ -84,7 +84,7 @@ class Transaction(Base):
 class Position13F(Base):
     __tablename__ = "position_13f"
 
-    pos_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4, init=False)
+    pos_id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
     filing_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("filing_raw.filing_id"))
     manager_name: Mapped[str | None] = mapped_column(Text)
     cik: Mapped[str | None] = mapped_column(String(20))
@@ -94,7 +94,7 @@ class Position13F(Base):
     sshPrnamt: Mapped[int | None] = mapped_column(BigInteger)
     sshPrnamtType: Mapped[str | None] = mapped_column(String(8))
 
-    filing: Mapped["FilingRaw" | None] = relationship(back_populates="positions_13f")
+    filing: Mapped[FilingRaw | None] = relationship(back_populates="positions_13f")
 
 
 __all__ = [
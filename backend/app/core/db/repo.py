@@ -6,6 +6,7 @@ from collections.abc import Iterable
 from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from . import models
@@ -70,6 +71,28 @@ class Repository:
             filing.json = json_payload or filing.json
         return filing
 
+    def bulk_add_filings(self, rows: Iterable[dict[str, Any]], *, batch_size: int = 5000) -> int:
+        """Insert many ``filing_raw`` rows, skipping ``(source, source_key)`` duplicates.
+
+        Rows are sent in multi-row ``INSERT ... ON CONFLICT DO NOTHING`` batches
+        without building ORM objects. Returns the number of rows submitted.
+        """
+
+        table = models.FilingRaw.__table__
+        stmt = pg_insert(table).on_conflict_do_nothing(index_elements=[table.c.source, table.c.source_key])
+        submitted = 0
+        batch: list[dict[str, Any]] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                self.session.execute(stmt, batch)
+                submitted += len(batch)
+                batch = []
+        if batch:
+            self.session.execute(stmt, batch)
+            submitted += len(batch)
+        return submitted
+
     # --- Transaction helpers -------------------------------------------
     def add_transactions(
         self,
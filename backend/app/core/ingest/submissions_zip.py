@@ -0,0 +1,68 @@
+"""Load SEC's bulk ``submissions.zip`` into the local DuckDB filing catalog.
+
+Usage::
+
+    python -m backend.app.core.ingest.submissions_zip ./storage/submissions.zip
+
+The archive is read member by member straight from the zip file, so the
+~15 GB of JSON it expands to never touches the disk.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from ...config import get_settings
+from ..db.catalog import FilingCatalog, frames_from_rows, get_catalog
+
+MEMBER_RE = re.compile(r"CIK(?P<cik>\d{10})(?P<page>-submissions-\d+)?\.json$")
+
+
+def _block_rows(cik: int, block: dict[str, Any]) -> Iterator[tuple[int, str, str, str, str]]:
+    forms = block.get("form", [])
+    accessions = block.get("accessionNumber", [])
+    dates = block.get("filingDate", [])
+    docs = block.get("primaryDocument", [])
+    for idx, form in enumerate(forms):
+        yield (cik, form, accessions[idx], dates[idx], docs[idx] if idx < len(docs) else "")
+
+
+def iter_zip_rows(path: Path) -> Iterator[tuple[int, str, str, str, str]]:
+    """Yield ``(cik, form, accession, filing_date, primary_doc)`` for every filing in the zip."""
+
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            match = MEMBER_RE.search(info.filename)
+            if not match:
+                continue
+            payload = orjson.loads(archive.read(info))
+            cik = int(match.group("cik"))
+            block = payload if match.group("page") else payload.get("filings", {}).get("recent", {})
+            yield from _block_rows(cik, block)
+
+
+def load_submissions_zip(path: Path, catalog: FilingCatalog | None = None) -> int:
+    catalog = catalog or get_catalog()
+    return catalog.replace(frames_from_rows(iter_zip_rows(path)), source=path.name)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Load submissions.zip into the DuckDB filing catalog")
+    parser.add_argument("zip_path", type=Path)
+    args = parser.parse_args(argv)
+    count = load_submissions_zip(args.zip_path)
+    print(f"{count} filings loaded into {get_settings().duckdb_path}")
+
+
+__all__ = ["iter_zip_rows", "load_submissions_zip"]
+
+
+if __name__ == "__main__":
+    main()
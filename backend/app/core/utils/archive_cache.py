@@ -0,0 +1,180 @@
+"""Content-addressed on-disk cache for immutable EDGAR archive documents."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import quote
+
+_BLOB_SUFFIX = ".z"
+
+
+class ArchiveCacheMiss(FileNotFoundError):
+    """Raised in ``cached_only`` mode when a document is not in the cache."""
+
+
+@dataclass(slots=True)
+class ArchiveCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class ArchiveCache:
+    """Stores archive documents as zlib-compressed blobs named by SHA-256.
+
+    ``refs/<accession>/<filename>`` holds the digest of the document, and
+    ``objects/<aa>/<digest>.z`` holds the compressed bytes, so identical
+    documents filed under several accessions are stored once.  Every write
+    goes through a temp file plus ``os.replace`` which makes the cache safe to
+    share between processes.  Blob mtimes are bumped on read and the oldest
+    blobs are evicted once the cache grows past ``max_bytes``.
+
+    The running size total only counts this process's writes.  When several
+    workers share the directory it is re-read from disk at least every
+    ``rescan_interval`` seconds, which bounds how far they can overshoot
+    ``max_bytes`` together to what they write within one interval.
+
+    All methods do blocking file I/O; async callers run them in a thread.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        max_bytes: int,
+        cached_only: bool = False,
+        rescan_interval: float = 60.0,
+    ):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.cached_only = cached_only
+        self.rescan_interval = rescan_interval
+        self.stats = ArchiveCacheStats()
+        self._approx_bytes: int | None = None
+        self._scanned_at = 0.0
+
+    @staticmethod
+    def _normalize_accession(accession: str) -> str:
+        return accession.replace("-", "").strip()
+
+    def _ref_path(self, accession: str, filename: str) -> Path:
+        return self.root / "refs" / self._normalize_accession(accession) / quote(filename, safe="")
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest}{_BLOB_SUFFIX}"
+
+    def get(self, accession: str, filename: str) -> bytes | None:
+        ref = self._ref_path(accession, filename)
+        try:
+            digest = ref.read_text(encoding="ascii").strip()
+            blob = self._blob_path(digest)
+            payload = zlib.decompress(blob.read_bytes())
+        except FileNotFoundError:
+            if ref.exists():
+                # The blob was evicted, possibly by another process: drop the stale ref.
+                ref.unlink(missing_ok=True)
+            self.stats.misses += 1
+            return None
+        except zlib.error:
+            self.stats.misses += 1
+            return None
+        try:
+            os.utime(blob)
+        except FileNotFoundError:  # pragma: no cover - evicted concurrently
+            pass
+        self.stats.hits += 1
+        return payload
+
+    def put(self, accession: str, filename: str, content: bytes) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        blob = self._blob_path(digest)
+        if not blob.exists():
+            compressed = zlib.compress(content, 6)
+            _atomic_write(blob, compressed)
+            if self._approx_bytes is not None:
+                self._approx_bytes += len(compressed)
+        _atomic_write(self._ref_path(accession, filename), digest.encode("ascii"))
+        self.stats.writes += 1
+        stale = time.monotonic() - self._scanned_at >= self.rescan_interval
+        if self._approx_bytes is None or self._approx_bytes > self.max_bytes or stale:
+            self.evict()
+        return digest
+
+    def evict(self) -> int:
+        """Drop least recently used blobs until the cache fits ``max_bytes``."""
+
+        self._scanned_at = time.monotonic()
+        blobs: list[tuple[float, int, Path]] = []
+        for path in (self.root / "objects").glob(f"*/*{_BLOB_SUFFIX}"):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in blobs)
+        evicted: set[str] = set()
+        if total > self.max_bytes:
+            blobs.sort()
+            for _, size, path in blobs:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                total -= size
+                evicted.add(path.name[: -len(_BLOB_SUFFIX)])
+        if evicted:
+            self._drop_refs(evicted)
+        self._approx_bytes = total
+        self.stats.evictions += len(evicted)
+        return len(evicted)
+
+    def _drop_refs(self, digests: set[str]) -> None:
+        for ref in (self.root / "refs").glob("*/*"):
+            try:
+                if ref.read_text(encoding="ascii").strip() in digests:
+                    ref.unlink()
+            except FileNotFoundError:
+                continue
+
+    def size_bytes(self) -> int:
+        if self._approx_bytes is None:
+            self.evict()
+        return self._approx_bytes or 0
+
+    def snapshot(self) -> dict[str, int | bool]:
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "writes": self.stats.writes,
+            "evictions": self.stats.evictions,
+            "size_bytes": self.size_bytes(),
+            "max_bytes": self.max_bytes,
+            "cached_only": self.cached_only,
+        }
+
+
+__all__ = ["ArchiveCache", "ArchiveCacheMiss", "ArchiveCacheStats"]
@@ -0,0 +1,36 @@
+-- Generic cell rate algorithm, reservation style: every call books the next
+-- slot on the shared schedule (the "theoretical arrival time") and returns how
+-- many microseconds the caller must sleep before using it.  Redis' own clock
+-- is used so that hosts with skewed clocks still agree on the schedule.
+--
+-- Next to the schedule (KEYS[1]) live the pacing interval every process
+-- follows (KEYS[2]) and a gate closed after upstream push-back (KEYS[3]), so
+-- an AIMD cut or a Retry-After seen by one worker slows all of them.
+--
+-- ARGV: interval_us, burst, per_us, publish_interval (0/1), block_us,
+--       reserve (0/1), interval_ttl_ms.  Returns {wait_us, interval_us}.
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local interval = tonumber(ARGV[1])
+if ARGV[4] == '1' then
+  redis.call('SET', KEYS[2], string.format('%.0f', interval), 'PX', tonumber(ARGV[7]))
+else
+  interval = tonumber(redis.call('GET', KEYS[2])) or interval
+end
+local gate = tonumber(redis.call('GET', KEYS[3])) or 0
+local block = tonumber(ARGV[5])
+if block > 0 and now + block > gate then
+  gate = now + block
+  redis.call('SET', KEYS[3], string.format('%.0f', gate), 'PX', math.ceil(block / 1000) + 1)
+end
+if ARGV[6] ~= '1' then
+  return {0, interval}
+end
+local burst = math.max(1, math.min(tonumber(ARGV[2]), math.floor(tonumber(ARGV[3]) / interval)))
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+if tat < gate then tat = gate end
+local wait = math.max(tat - interval * (burst - 1) - now, gate - now, 0)
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], string.format('%.0f', new_tat), 'PX', math.ceil((new_tat - now) / 1000) + 1)
+return {wait, interval}
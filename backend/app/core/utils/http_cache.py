@@ -0,0 +1,145 @@
+"""Conditional-GET cache for slowly changing upstream JSON documents."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+import httpx
+
+Fetcher = Callable[[str, dict[str, str]], Awaitable[httpx.Response]]
+
+
+@dataclass(slots=True)
+class CachedDocument:
+    payload: Any
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+
+@dataclass(slots=True)
+class RevalidationStats:
+    hits: int = 0
+    misses: int = 0
+    stale_served: int = 0
+    revalidations: int = 0
+    not_modified: int = 0
+    refreshed: int = 0
+    background_errors: int = 0
+    evictions: int = 0
+
+
+class RevalidatingCache:
+    """Keeps parsed JSON documents with their validators.
+
+    A document younger than ``ttl`` is served as-is.  Up to
+    ``ttl + stale_ttl`` the stale copy is served immediately while a single
+    background task revalidates it with ``If-None-Match`` /
+    ``If-Modified-Since``; past that the caller waits for revalidation.  A
+    ``304 Not Modified`` only refreshes the timestamp, so the body is neither
+    transferred nor parsed again.
+
+    At most ``max_entries`` documents are kept; the least recently used one is
+    dropped when a new URL would exceed that.
+    """
+
+    def __init__(self, fetcher: Fetcher, *, ttl: float, stale_ttl: float, max_entries: int = 1024):
+        self._fetcher = fetcher
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.stats = RevalidationStats()
+        self._entries: OrderedDict[str, CachedDocument] = OrderedDict()
+        self._background: dict[str, asyncio.Task[CachedDocument]] = {}
+
+    async def get_json(self, url: str, *, ttl: float | None = None) -> Any:
+        fresh_for = self.ttl if ttl is None else ttl
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+            age = time.monotonic() - entry.fetched_at
+            if age < fresh_for:
+                self.stats.hits += 1
+                return entry.payload
+            if age < fresh_for + self.stale_ttl:
+                self.stats.stale_served += 1
+                self._schedule(url)
+                return entry.payload
+        else:
+            self.stats.misses += 1
+        return (await self.revalidate(url)).payload
+
+    def invalidate(self, url: str | None = None) -> None:
+        if url is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(url, None)
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "stale_served": self.stats.stale_served,
+            "revalidations": self.stats.revalidations,
+            "not_modified": self.stats.not_modified,
+            "refreshed": self.stats.refreshed,
+            "background_errors": self.stats.background_errors,
+            "evictions": self.stats.evictions,
+        }
+
+    def _schedule(self, url: str) -> None:
+        if url in self._background:
+            return
+        task = asyncio.create_task(self.revalidate(url))
+        self._background[url] = task
+
+        def _done(t: asyncio.Task[CachedDocument]) -> None:
+            self._background.pop(url, None)
+            if not t.cancelled() and t.exception() is not None:
+                self.stats.background_errors += 1
+
+        task.add_done_callback(_done)
+
+    async def revalidate(self, url: str) -> CachedDocument:
+        """Revalidate ``url`` now, whatever its age, and return the stored document.
+
+        Callers that rebuild derived data can compare ``payload`` identity: a
+        ``304`` returns the same object.
+        """
+
+        entry = self._entries.get(url)
+        headers: dict[str, str] = {}
+        if entry is not None:
+            self.stats.revalidations += 1
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        response = await self._fetcher(url, headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED and entry is not None:
+            self.stats.not_modified += 1
+            entry.fetched_at = time.monotonic()
+            return entry
+        response.raise_for_status()
+        if entry is not None:
+            self.stats.refreshed += 1
+        updated = CachedDocument(
+            payload=response.json(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            fetched_at=time.monotonic(),
+        )
+        self._entries[url] = updated
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        return updated
+
+
+__all__ = ["RevalidatingCache", "CachedDocument", "RevalidationStats"]
@@ -4,34 +4,352 @@ from __future__ import annotations
 
 import asyncio
 import time
-from collections import deque
+from bisect import bisect_left
 from contextlib import asynccontextmanager
-from typing import Deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from ...config import get_settings
+
+_REGISTRY: dict[str, "RateLimiter | RedisRateLimiter"] = {}
+
+# Generic cell rate algorithm in Redis.  The script lives in its own file
+# because the SEC MCP server ships a verbatim copy of it for the shared sec.gov
+# budget (a test keeps the two identical); see the file for the keys and
+# arguments.
+_GCRA_RESERVE = Path(__file__).with_name("gcra_reserve.lua").read_text(encoding="utf-8")
+
+
+class Histogram:
+    """Fixed-bucket histogram (Prometheus style ``le`` bounds plus ``+Inf``)."""
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, hits in zip(self.bounds, self.counts):
+            seen += hits
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        buckets = {str(bound): hits for bound, hits in zip(self.bounds, self.counts)}
+        buckets["+Inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+WAIT_BUCKETS = (0.0, 0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEPTH_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
 
 
 class RateLimiter:
-    """Token bucket style rate limiter for async clients."""
+    """Fair token bucket for async clients.
+
+    ``rate`` permits are issued per ``per`` seconds with bursts of up to
+    ``burst`` (default ``rate``).  Each caller books the next free slot on a
+    virtual schedule and then sleeps until it, so nobody waits while holding
+    a lock, permits come out in arrival (FIFO) order, and the issue rate can
+    never drift past the configured window.
+    """
+
+    def __init__(self, rate: float, per: float, *, burst: int | None = None, name: str | None = None):
+        self.per = per
+        self.burst = burst or int(rate)
+        self.name = name
+        self.set_rate(rate)
+        self._next_slot = 0.0  # theoretical arrival time of the next permit
+        self._waiting = 0
+        self.queue_depth = Histogram(DEPTH_BUCKETS)
+        self.wait_time = Histogram(WAIT_BUCKETS)
+        if name is not None:
+            _REGISTRY[name] = self
+
+    def set_rate(self, rate: float) -> None:
+        """Change the permit rate for future bookings; bursts shrink with it."""
 
-    def __init__(self, rate: int, per: float):
         self.rate = rate
+        self._interval = self.per / rate
+        self._tolerance = self._interval * (max(1, min(self.burst, int(rate))) - 1)
+        self.changed_at = time.monotonic()
+
+    async def acquire(self) -> None:
+        self.queue_depth.observe(self._waiting)
+        now = time.monotonic()
+        # Booking happens without an await, so it is atomic on the event loop.
+        slot = max(self._next_slot, now)
+        self._next_slot = slot + self._interval
+        delay = slot - self._tolerance - now
+        if delay > 0:
+            self._waiting += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                if self._next_slot == slot + self._interval:
+                    self._next_slot = slot  # nobody booked behind us: hand the slot back
+                raise
+            finally:
+                self._waiting -= 1
+        self.wait_time.observe(max(delay, 0.0))
+
+    @asynccontextmanager
+    async def limit(self):
+        await self.acquire()
+        yield
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "backend": "local",
+            "rate": self.rate,
+            "per": self.per,
+            "burst": self.burst,
+            "waiting": self._waiting,
+            "queue_depth": self.queue_depth.snapshot(),
+            "wait_seconds": self.wait_time.snapshot(),
+        }
+
+
+@dataclass(slots=True)
+class RedisLimiterStats:
+    redis_grants: int = 0
+    local_grants: int = 0
+    redis_errors: int = 0
+
+
+class RedisRateLimiter:
+    """Rate limiter whose budget is shared by every process through Redis.
+
+    ``rate`` requests per ``per`` seconds are allowed for ``name`` across all
+    workers pointing at the same Redis, with bursts of up to ``rate``.  When
+    Redis cannot be reached the limiter degrades to an in-process
+    :class:`RateLimiter` and retries Redis after ``retry_after`` seconds.
+
+    :meth:`set_rate` and :meth:`block` are published to Redis as well: every
+    reservation paces at the last published rate (kept for
+    ``shared_rate_ttl`` seconds) and waits out the shared gate, and the
+    limiter's own ``rate`` follows the published one.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        per: float,
+        *,
+        redis_url: str | None = None,
+        client: Any | None = None,
+        retry_after: float = 30.0,
+        shared_rate_ttl: float = 300.0,
+    ):
+        self.name = name
+        self.key = f"ratelimit:{name}"
+        self.keys = [self.key, f"{self.key}:interval", f"{self.key}:gate"]
         self.per = per
-        self._lock = asyncio.Lock()
-        self._events: Deque[float] = deque()
+        self.burst = int(rate)
+        self.retry_after = retry_after
+        self.shared_rate_ttl = shared_rate_ttl
+        self.stats = RedisLimiterStats()
+        self._redis_url = redis_url
+        self._client = client
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self._script: Any | None = None
+        self._local = RateLimiter(rate, per)
+        self._apply_rate(rate)
+        # The configured rate is a ceiling, not a signal: it must not lift a
+        # cut another process published.
+        self._publish_rate = False
+        self._block_us = 0
+        self._publisher: asyncio.Task[None] | None = None
+        self._redis_down_until = 0.0
+        self._waiting = 0
+        self.queue_depth = Histogram(DEPTH_BUCKETS)
+        self.wait_time = Histogram(WAIT_BUCKETS)
+        _REGISTRY[name] = self
+
+    def _apply_rate(self, rate: float) -> None:
+        self.rate = rate
+        self._interval_us = int(self.per / rate * 1_000_000)
+        self._local.set_rate(rate)
+        self.changed_at = self._local.changed_at
+
+    def set_rate(self, rate: float) -> None:
+        """Change the rate here and, from the next Redis call on, for every process."""
+
+        self._apply_rate(rate)
+        self._publish_rate = True
+        self._schedule_publish()
+
+    def block(self, seconds: float) -> None:
+        """Close the shared gate for ``seconds`` (e.g. an upstream ``Retry-After``)."""
+
+        self._block_us = max(self._block_us, int(seconds * 1_000_000))
+        self._schedule_publish()
+
+    def _schedule_publish(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sent along with the next reservation
+        if self._publisher is None or self._publisher.done():
+            self._publisher = loop.create_task(self._call_script(reserve=False))
+
+    def _adopt(self, interval_us: int) -> None:
+        if interval_us != self._interval_us and interval_us > 0:
+            self._apply_rate(self.per * 1_000_000 / interval_us)
+
+    async def _reserve_script(self) -> Any:
+        loop = asyncio.get_running_loop()
+        if self._client is None or (self._redis_url is not None and self._client_loop is not loop):
+            # redis-py connections are bound to the loop that opened them; the
+            # client of a previous loop is closed rather than leaked.  The swap
+            # happens before any await so concurrent callers share one client.
+            previous = self._client
+            self._client = aioredis.Redis.from_url(
+                self._redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=1.0,
+            )
+            self._client_loop = loop
+            self._script = None
+            if previous is not None:
+                await self._close_client(previous)
+        if self._script is None:
+            self._script = self._client.register_script(_GCRA_RESERVE)
+        return self._script
+
+    @staticmethod
+    async def _close_client(client: Any) -> None:
+        try:
+            await client.aclose()
+        except (RedisError, OSError, RuntimeError):  # its loop may already be closed
+            pass
+
+    async def aclose(self) -> None:
+        """Close the Redis client opened from ``redis_url`` (a passed-in client is left alone)."""
+
+        if self._redis_url is None or self._client is None:
+            return
+        client, self._client, self._client_loop, self._script = self._client, None, None, None
+        await self._close_client(client)
+
+    async def _call_script(self, *, reserve: bool) -> int | None:
+        """Run the GCRA script; returns the wait in microseconds or None if Redis is down."""
+
+        if time.monotonic() < self._redis_down_until:
+            return None
+        publish, block_us = self._publish_rate, self._block_us
+        self._publish_rate, self._block_us = False, 0
+        args = [
+            self._interval_us,
+            self.burst,
+            int(self.per * 1_000_000),
+            int(publish),
+            block_us,
+            int(reserve),
+            int(self.shared_rate_ttl * 1000),
+        ]
+        try:
+            script = await self._reserve_script()
+            wait_us, interval_us = await script(keys=self.keys, args=args)
+        except (RedisError, OSError):
+            self.stats.redis_errors += 1
+            self._redis_down_until = time.monotonic() + self.retry_after
+            return None
+        self._adopt(int(interval_us))
+        return int(wait_us)
 
     async def acquire(self) -> None:
-        async with self._lock:
-            now = time.monotonic()
-            while self._events and now - self._events[0] > self.per:
-                self._events.popleft()
-            if len(self._events) >= self.rate:
-                sleep_for = self.per - (now - self._events[0])
-                await asyncio.sleep(max(sleep_for, 0))
-            self._events.append(time.monotonic())
+        wait_us = await self._call_script(reserve=True)
+        if wait_us is not None:
+            self.stats.redis_grants += 1
+            self.queue_depth.observe(self._waiting)
+            self.wait_time.observe(wait_us / 1_000_000)
+            if wait_us > 0:
+                self._waiting += 1
+                try:
+                    await asyncio.sleep(wait_us / 1_000_000)
+                finally:
+                    self._waiting -= 1
+            return
+        self.stats.local_grants += 1
+        await self._local.acquire()
 
     @asynccontextmanager
     async def limit(self):
         await self.acquire()
         yield
 
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "backend": "redis",
+            "rate": self.rate,
+            "per": self.per,
+            "redis_available": time.monotonic() >= self._redis_down_until,
+            **asdict(self.stats),
+            "waiting": self._waiting,
+            "queue_depth": self.queue_depth.snapshot(),
+            "wait_seconds": self.wait_time.snapshot(),
+            "local": self._local.snapshot(),
+        }
+
+
+def shared_rate_limiter(name: str, rate: float, per: float) -> RateLimiter | RedisRateLimiter:
+    """Return the limiter for upstream ``name`` according to ``rate_limit_backend``."""
+
+    settings = get_settings()
+    if settings.rate_limit_backend == "redis":
+        return RedisRateLimiter(name, rate, per, redis_url=settings.redis_url)
+    return RateLimiter(rate, per, name=name)
+
+
+async def aclose_rate_limiters() -> None:
+    """Close the Redis clients opened on the running loop (FastAPI lifespan shutdown)."""
+
+    for limiter in _REGISTRY.values():
+        if isinstance(limiter, RedisRateLimiter):
+            await limiter.aclose()
+
+
+def rate_limit_stats() -> dict[str, dict[str, Any]]:
+    return {name: limiter.snapshot() for name, limiter in _REGISTRY.items()}
+
 
-__all__ = ["RateLimiter"]
+__all__ = [
+    "Histogram",
+    "RateLimiter",
+    "RedisRateLimiter",
+    "RedisLimiterStats",
+    "aclose_rate_limiters",
+    "shared_rate_limiter",
+    "rate_limit_stats",
+]
@@ -0,0 +1,79 @@
+"""Request coalescing for identical in-flight upstream fetches."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+_REGISTRY: dict[str, "SingleFlight"] = {}
+
+
+@dataclass(slots=True)
+class SingleFlightStats:
+    leaders: int = 0
+    coalesced: int = 0
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_freeze(v) for v in value]
+        return tuple(sorted(items, key=repr)) if isinstance(value, (set, frozenset)) else tuple(items)
+    return value if isinstance(value, Hashable) else repr(value)
+
+
+def request_key(method: str, url: str, **kwargs: Any) -> Hashable:
+    """Build a coalescing key from the request line and its params/data/headers."""
+
+    return (method.upper(), str(url), _freeze(kwargs))
+
+
+class SingleFlight:
+    """Lets concurrent callers with the same key share one upstream call.
+
+    The first caller (the leader) starts the call as its own task; everyone
+    else awaits that task through :func:`asyncio.shield`, so cancelling any
+    single waiter, including the leader, never cancels the shared fetch.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stats = SingleFlightStats()
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        _REGISTRY[name] = self
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self.stats.leaders += 1
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    def snapshot(self) -> dict[str, int]:
+        return {
+            "in_flight": len(self._inflight),
+            "leaders": self.stats.leaders,
+            "coalesced": self.stats.coalesced,
+        }
+
+
+def single_flight_stats() -> dict[str, dict[str, int]]:
+    return {name: flight.snapshot() for name, flight in _REGISTRY.items()}
+
+
+__all__ = ["SingleFlight", "SingleFlightStats", "request_key", "single_flight_stats"]
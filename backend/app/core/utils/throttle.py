@@ -0,0 +1,170 @@
+"""Adaptive per-host throttling driven by upstream push-back."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+
+import httpx
+from tenacity import RetryCallState
+
+from .rate_limit import RateLimiter, RedisRateLimiter, shared_rate_limiter
+
+THROTTLE_STATUSES = frozenset({403, 429, 503})
+
+_THROTTLES: dict[str, "AdaptiveThrottle"] = {}
+
+
+def parse_retry_after(value: str | None, *, now: datetime | None = None) -> float | None:
+    """Return the ``Retry-After`` delay in seconds (delta-seconds or HTTP-date)."""
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+class AdaptiveThrottle:
+    """AIMD rate controller in front of one upstream host's limiter.
+
+    A 429/403/503 multiplies the permitted rate by ``decrease`` (at most once
+    per ``cooldown`` seconds, so a wave of in-flight rejections counts as one
+    signal) and closes the gate for the ``Retry-After`` period, or for
+    ``backoff`` seconds when the header is missing.  After every
+    ``increase_every`` seconds without push-back the rate grows by
+    ``increase`` again, up to the configured ceiling.
+
+    With a :class:`RedisRateLimiter` both the rate and the gate are shared:
+    a cut or ``Retry-After`` observed by one worker is published next to the
+    GCRA key and paces every process using it, and a rate adopted from
+    Redis restarts the quiet period here.  With the in-process
+    :class:`RateLimiter` the controller only governs this process.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limiter: RateLimiter | RedisRateLimiter,
+        *,
+        min_rate: float | None = None,
+        decrease: float = 0.5,
+        increase: float | None = None,
+        increase_every: float = 5.0,
+        cooldown: float = 1.0,
+        backoff: float = 2.0,
+        max_retry_after: float = 600.0,
+    ):
+        self.name = name
+        self.limiter = limiter
+        self.max_rate = limiter.rate
+        self.min_rate = min_rate or min(self.max_rate, 0.1)
+        self.decrease = decrease
+        self.increase = increase or max(self.max_rate / 10, 0.05)
+        self.increase_every = increase_every
+        self.cooldown = cooldown
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.blocked_until = 0.0
+        self.throttled = 0
+        self.decreases = 0
+        self.increases = 0
+
+    @property
+    def rate(self) -> float:
+        return self.limiter.rate
+
+    async def _wait_for_gate(self) -> None:
+        while (delay := self.blocked_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+    async def acquire(self) -> None:
+        await self._wait_for_gate()
+        await self.limiter.acquire()
+        # The gate may have closed while we were queued for a permit.
+        await self._wait_for_gate()
+
+    @asynccontextmanager
+    async def limit(self):
+        await self.acquire()
+        yield
+
+    def observe(self, response: httpx.Response) -> None:
+        """Feed an upstream response into the controller."""
+
+        now = time.monotonic()
+        if response.status_code in THROTTLE_STATUSES:
+            self.throttled += 1
+            # ``changed_at`` also moves when a Redis limiter adopts another worker's cut
+            if now - self.limiter.changed_at >= self.cooldown or self.rate >= self.max_rate:
+                self.limiter.set_rate(max(self.min_rate, self.rate * self.decrease))
+                self.decreases += 1
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            delay = self.backoff if delay is None else min(delay, self.max_retry_after)
+            self.blocked_until = max(self.blocked_until, now + delay)
+            if isinstance(self.limiter, RedisRateLimiter):
+                self.limiter.block(delay)
+        elif response.status_code < 400 and self.rate < self.max_rate:
+            if now - self.limiter.changed_at >= self.increase_every:
+                self.limiter.set_rate(min(self.max_rate, self.rate + self.increase))
+                self.increases += 1
+
+    def retry_wait(self, fallback: Callable[[RetryCallState], float]) -> Callable[[RetryCallState], float]:
+        """Tenacity ``wait`` that defers to the gate after push-back.
+
+        Throttled attempts retry immediately because :meth:`acquire` already
+        holds them until ``Retry-After`` expires; anything else (timeouts,
+        5xx) keeps the ``fallback`` schedule.
+        """
+
+        def wait(state: RetryCallState) -> float:
+            exc = state.outcome.exception() if state.outcome else None
+            if isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code in THROTTLE_STATUSES:
+                return 0.0
+            return fallback(state)
+
+        return wait
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "rate": round(self.rate, 4),
+            "max_rate": self.max_rate,
+            "blocked_for": round(max(self.blocked_until - time.monotonic(), 0.0), 3),
+            "throttled": self.throttled,
+            "decreases": self.decreases,
+            "increases": self.increases,
+        }
+
+
+def host_throttle(name: str, rate: float, per: float, **kwargs: Any) -> AdaptiveThrottle:
+    """Return the process-wide throttle for upstream ``name``, creating it once."""
+
+    throttle = _THROTTLES.get(name)
+    if throttle is None:
+        throttle = AdaptiveThrottle(name, shared_rate_limiter(name, rate, per), **kwargs)
+        _THROTTLES[name] = throttle
+    return throttle
+
+
+def throttle_stats() -> dict[str, dict[str, Any]]:
+    return {name: throttle.snapshot() for name, throttle in _THROTTLES.items()}
+
+
+__all__ = [
+    "AdaptiveThrottle",
+    "THROTTLE_STATUSES",
+    "host_throttle",
+    "parse_retry_after",
+    "throttle_stats",
+]
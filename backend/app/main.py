@@ -1,9 +1,15 @@
 """FastAPI application entrypoint for xFinance backend."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from .config import Settings, get_settings
+from .core.clients.pool import http_clients
+from .core.utils.rate_limit import aclose_rate_limiters
 from .routers import (
+    diagnostics,
     search,
     sources_edgar,
     sources_oge,
@@ -12,6 +18,18 @@ from .routers import (
 )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the shared upstream HTTP pools on startup and drain them on shutdown."""
+
+    http_clients.open()
+    try:
+        yield
+    finally:
+        await http_clients.aclose()
+        await aclose_rate_limiters()
+
+
 def create_app(settings: Settings | None = None) -> FastAPI:
     """Create and configure the FastAPI application instance."""
     cfg = settings or get_settings()
@@ -19,6 +37,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         title="xFinance Sources API",
         version="0.1.0",
         default_response_class=cfg.default_response_class,
+        lifespan=lifespan,
     )
 
     # include routers under a single versioned prefix
@@ -27,6 +46,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
     app.include_router(sources_ptr_senate.router, prefix=cfg.api_prefix)
     app.include_router(sources_oge.router, prefix=cfg.api_prefix)
     app.include_router(search.router, prefix=cfg.api_prefix)
+    app.include_router(diagnostics.router, prefix=cfg.api_prefix)
 
     return app
 
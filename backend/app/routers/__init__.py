@@ -1,8 +1,9 @@
 """Router package exports."""
 
-from . import search, sources_edgar, sources_oge, sources_ptr_house, sources_ptr_senate
+from . import diagnostics, search, sources_edgar, sources_oge, sources_ptr_house, sources_ptr_senate
 
 __all__ = [
+    "diagnostics",
     "search",
     "sources_edgar",
     "sources_oge",
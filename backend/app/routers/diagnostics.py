@@ -0,0 +1,39 @@
+"""Router exposing runtime diagnostics for upstream connectivity."""
+
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import APIRouter
+
+from ..core.clients.edgar import archive_cache, submissions_cache
+from ..core.clients.pool import pool_stats
+from ..core.utils.rate_limit import rate_limit_stats
+from ..core.utils.single_flight import single_flight_stats
+from ..core.utils.throttle import throttle_stats
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+@router.get("/http")
+async def http_pools():
+    return {"sources": pool_stats()}
+
+
+@router.get("/cache")
+async def caches():
+    return {
+        # The first snapshot scans the cache directory to size it.
+        "edgar_archive": await asyncio.to_thread(archive_cache().snapshot),
+        "edgar_submissions": submissions_cache().snapshot(),
+    }
+
+
+@router.get("/single-flight")
+async def single_flight():
+    return {"sources": single_flight_stats()}
+
+
+@router.get("/rate-limits")
+async def rate_limits():
+    return {"limiters": rate_limit_stats(), "throttles": throttle_stats()}
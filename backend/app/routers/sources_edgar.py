@@ -2,7 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import date
+from typing import Any
+
+import httpx
+import orjson
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from lxml import etree
+from pydantic import BaseModel, Field
 
 from ..core.clients.edgar import download_form4_by_accession, list_recent_filings
 from ..core.parsers.sec_form4 import parse_form4_xml
@@ -11,10 +21,22 @@ from ..core.parsers.sec_13f import parse_13f_xml
 router = APIRouter(prefix="/sources/edgar", tags=["edgar"])
 
 
+class Form4BatchRequest(BaseModel):
+    accessions: list[str] = Field(..., min_length=1, max_length=1000)
+    primary_docs: dict[str, str] = Field(
+        default_factory=dict,
+        description="Optional accession -> primaryDocument map; skips the index.json lookup",
+    )
+    concurrency: int = Field(8, ge=1, le=16, description="Maximum filings downloaded at once")
+
+
 @router.get("/form4")
-async def get_form4(accession: str = Query(..., description="SEC accession number")):
+async def get_form4(
+    accession: str = Query(..., description="SEC accession number"),
+    primary_doc: str | None = Query(None, description="primaryDocument from the submissions feed"),
+):
     try:
-        xml = await download_form4_by_accession(accession)
+        xml = await download_form4_by_accession(accession, primary_doc)
     except FileNotFoundError as exc:  # pragma: no cover - network dependent
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     txns = parse_form4_xml(xml)
@@ -25,13 +47,67 @@ async def get_form4(accession: str = Query(..., description="SEC accession numbe
     }
 
 
+async def _form4_record(accession: str, primary_doc: str | None = None) -> dict[str, Any]:
+    try:
+        xml = await download_form4_by_accession(accession, primary_doc)
+        txns = await asyncio.to_thread(parse_form4_xml, xml)
+    except FileNotFoundError as exc:
+        return {"accession": accession, "status": 404, "error": str(exc)}
+    except httpx.HTTPStatusError as exc:
+        return {"accession": accession, "status": exc.response.status_code, "error": str(exc)}
+    except (httpx.HTTPError, etree.XMLSyntaxError, ValueError) as exc:
+        return {"accession": accession, "status": 502, "error": str(exc)}
+    except Exception as exc:  # noqa: BLE001 - one malformed filing must not end the batch
+        return {"accession": accession, "status": 500, "error": f"{type(exc).__name__}: {exc}"}
+    return {
+        "accession": accession,
+        "status": 200,
+        "count": len(txns),
+        "transactions": [txn.model_dump(mode="json") for txn in txns],
+    }
+
+
+async def _stream_form4_batch(
+    accessions: list[str],
+    primary_docs: dict[str, str],
+    concurrency: int,
+) -> AsyncIterator[bytes]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(accession: str) -> dict[str, Any]:
+        async with semaphore:
+            return await _form4_record(accession, primary_docs.get(accession))
+
+    tasks = [asyncio.create_task(bounded(accession)) for accession in dict.fromkeys(accessions)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield orjson.dumps(await next_done) + b"\n"
+    finally:
+        # Client went away mid-stream: stop spending SEC budget on the rest.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@router.post("/form4/batch")
+async def get_form4_batch(payload: Form4BatchRequest):
+    """Download and parse many Form 4 filings, streamed back as NDJSON in completion order."""
+
+    return StreamingResponse(
+        _stream_form4_batch(payload.accessions, payload.primary_docs, payload.concurrency),
+        media_type="application/x-ndjson",
+    )
+
+
 @router.get("/recent")
 async def get_recent_filings(
     cik: str = Query(..., description="CIK of the filer"),
     form: list[str] = Query(["4"], description="Form types to include"),
     limit: int = Query(10, le=100),
+    start: date | None = Query(None, description="Earliest filing date"),
+    end: date | None = Query(None, description="Latest filing date"),
 ):
-    filings = await list_recent_filings(cik, form, limit)
+    filings = await list_recent_filings(cik, form, limit, start=start, end=end)
     return {"cik": cik, "filings": filings}
 
 
@@ -0,0 +1 @@
+"""Micro-benchmarks runnable with ``python -m backend.benchmarks.<name>``."""
@@ -0,0 +1,88 @@
+"""Throughput and tail latency of the rate limiter under many concurrent waiters.
+
+Usage::
+
+    python -m backend.benchmarks.rate_limit --waiters 1000 --rate 500 --burst 50
+
+Runs the reservation-based :class:`RateLimiter` next to the previous
+lock-and-sleep sliding window (kept here only as a baseline) and prints the
+achieved rate, wait-time percentiles and how many grants were out of
+arrival order.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import deque
+
+from ..app.core.utils.rate_limit import RateLimiter
+
+
+class SlidingWindowLimiter:
+    """The pre-reservation limiter: sleeps while holding its lock."""
+
+    def __init__(self, rate: int, per: float):
+        self.rate = rate
+        self.per = per
+        self._lock = asyncio.Lock()
+        self._events: deque[float] = deque()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            while self._events and now - self._events[0] > self.per:
+                self._events.popleft()
+            if len(self._events) >= self.rate:
+                await asyncio.sleep(max(self.per - (now - self._events[0]), 0))
+            self._events.append(time.monotonic())
+
+
+async def _drive(limiter, waiters: int) -> dict[str, float]:
+    waits: list[float] = [0.0] * waiters
+    grants: list[int] = []
+
+    async def waiter(idx: int) -> None:
+        started = time.monotonic()
+        await limiter.acquire()
+        waits[idx] = time.monotonic() - started
+        grants.append(idx)
+
+    started = time.monotonic()
+    await asyncio.gather(*(waiter(i) for i in range(waiters)))
+    elapsed = time.monotonic() - started
+    ordered = sorted(waits)
+    return {
+        "elapsed_s": elapsed,
+        "permits_per_s": waiters / elapsed,
+        "p50_wait_ms": statistics.median(ordered) * 1000,
+        "p99_wait_ms": ordered[int(0.99 * (waiters - 1))] * 1000,
+        "max_wait_ms": ordered[-1] * 1000,
+        "out_of_order": sum(1 for a, b in zip(grants, grants[1:]) if b < a),
+    }
+
+
+def run(waiters: int, rate: int, burst: int) -> dict[str, dict[str, float]]:
+    # Both limiters allow ``rate`` permits/s with an initial burst of ``burst``.
+    per_window = burst / rate
+    return {
+        "reservation": asyncio.run(_drive(RateLimiter(rate, 1.0, burst=burst), waiters)),
+        "sliding_window": asyncio.run(_drive(SlidingWindowLimiter(burst, per_window), waiters)),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--waiters", type=int, default=1000)
+    parser.add_argument("--rate", type=int, default=500)
+    parser.add_argument("--burst", type=int, default=50)
+    args = parser.parse_args(argv)
+    for name, result in run(args.waiters, args.rate, args.burst).items():
+        fields = "  ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}" for key, value in result.items())
+        print(f"{name:<15} {fields}")
+
+
+if __name__ == "__main__":
+    main()
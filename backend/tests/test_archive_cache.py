@@ -0,0 +1,59 @@
+import os
+
+from backend.app.core.utils.archive_cache import ArchiveCache
+
+
+def test_archive_cache_roundtrip_and_dedupe(tmp_path):
+    cache = ArchiveCache(tmp_path, max_bytes=1_000_000)
+    assert cache.get("0000320193-24-000001", "index.json") is None
+
+    digest = cache.put("0000320193-24-000001", "index.json", b'{"directory": {}}')
+    same = cache.put("000032019324000002", "index.json", b'{"directory": {}}')
+
+    assert digest == same
+    assert cache.get("000032019324000001", "index.json") == b'{"directory": {}}'
+    assert len(list((tmp_path / "objects").glob("*/*.z"))) == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_archive_cache_evicts_least_recently_used(tmp_path):
+    cache = ArchiveCache(tmp_path, max_bytes=2_500)
+    payloads = {name: os.urandom(1_000) for name in ("a.xml", "b.xml", "c.xml")}
+    digest_a = cache.put("0001-24-1", "a.xml", payloads["a.xml"])
+    digest_b = cache.put("0001-24-1", "b.xml", payloads["b.xml"])
+    os.utime(cache._blob_path(digest_a), (1, 1))
+    os.utime(cache._blob_path(digest_b), (2, 2))
+    # Reading "a" makes it the most recently used blob, so "b" is evicted.
+    assert cache.get("0001-24-1", "a.xml") == payloads["a.xml"]
+    cache.put("0001-24-1", "c.xml", payloads["c.xml"])
+
+    assert cache.get("0001-24-1", "b.xml") is None
+    assert cache.get("0001-24-1", "a.xml") == payloads["a.xml"]
+    assert cache.size_bytes() <= 2_500
+    assert cache.stats.evictions == 1
+
+
+def test_archive_cache_eviction_drops_stale_refs(tmp_path):
+    cache = ArchiveCache(tmp_path, max_bytes=1_500)
+    old = cache.put("0001-24-1", "old.xml", os.urandom(1_000))
+    os.utime(cache._blob_path(old), (1, 1))
+    cache.put("0001-24-1", "new.xml", os.urandom(1_000))
+
+    assert not cache._blob_path(old).exists()
+    assert not cache._ref_path("0001-24-1", "old.xml").exists()
+    assert cache._ref_path("0001-24-1", "new.xml").exists()
+
+
+def test_archive_cache_rescans_writes_from_other_processes(tmp_path):
+    first = ArchiveCache(tmp_path, max_bytes=1_500)
+    second = ArchiveCache(tmp_path, max_bytes=1_500, rescan_interval=0.0)
+    second.put("0001-24-1", "small.xml", os.urandom(100))
+    digest = first.put("0001-24-1", "a.xml", os.urandom(1_000))
+    os.utime(first._blob_path(digest), (1, 1))
+    # ``second`` never saw the write of "a"; its own total stays under the cap
+    # and only the rescan from disk notices the shared directory is over it.
+    second.put("0001-24-1", "b.xml", os.urandom(1_000))
+
+    assert second.size_bytes() <= 1_500
+    assert first.get("0001-24-1", "a.xml") is None
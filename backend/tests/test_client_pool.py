@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+
+from backend.app.core.clients.pool import ClientManager, SourceProfile
+
+
+def _profile(handler) -> SourceProfile:
+    return SourceProfile(
+        name="test",
+        timeout=httpx.Timeout(5.0),
+        limits=httpx.Limits(max_connections=2, max_keepalive_connections=1),
+        headers={"User-Agent": "xFinance-test"},
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_client_manager_reuses_client_and_counts_requests():
+    seen_agents: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_agents.append(request.headers["User-Agent"])
+        return httpx.Response(404 if request.url.path == "/missing" else 200)
+
+    async def scenario():
+        manager = ClientManager()
+        manager.register(_profile(handler))
+        first = manager.get("test")
+        assert manager.get("test") is first
+        await first.get("https://example.test/ok")
+        await first.get("https://example.test/missing")
+        stats = manager.stats()["test"]
+        await manager.aclose()
+        reopened = manager.get("test")
+        await manager.aclose()
+        return first, reopened, stats, manager.stats()["test"]
+
+    first, reopened, stats, after = asyncio.run(scenario())
+    assert reopened is not first
+    assert seen_agents == ["xFinance-test", "xFinance-test"]
+    assert stats["open"] is True
+    assert stats["requests"] == 2
+    assert stats["errors"] == 1
+    assert after["open"] is False
+    assert after["clients_opened"] == 2
@@ -0,0 +1,66 @@
+from datetime import date
+
+from backend.app.core.ingest.edgar_index import build_work_list, filing_rows
+from backend.app.core.parsers.edgar_index import iter_index_dir, parse_index_lines
+
+MASTER_IDX = """Description:           Master Index of EDGAR Dissemination Feed
+Last Data Received:    March 31, 2024
+Comments:              webmaster@sec.gov
+Anonymous FTP:         ftp://ftp.sec.gov/edgar/
+
+CIK|Company Name|Form Type|Date Filed|Filename
+--------------------------------------------------------------------------------
+1214156|Cook Timothy D|4|2024-01-03|edgar/data/1214156/0000320193-24-000001.txt
+320193|Apple Inc.|10-K|2024-01-05|edgar/data/320193/0000320193-24-000002.txt
+320193|Apple Inc.|4|2024-01-03|edgar/data/320193/0000320193-24-000001.txt
+320193|Apple Inc.|4|2024-03-20|edgar/data/320193/0000320193-24-000040.txt
+"""
+
+FORM_IDX = """Description:           Daily Index of EDGAR Dissemination Feed by Form Type
+Last Data Received:    April 2, 2024
+
+Form Type   Company Name                                                  CIK         Date Filed  File Name
+---------------------------------------------------------------------------------------------------------------------------------------------
+4           NVIDIA CORP                                                   1045810     20240402    edgar/data/1045810/0001045810-24-000077.txt
+SC 13G/A    NVIDIA CORP                                                   1045810     20240402    edgar/data/1045810/0000950123-24-000123.txt
+"""
+
+
+def test_parse_form_idx_fixed_width_columns():
+    entries = list(parse_index_lines(FORM_IDX.splitlines(keepends=True)))
+    assert [e.form for e in entries] == ["4", "SC 13G/A"]
+    assert entries[1].company == "NVIDIA CORP"
+    assert entries[1].cik == "1045810"
+    assert entries[0].filed == date(2024, 4, 2)
+    assert entries[1].accession == "0000950123-24-000123"
+
+
+def test_iter_index_dir_filters_and_dedupes(tmp_path):
+    (tmp_path / "2024" / "QTR1").mkdir(parents=True)
+    (tmp_path / "2024" / "QTR1" / "master.idx").write_text(MASTER_IDX, encoding="latin-1")
+    (tmp_path / "2024" / "QTR2").mkdir(parents=True)
+    (tmp_path / "2024" / "QTR2" / "form.20240402.idx").write_text(FORM_IDX, encoding="latin-1")
+
+    entries = list(iter_index_dir(tmp_path, forms=["4"], start=date(2024, 1, 1), end=date(2024, 3, 31)))
+    assert [e.accession for e in entries] == ["0000320193-24-000001", "0000320193-24-000040"]
+
+    rows = list(filing_rows(iter_index_dir(tmp_path, forms=["4"])))
+    assert len(rows) == 3
+    assert rows[-1]["source_key"] == "0001045810-24-000077"
+    assert rows[-1]["json"]["form"] == "4"
+
+
+def test_work_list_streams_bounded_batches(tmp_path):
+    (tmp_path / "2024" / "QTR1").mkdir(parents=True)
+    (tmp_path / "2024" / "QTR1" / "master.idx").write_text(MASTER_IDX, encoding="latin-1")
+
+    assert [len(batch) for batch in build_work_list(tmp_path, forms=["4"], batch_size=2)] == [2]
+
+    batches = list(build_work_list(tmp_path, forms=["4"], batch_size=1))
+    assert [len(batch) for batch in batches] == [1, 1, 1]
+    # Duplicates split across batches are left to ON CONFLICT on (source, source_key)
+    assert [e.accession for batch in batches for e in batch] == [
+        "0000320193-24-000001",
+        "0000320193-24-000001",
+        "0000320193-24-000040",
+    ]
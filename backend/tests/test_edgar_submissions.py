@@ -0,0 +1,97 @@
+import asyncio
+import json
+from datetime import date
+
+import httpx
+from tenacity import wait_none
+
+from backend.app.core.clients import edgar
+from backend.app.core.utils.http_cache import RevalidatingCache
+
+
+def _block(rows):
+    return {
+        "form": [form for form, _, _ in rows],
+        "accessionNumber": [acc for _, acc, _ in rows],
+        "filingDate": [filed for _, _, filed in rows],
+        "primaryDocument": [f"{acc}.xml" for _, acc, _ in rows],
+    }
+
+
+PAYLOADS = {
+    "CIK0000320193.json": {
+        "filings": {
+            "recent": _block([("4", "a-3", "2024-03-01"), ("10-K", "k-1", "2024-02-01"), ("4", "a-2", "2024-01-15")]),
+            "files": [
+                {"name": "CIK0000320193-submissions-001.json", "filingFrom": "2023-01-01", "filingTo": "2023-12-31"},
+                {"name": "CIK0000320193-submissions-002.json", "filingFrom": "2020-01-01", "filingTo": "2022-12-31"},
+            ],
+        }
+    },
+    "CIK0000320193-submissions-001.json": _block([("4", "b-2", "2023-06-01"), ("4", "b-1", "2023-02-01")]),
+    "CIK0000320193-submissions-002.json": _block([("4", "c-1", "2021-05-01")]),
+}
+
+
+def _run(monkeypatch, **kwargs):
+    requested: list[str] = []
+
+    async def fetcher(url: str, headers: dict[str, str]) -> httpx.Response:
+        name = url.rsplit("/", 1)[-1]
+        requested.append(name)
+        return httpx.Response(200, json=PAYLOADS[name], request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(edgar, "_SUBMISSIONS_CACHE", RevalidatingCache(fetcher, ttl=60.0, stale_ttl=0.0))
+    filings = asyncio.run(edgar.list_recent_filings("320193", ["4"], **kwargs))
+    return [f["accession"] for f in filings], requested
+
+
+def test_shallow_query_reads_only_recent(monkeypatch):
+    accessions, requested = _run(monkeypatch, limit=2)
+    assert accessions == ["a-3", "a-2"]
+    assert requested == ["CIK0000320193.json"]
+
+
+def test_deep_query_follows_history_pages(monkeypatch):
+    accessions, requested = _run(monkeypatch, limit=10)
+    assert accessions == ["a-3", "a-2", "b-2", "b-1", "c-1"]
+    assert len(requested) == 3
+
+
+def test_date_window_skips_pages_outside_range(monkeypatch):
+    accessions, requested = _run(monkeypatch, limit=10, start=date(2023, 1, 1), end=date(2023, 12, 31))
+    assert accessions == ["b-2", "b-1"]
+    assert "CIK0000320193-submissions-002.json" not in requested
+
+
+def _archive(monkeypatch, responses):
+    requested: list[str] = []
+
+    async def fetch_archive(accession: str, filename: str) -> bytes:
+        requested.append(filename)
+        status, body = responses.pop(0)
+        if status != 200:
+            request = httpx.Request("GET", f"https://www.sec.gov/Archives/{filename}")
+            raise httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+        return body
+
+    monkeypatch.setattr(edgar, "fetch_archive", fetch_archive)
+    monkeypatch.setattr(edgar, "_RETRY_BACKOFF", wait_none())
+    return requested
+
+
+def test_direct_form4_download_retries_transient_errors(monkeypatch):
+    requested = _archive(monkeypatch, [(503, b""), (200, b"<ownershipDocument/>")])
+    xml = asyncio.run(edgar.download_form4_by_accession("0000320193-24-000001", "xslF345X05/form4.xml"))
+    assert xml == "<ownershipDocument/>"
+    assert requested == ["form4.xml", "form4.xml"]
+
+
+def test_direct_form4_download_falls_back_on_404_without_retry(monkeypatch):
+    index = {"directory": {"item": [{"name": "wf-form4_1.xml", "type": "text/xml"}]}}
+    requested = _archive(
+        monkeypatch,
+        [(404, b""), (200, json.dumps(index).encode()), (200, b"<ownershipDocument/>")],
+    )
+    asyncio.run(edgar.download_form4_by_accession("0000320193-24-000001", "form4.xml"))
+    assert requested == ["form4.xml", "index.json", "wf-form4_1.xml"]
@@ -0,0 +1,36 @@
+import json
+import zipfile
+from datetime import date, timedelta
+
+from backend.app.core.db.catalog import FilingCatalog
+from backend.app.core.ingest.submissions_zip import load_submissions_zip
+
+
+def _block(rows):
+    return {
+        "accessionNumber": [acc for acc, _, _ in rows],
+        "form": [form for _, form, _ in rows],
+        "filingDate": [filed for _, _, filed in rows],
+        "primaryDocument": [f"{acc}.htm" for acc, _, _ in rows],
+    }
+
+
+def test_load_submissions_zip_and_query(tmp_path):
+    archive = tmp_path / "submissions.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr(
+            "CIK0000320193.json",
+            json.dumps({"filings": {"recent": _block([("a-2", "4", "2024-03-01"), ("k-1", "10-K", "2023-11-03")])}}),
+        )
+        zf.writestr("CIK0000320193-submissions-001.json", json.dumps(_block([("a-1", "4", "2019-05-01")])))
+        zf.writestr("CIK0000789019.json", json.dumps({"filings": {"recent": _block([("m-1", "4", "2024-02-01")])}}))
+
+    catalog = FilingCatalog(tmp_path / "xfinance.duckdb", max_age=timedelta(hours=1))
+    assert catalog.query("320193", ["4"]) is None
+
+    assert load_submissions_zip(archive, catalog) == 4
+    rows = catalog.query("0000320193", ["4"], limit=5)
+    assert [row["accession"] for row in rows] == ["a-2", "a-1"]
+    assert rows[0] == {"accession": "a-2", "form": "4", "filed": "2024-03-01", "primary_doc": "a-2.htm"}
+    assert catalog.query("320193", ["4"], start=date(2020, 1, 1)) == [rows[0]]
+    assert catalog.query("1045810", ["4"]) is None
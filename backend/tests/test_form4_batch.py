@@ -0,0 +1,86 @@
+import asyncio
+
+import orjson
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.routers import sources_edgar
+
+XML = """
+<ownershipDocument>
+  <issuer><issuerCik>0000320193</issuerCik><issuerTradingSymbol>AAPL</issuerTradingSymbol></issuer>
+  <reportingOwner><reportingOwnerId><rptOwnerName>Tim Cook</rptOwnerName></reportingOwnerId></reportingOwner>
+</ownershipDocument>
+"""
+
+# accession -> (seconds before answering, outcome)
+BEHAVIOUR = {
+    "ok-slow": (0.05, XML),
+    "missing": (0.0, FileNotFoundError("No Form 4 XML found")),
+    "garbled": (0.01, "<ownershipDocument><issuer>"),
+    "broken": (0.02, KeyError("name")),
+}
+
+
+def _client(monkeypatch, requested):
+    async def download(accession, primary_doc=None):
+        requested.append(accession)
+        delay, outcome = BEHAVIOUR[accession]
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(sources_edgar, "download_form4_by_accession", download)
+    app = FastAPI()
+    app.include_router(sources_edgar.router)
+    return TestClient(app)
+
+
+def test_batch_streams_per_accession_records_in_completion_order(monkeypatch):
+    requested = []
+    client = _client(monkeypatch, requested)
+    response = client.post(
+        "/sources/edgar/form4/batch",
+        json={"accessions": ["ok-slow", "missing", "garbled", "broken", "missing"], "concurrency": 4},
+    )
+    assert response.status_code == 200
+    records = [orjson.loads(line) for line in response.content.splitlines()]
+
+    # Duplicates are fetched once and every failure stays in its own record
+    assert sorted(requested) == ["broken", "garbled", "missing", "ok-slow"]
+    assert [(r["accession"], r["status"]) for r in records] == [
+        ("missing", 404),
+        ("garbled", 502),
+        ("broken", 500),
+        ("ok-slow", 200),
+    ]
+    assert "KeyError" in records[2]["error"]
+    assert records[3]["count"] == len(records[3]["transactions"])
+
+
+def test_closing_the_stream_cancels_and_awaits_pending_downloads(monkeypatch):
+    started, cancelled = [], []
+
+    async def download(accession, primary_doc=None):
+        started.append(accession)
+        if accession == "fast":
+            return XML
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(accession)
+            raise
+
+    monkeypatch.setattr(sources_edgar, "download_form4_by_accession", download)
+
+    async def run():
+        stream = sources_edgar._stream_form4_batch(["fast", "slow-1", "slow-2"], {}, 4)
+        first = orjson.loads(await stream.__anext__())
+        await stream.aclose()  # client disconnects
+        # No yield to the loop here: aclose() already awaited the cancelled tasks
+        return first, sorted(cancelled)
+
+    first, cancelled_on_close = asyncio.run(run())
+    assert first["accession"] == "fast"
+    assert cancelled_on_close == ["slow-1", "slow-2"]
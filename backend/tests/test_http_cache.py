@@ -0,0 +1,79 @@
+import asyncio
+
+import httpx
+
+from backend.app.core.utils.http_cache import RevalidatingCache
+
+URL = "https://data.sec.gov/submissions/CIK0000320193.json"
+
+
+def test_revalidating_cache_uses_conditional_requests():
+    calls: list[dict[str, str]] = []
+
+    async def fetcher(url: str, headers: dict[str, str]) -> httpx.Response:
+        calls.append(dict(headers))
+        request = httpx.Request("GET", url, headers=headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, json={"cik": "320193"}, headers={"ETag": '"v1"'}, request=request)
+
+    async def scenario():
+        cache = RevalidatingCache(fetcher, ttl=60.0, stale_ttl=0.0)
+        first = await cache.get_json(URL)
+        second = await cache.get_json(URL)
+        # Expired with no stale window: the caller waits for a 304 revalidation.
+        third = await cache.get_json(URL, ttl=0.0)
+        return cache, first, second, third
+
+    cache, first, second, third = asyncio.run(scenario())
+    assert first == second == third == {"cik": "320193"}
+    assert calls == [{}, {"If-None-Match": '"v1"'}]
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+    assert cache.stats.revalidations == 1
+    assert cache.stats.not_modified == 1
+
+
+def test_revalidating_cache_serves_stale_while_refreshing():
+    versions = iter([{"v": 1}, {"v": 2}])
+
+    async def fetcher(url: str, headers: dict[str, str]) -> httpx.Response:
+        return httpx.Response(200, json=next(versions), request=httpx.Request("GET", url))
+
+    async def scenario():
+        cache = RevalidatingCache(fetcher, ttl=0.0, stale_ttl=60.0)
+        first = await cache.get_json(URL)
+        stale = await cache.get_json(URL)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        refreshed = await cache.get_json(URL, ttl=60.0)
+        return cache, first, stale, refreshed
+
+    cache, first, stale, refreshed = asyncio.run(scenario())
+    assert first == stale == {"v": 1}
+    assert refreshed == {"v": 2}
+    assert cache.stats.stale_served == 1
+    assert cache.stats.refreshed == 1
+
+
+def test_revalidating_cache_evicts_least_recently_used_documents():
+    fetched: list[str] = []
+
+    async def fetcher(url: str, headers: dict[str, str]) -> httpx.Response:
+        fetched.append(url)
+        return httpx.Response(200, json={"url": url}, request=httpx.Request("GET", url))
+
+    async def scenario():
+        cache = RevalidatingCache(fetcher, ttl=60.0, stale_ttl=0.0, max_entries=2)
+        await cache.get_json("https://a")
+        await cache.get_json("https://b")
+        await cache.get_json("https://a")  # "b" is now the least recently used
+        await cache.get_json("https://c")
+        await cache.get_json("https://a")
+        await cache.get_json("https://b")
+        return cache
+
+    cache = asyncio.run(scenario())
+    assert fetched == ["https://a", "https://b", "https://c", "https://b"]
+    assert cache.snapshot()["entries"] == 2
+    assert cache.stats.evictions == 2
@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import fakeredis
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from backend.app.core.utils import rate_limit
+from backend.app.core.utils.rate_limit import RateLimiter, RedisRateLimiter
+
+
+def test_processes_share_one_budget():
+    async def run():
+        server = fakeredis.FakeServer()
+        # Two limiters on separate connections stand in for two worker processes.
+        first = RedisRateLimiter("test-shared", rate=5, per=0.5, client=fakeredis.FakeAsyncRedis(server=server))
+        second = RedisRateLimiter("test-shared", rate=5, per=0.5, client=fakeredis.FakeAsyncRedis(server=server))
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for limiter in (first, second) for _ in range(5)))
+        return time.monotonic() - started, first, second
+
+    elapsed, first, second = asyncio.run(run())
+    # A burst of 5 goes through immediately; the other 5 are spaced 0.1s apart.
+    assert 0.45 <= elapsed < 1.0
+    assert first.stats.redis_grants + second.stats.redis_grants == 10
+    assert first.stats.local_grants == second.stats.local_grants == 0
+
+
+def test_burst_within_budget_does_not_wait():
+    async def run():
+        limiter = RedisRateLimiter("test-burst", rate=10, per=1.0, client=fakeredis.FakeAsyncRedis())
+        started = time.monotonic()
+        for _ in range(10):
+            async with limiter.limit():
+                pass
+        return time.monotonic() - started, limiter
+
+    elapsed, limiter = asyncio.run(run())
+    assert elapsed < 0.2
+    assert limiter.wait_time.max == 0
+
+
+def test_falls_back_to_local_limiter_when_redis_is_down():
+    class DownRedis:
+        def register_script(self, _source):
+            async def script(**_kwargs):
+                raise RedisConnectionError("connection refused")
+
+            return script
+
+    async def run():
+        limiter = RedisRateLimiter("test-down", rate=3, per=1.0, client=DownRedis(), retry_after=60)
+        for _ in range(3):
+            await limiter.acquire()
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.stats.redis_errors == 1
+    assert limiter.stats.local_grants == 3
+    assert limiter.snapshot()["redis_available"] is False
+
+
+def test_local_limiter_grants_fifo_with_burst():
+    async def run():
+        limiter = RateLimiter(rate=20, per=1.0, burst=5)
+        order: list[int] = []
+
+        async def worker(idx: int) -> None:
+            await limiter.acquire()
+            order.append(idx)
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(i) for i in range(10)))
+        return time.monotonic() - started, order, limiter
+
+    elapsed, order, limiter = asyncio.run(run())
+    assert order == list(range(10))
+    # Five permits are immediate; the rest arrive every 50ms.
+    assert 0.2 <= elapsed < 0.5
+    assert limiter.wait_time.counts[0] == 5
+    assert limiter.queue_depth.max == 4
+
+
+def test_cancelled_waiter_returns_its_slot():
+    async def run():
+        limiter = RateLimiter(rate=1, per=1.0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        started = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - started
+
+    # The freed slot is reused instead of pushing the next caller out to 2s.
+    assert asyncio.run(run()) < 1.1
+
+
+def test_url_limiter_closes_the_client_of_a_previous_loop(monkeypatch):
+    server = fakeredis.FakeServer()
+    opened: list[fakeredis.FakeAsyncRedis] = []
+    closed: list[fakeredis.FakeAsyncRedis] = []
+
+    class Client(fakeredis.FakeAsyncRedis):
+        async def aclose(self, *args, **kwargs):
+            closed.append(self)
+            await super().aclose(*args, **kwargs)
+
+    def from_url(_url, **_kwargs):
+        opened.append(Client(server=server))
+        return opened[-1]
+
+    monkeypatch.setattr(rate_limit.aioredis.Redis, "from_url", from_url)
+    limiter = RedisRateLimiter("test-loops", rate=100, per=1.0, redis_url="redis://fake")
+
+    async def twice():
+        await limiter.acquire()
+        await limiter.acquire()
+
+    asyncio.run(twice())
+    assert len(opened) == 1 and closed == []
+    # A new loop (another asyncio.run) opens a new client and closes the old one.
+    asyncio.run(limiter.acquire())
+    assert len(opened) == 2 and closed == opened[:1]
+    asyncio.run(limiter.aclose())
+    assert closed == opened
+    assert limiter.stats.redis_grants == 3
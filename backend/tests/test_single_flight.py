@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from backend.app.core.utils.single_flight import SingleFlight, request_key
+
+
+def test_concurrent_callers_share_one_call():
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "payload"
+
+    async def run():
+        flight = SingleFlight("test-share")
+        key = request_key("get", "https://example.test/x", params={"b": 2, "a": 1})
+        same = request_key("GET", "https://example.test/x", params={"a": 1, "b": 2})
+        assert key == same
+        results = await asyncio.gather(*(flight.do(key, fetch) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(run())
+    assert results == ["payload"] * 5
+    assert calls == 1
+    assert flight.snapshot() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+
+def test_cancelling_one_waiter_keeps_shared_call_alive():
+    async def run():
+        flight = SingleFlight("test-cancel")
+        release = asyncio.Event()
+
+        async def fetch():
+            await release.wait()
+            return 42
+
+        leader = asyncio.create_task(flight.do("k", fetch))
+        follower = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == 42
+
+
+def test_errors_propagate_to_every_waiter_and_are_not_cached():
+    attempts = 0
+
+    async def fetch():
+        nonlocal attempts
+        attempts += 1
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def run():
+        flight = SingleFlight("test-error")
+        outcomes = await asyncio.gather(flight.do("k", fetch), flight.do("k", fetch), return_exceptions=True)
+        second = await asyncio.gather(flight.do("k", fetch), return_exceptions=True)
+        return outcomes + second
+
+    outcomes = asyncio.run(run())
+    assert all(isinstance(exc, RuntimeError) for exc in outcomes)
+    assert attempts == 2
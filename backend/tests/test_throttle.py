@@ -0,0 +1,110 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import fakeredis
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt
+
+from backend.app.core.utils.rate_limit import RateLimiter, RedisRateLimiter
+from backend.app.core.utils.throttle import AdaptiveThrottle, parse_retry_after
+
+
+def _response(status: int, **headers: str) -> httpx.Response:
+    return httpx.Response(status, headers=headers, request=httpx.Request("GET", "https://example.test/"))
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    now = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 01 May 2024 12:00:30 GMT", now=now) == 30.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_push_back_cuts_rate_and_closes_gate():
+    async def run():
+        throttle = AdaptiveThrottle("test-429", RateLimiter(10, 1.0), backoff=0.5)
+        throttle.observe(_response(429))
+        # A second rejection from the same wave does not halve the rate again.
+        throttle.observe(_response(503))
+        started = time.monotonic()
+        await throttle.acquire()
+        return throttle, time.monotonic() - started
+
+    throttle, waited = asyncio.run(run())
+    assert throttle.rate == 5
+    assert throttle.decreases == 1
+    assert throttle.throttled == 2
+    # Neither response carries Retry-After, so the gate closes for the 0.5s backoff.
+    assert waited >= 0.45
+
+
+def test_additive_recovery_after_quiet_period():
+    throttle = AdaptiveThrottle("test-recover", RateLimiter(10, 1.0), increase=1.0, increase_every=0.0)
+    throttle.observe(_response(429, **{"Retry-After": "0"}))
+    assert throttle.rate == 5
+    for _ in range(3):
+        throttle.observe(_response(200))
+    assert throttle.rate == 8
+    for _ in range(5):
+        throttle.observe(_response(200))
+    assert throttle.rate == 10
+    assert throttle.increases == 5
+
+
+def test_retry_wait_defers_to_gate_for_throttled_errors():
+    calls = 0
+    throttle = AdaptiveThrottle("test-retry", RateLimiter(100, 1.0))
+
+    async def flaky() -> str:
+        nonlocal calls
+        calls += 1
+        response = _response(429 if calls == 1 else 200, **{"Retry-After": "0.1"})
+        throttle.observe(response)
+        response.raise_for_status()
+        return "ok"
+
+    async def run():
+        retry = AsyncRetrying(
+            stop=stop_after_attempt(3),
+            wait=throttle.retry_wait(lambda _state: 30.0),
+            retry=retry_if_exception_type(httpx.HTTPError),
+            reraise=True,
+        )
+        async for attempt in retry:
+            with attempt:
+                await throttle.acquire()
+                return await flaky()
+
+    started = time.monotonic()
+    assert asyncio.run(run()) == "ok"
+    assert calls == 2
+    assert 0.05 <= time.monotonic() - started < 5
+
+
+def test_push_back_is_shared_through_redis():
+    async def run():
+        server = fakeredis.FakeServer()
+        # Two throttles on separate connections stand in for two worker processes.
+        first, second = (
+            AdaptiveThrottle(
+                "test-shared-429",
+                RedisRateLimiter("test-shared-429", 10, 1.0, client=fakeredis.FakeAsyncRedis(server=server)),
+                backoff=0.3,
+            )
+            for _ in range(2)
+        )
+        await first.acquire()
+        first.observe(_response(429))
+        await asyncio.sleep(0.01)  # let the publish task reach Redis
+        started = time.monotonic()
+        await second.acquire()
+        return first, second, time.monotonic() - started
+
+    first, second, waited = asyncio.run(run())
+    assert first.rate == 5
+    # The second worker never saw the 429 but waits out the gate and adopts the cut.
+    assert waited >= 0.2
+    assert second.rate == 5
+    assert second.blocked_until == 0.0
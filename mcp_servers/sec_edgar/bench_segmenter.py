@@ -0,0 +1,120 @@
+"""Benchmark del segmentador frente a la extracción con BeautifulSoup.
+
+Uso (desde ``mcp_servers/sec_edgar``)::
+
+    python bench_segmenter.py --mb 8 --repeat 3
+    python bench_segmenter.py --file ~/10k/aapl-20230930.htm
+
+Sin ``--file`` genera un 10-K sintético del tamaño pedido con la estructura
+habitual de EDGAR (índice con enlaces, tablas XBRL en línea, estilos en
+línea) y comprueba que ambas implementaciones devuelven el mismo texto.
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Dict, List
+
+from bs4 import BeautifulSoup
+
+from main import ITEM_PATTERNS
+from segmenter import segment_html
+
+ITEMS = [
+    ("1", "Business"),
+    ("1A", "Risk Factors"),
+    ("1B", "Unresolved Staff Comments"),
+    ("2", "Properties"),
+    ("3", "Legal Proceedings"),
+    ("5", "Market for Registrant's Common Equity"),
+    ("7", "Management's Discussion and Analysis of Financial Condition"),
+    ("7A", "Quantitative and Qualitative Disclosures About Market Risk"),
+    ("8", "Financial Statements and Supplementary Data"),
+    ("9A", "Controls and Procedures"),
+    ("15", "Exhibits and Financial Statement Schedules"),
+]
+
+
+def beautifulsoup_sections(html: str) -> Dict[str, str]:
+    """Implementación previa: árbol completo, get_text, copia en minúsculas y regex por patrón."""
+    body = BeautifulSoup(html, "lxml").get_text("\n", strip=True)
+    lower = body.lower()
+    found: Dict[str, str] = {}
+    for key, patterns in ITEM_PATTERNS.items():
+        for pattern in patterns:
+            match = re.search(pattern, lower)
+            if match:
+                start = match.start()
+                next_match = re.search(r"\nitem\s+\d+[a-z]?\.", lower[start + 10 :])
+                end = start + 10 + (next_match.start() if next_match else len(lower))
+                found[key] = body[start:end][:20000]
+                break
+    return found
+
+
+def segmenter_sections(html: str) -> Dict[str, str]:
+    text, spans = segment_html(html, ITEM_PATTERNS)
+    return {key: text[offset : offset + length] for key, (offset, length) in spans.items()}
+
+
+def synthetic_10k(target_bytes: int, seed: int = 7, toc: bool = True) -> str:
+    rng = random.Random(seed)
+    words = "revenue growth customers supply chain liquidity operating margin interest rates regulation".split()
+    style = 'style="font-family:Times New Roman;font-size:10pt;margin-top:6pt"'
+
+    def paragraph() -> str:
+        return f"<p {style}><span {style}>{' '.join(rng.choice(words) for _ in range(60))}.</span></p>\n"
+
+    def table() -> str:
+        rows = "".join(
+            f"<tr><td {style}>Line {n}</td><td><ix:nonFraction name='us-gaap:Revenues' scale='6'>{rng.randint(1, 99999):,}</ix:nonFraction></td></tr>"
+            for n in range(12)
+        )
+        return f"<table {style}>{rows}</table>\n"
+
+    rows = "".join(f"<tr><td><a href='#i{num}'>Item {num}.</a></td><td>{title}</td></tr>" for num, title in ITEMS)
+    index = f"<table>{rows}</table>\n" if toc else ""
+    head = f"<html><head><title>10-K</title><style>p {{margin:0}}</style></head><body>{index}"
+    per_item = max(target_bytes // len(ITEMS), 10_000)
+    parts: List[str] = [head]
+    for num, title in ITEMS:
+        parts.append(f"<div id='i{num}'><p {style}><b>Item {num}. {title}</b></p></div>\n")
+        size = 0
+        while size < per_item:
+            block = table() if rng.random() < 0.2 else paragraph()
+            parts.append(block)
+            size += len(block)
+    parts.append("<!-- fin del documento --></body></html>")
+    return "".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del segmentador de secciones")
+    parser.add_argument("--file", help="HTML real de un 10-K/10-Q/20-F")
+    parser.add_argument("--mb", type=float, default=8.0, help="tamaño del 10-K sintético")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--sin-indice", action="store_true", help="sin tabla de contenidos: obliga a leer casi todo")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, "rb") as fh:
+            html = fh.read().decode("utf-8", errors="replace")
+    else:
+        html = synthetic_10k(int(args.mb * 1024 * 1024), toc=not args.sin_indice)
+    print(f"documento: {len(html) / 1024 / 1024:.1f} MB")
+
+    results = {}
+    for name, fn in (("beautifulsoup", beautifulsoup_sections), ("segmenter", segmenter_sections)):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            results[name] = fn(html)
+            timings.append(time.perf_counter() - started)
+        print(f"{name:<14} mejor={min(timings):.3f}s  media={sum(timings) / len(timings):.3f}s")
+    same = results["beautifulsoup"] == results["segmenter"]
+    print(f"mismas secciones: {same}")
+
+
+if __name__ == "__main__":
+    main()
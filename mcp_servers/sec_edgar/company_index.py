@@ -0,0 +1,204 @@
+"""Índice ticker↔CIK↔título del servidor SEC con instantánea binaria mapeable.
+
+Formato del fichero (little-endian)::
+
+    cabecera   MAGIC, fetched_at (f64), filas, gramas, bytes de texto
+    filas      cik u32 | off/len ticker u32/u16 | off/len título u32/u16 | nº gramas u16
+    gramas     off/len del grama u32/u16 | off/nº de postings u32/u32   (ordenados)
+    postings   u32 id de fila
+    texto      UTF-8 de tickers, títulos y gramas
+
+Los postings se leen directamente del ``mmap`` sin copiarlos; sólo los
+diccionarios ticker→fila y CIK→fila se construyen al cargar.
+"""
+
+import mmap
+import os
+import re
+import struct
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+MAGIC = b"XFCMAP1\n"
+_HEADER = struct.Struct("<8sdIII")
+_ROW = struct.Struct("<IIHIHH")
+_GRAM = struct.Struct("<IHII")
+_NON_ALNUM = re.compile(r"[^0-9A-Z]+")
+
+
+def normalize_title(title: str) -> str:
+    return _NON_ALNUM.sub(" ", title.upper()).strip()
+
+
+def trigrams(text: str) -> List[str]:
+    padded = f"  {normalize_title(text)} "
+    return sorted({padded[i : i + 3] for i in range(len(padded) - 2)})
+
+
+class CompanyIndex:
+    """Tablas ticker→fila y CIK→fila en O(1) más índice de trigramas de títulos."""
+
+    def __init__(
+        self,
+        rows: List[Tuple[int, str, str, int]],
+        grams: Dict[str, memoryview],
+        fetched_at: float,
+        backing: Optional[mmap.mmap] = None,
+    ) -> None:
+        self.rows = rows  # (cik, ticker, título, nº de trigramas)
+        self.grams = grams
+        self.fetched_at = fetched_at
+        self._backing = backing
+        self.by_ticker: Dict[str, int] = {}
+        self.by_cik: Dict[int, List[int]] = {}
+        for idx, (cik, ticker, _title, _n) in enumerate(rows):
+            self.by_ticker.setdefault(ticker, idx)
+            self.by_cik.setdefault(cik, []).append(idx)
+
+    # --- Construcción ---------------------------------------------------
+    @classmethod
+    def from_payload(cls, payload: Dict, fetched_at: Optional[float] = None) -> "CompanyIndex":
+        """Construye el índice a partir de ``company_tickers.json`` (orden de la SEC)."""
+        rows: List[Tuple[int, str, str, int]] = []
+        postings: Dict[str, List[int]] = {}
+        for entry in payload.values():
+            ticker = (entry.get("ticker") or "").upper()
+            if not ticker:
+                continue
+            title = entry.get("title", "")
+            grams = trigrams(title)
+            row_id = len(rows)
+            rows.append((int(entry.get("cik_str")), ticker, title, len(grams)))
+            for gram in grams:
+                postings.setdefault(gram, []).append(row_id)
+        packed = {gram: memoryview(struct.pack(f"<{len(ids)}I", *ids)).cast("I") for gram, ids in postings.items()}
+        return cls(rows, packed, fetched_at if fetched_at is not None else time.time())
+
+    # --- Consultas ------------------------------------------------------
+    def ticker(self, ticker: str) -> Optional[Dict]:
+        idx = self.by_ticker.get(ticker.strip().upper())
+        return None if idx is None else self._record(idx)
+
+    def cik(self, cik: str) -> Optional[Dict]:
+        """Ticker principal (el primero en el orden de la SEC) y el resto de tickers del CIK."""
+        ids = self.by_cik.get(int(cik))
+        if not ids:
+            return None
+        record = self._record(ids[0])
+        record["tickers"] = [self.rows[idx][1] for idx in ids]
+        return record
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.3) -> List[Dict]:
+        """Búsqueda aproximada de títulos por coeficiente de Dice sobre trigramas."""
+        wanted = trigrams(query)
+        hits: Counter = Counter()
+        for gram in wanted:
+            ids = self.grams.get(gram)
+            if ids is not None:
+                hits.update(ids)
+        scored = []
+        for idx, common in hits.items():
+            score = 2.0 * common / (len(wanted) + self.rows[idx][3])
+            if score >= min_score:
+                scored.append((score, idx))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        results = []
+        for score, idx in scored[:limit]:
+            record = self._record(idx)
+            record["score"] = round(score, 3)
+            results.append(record)
+        return results
+
+    def _record(self, idx: int) -> Dict:
+        cik, ticker, title, _n = self.rows[idx]
+        return {"ticker": ticker, "cik": str(cik).zfill(10), "title": title}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # --- Instantánea ----------------------------------------------------
+    def save(self, path: str) -> None:
+        """Escribe la instantánea de forma atómica (fichero temporal + ``os.replace``)."""
+        text = bytearray()
+
+        def intern(value: str) -> Tuple[int, int]:
+            raw = value.encode("utf-8")[:0xFFFF]
+            offset = len(text)
+            text.extend(raw)
+            return offset, len(raw)
+
+        row_bytes = bytearray()
+        for cik, ticker, title, n_grams in self.rows:
+            t_off, t_len = intern(ticker)
+            n_off, n_len = intern(title)
+            row_bytes += _ROW.pack(cik, t_off, t_len, n_off, n_len, n_grams)
+        gram_bytes = bytearray()
+        posting_bytes = bytearray()
+        for gram in sorted(self.grams):
+            ids = self.grams[gram]
+            g_off, g_len = intern(gram)
+            gram_bytes += _GRAM.pack(g_off, g_len, len(posting_bytes) // 4, len(ids))
+            posting_bytes += ids.tobytes()
+        header = _HEADER.pack(MAGIC, self.fetched_at, len(self.rows), len(self.grams), len(text))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in (header, row_bytes, gram_bytes, posting_bytes, text):
+                    fh.write(chunk)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Optional["CompanyIndex"]:
+        """Mapea la instantánea en memoria; None si no existe o no es válida."""
+        try:
+            with open(path, "rb") as fh:
+                backing = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        view = memoryview(backing)
+        try:
+            magic, fetched_at, n_rows, n_grams, text_len = _HEADER.unpack_from(view, 0)
+            if magic != MAGIC:
+                return None
+            rows_at = _HEADER.size
+            grams_at = rows_at + n_rows * _ROW.size
+            postings_at = grams_at + n_grams * _GRAM.size
+            text_at = len(view) - text_len
+            text = view[text_at:]
+
+            def decode(offset: int, length: int) -> str:
+                return str(text[offset : offset + length], "utf-8")
+
+            rows = []
+            for cik, t_off, t_len, n_off, n_len, n_count in _ROW.iter_unpack(view[rows_at:grams_at]):
+                rows.append((cik, decode(t_off, t_len), decode(n_off, n_len), n_count))
+            postings = view[postings_at:text_at].cast("I")
+            grams = {
+                decode(g_off, g_len): postings[start : start + count]
+                for g_off, g_len, start, count in _GRAM.iter_unpack(view[grams_at:postings_at])
+            }
+        except (struct.error, TypeError, UnicodeDecodeError, ValueError):
+            return None
+        return cls(rows, grams, fetched_at, backing)
+
+
+def build_and_save(payload: Dict, path: Optional[str]) -> CompanyIndex:
+    index = CompanyIndex.from_payload(payload)
+    if path:
+        try:
+            index.save(path)
+        except OSError:
+            pass  # la instantánea es una optimización; el índice en memoria basta
+    return index
+
+
+__all__ = ["CompanyIndex", "build_and_save", "normalize_title", "trigrams"]
@@ -0,0 +1,182 @@
+"""Tabla columnar de XBRL companyfacts construida en streaming.
+
+``companyfacts`` pesa 5–20 MB para emisores grandes; aquí nunca se materializa
+como dict. El JSON se recorre con ``ijson`` concepto a concepto (sólo un
+concepto vive como objeto a la vez) y cada hecho se añade a columnas
+compactas: ``array`` para números y códigos enteros para las cadenas
+repetidas (taxonomía, concepto, unidad, formulario, periodo fiscal). Las
+consultas proyectan sólo las filas pedidas.
+"""
+
+import json
+from array import array
+from typing import IO, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import ijson
+except ImportError:  # sin ijson se parsea el documento completo
+    ijson = None
+
+
+class _Codes:
+    """Diccionario cadena→código para columnas con pocos valores distintos."""
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        value = value or ""
+        idx = self._index.get(value)
+        if idx is None:
+            idx = self._index[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+    def lookup(self, value: str) -> Optional[int]:
+        return self._index.get(value)
+
+
+class FactsTable:
+    def __init__(self, cik: str) -> None:
+        self.cik = cik
+        self.entity_name = ""
+        self.built_at = 0.0
+        self.labels: Dict[Tuple[str, str], str] = {}
+        # Filas contiguas por (taxonomía, concepto, unidad)
+        self.ranges: Dict[Tuple[str, str, str], Tuple[int, int]] = {}
+        self.forms = _Codes()
+        self.periods = _Codes()
+        self.val = array("d")
+        self.fy = array("i")
+        self.fp = array("H")
+        self.form = array("H")
+        self.filed: List[str] = []
+        self.start: List[str] = []
+        self.end: List[str] = []
+        self.accn: List[str] = []
+        self.frame: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.val)
+
+    # --- Carga -----------------------------------------------------------
+    def add_concept(self, taxonomy: str, concept: str, body: Dict) -> None:
+        self.labels[(taxonomy, concept)] = body.get("label") or ""
+        for unit, facts in (body.get("units") or {}).items():
+            first = len(self.val)
+            for fact in facts:
+                value = fact.get("val")
+                try:
+                    self.val.append(float(value))
+                except (TypeError, ValueError):
+                    continue  # hechos no numéricos (p. ej. textos de dei)
+                self.fy.append(int(fact.get("fy") or 0))
+                self.fp.append(self.periods.code(fact.get("fp")))
+                self.form.append(self.forms.code(fact.get("form")))
+                self.filed.append(fact.get("filed") or "")
+                self.start.append(fact.get("start") or "")
+                self.end.append(fact.get("end") or "")
+                self.accn.append(fact.get("accn") or "")
+                self.frame.append(fact.get("frame") or "")
+            if len(self.val) > first:
+                self.ranges[(taxonomy, concept, unit)] = (first, len(self.val))
+
+    @classmethod
+    def from_file(cls, cik: str, fh: IO[bytes]) -> "FactsTable":
+        table = cls(cik)
+        if ijson is None:
+            payload = json.load(fh)
+            table.entity_name = payload.get("entityName") or ""
+            for taxonomy, concepts in (payload.get("facts") or {}).items():
+                for concept, body in concepts.items():
+                    table.add_concept(taxonomy, concept, body)
+            return table
+
+        # Máquina de estados sobre eventos básicos: la ruta se lleva como pila de claves
+        # (raíz, "facts", taxonomía, concepto, "units", unidad, hecho) y sólo los
+        # hechos del concepto en curso se acumulan antes de volcarlos a columnas.
+        path: List[Optional[str]] = []
+        key: Optional[str] = None
+        body: Dict = {}
+        fact: Dict = {}
+        for event, value in ijson.basic_parse(fh, use_float=True):
+            depth = len(path)
+            if event == "map_key":
+                key = value
+            elif depth == 7:  # dentro de un hecho
+                if event == "end_map":
+                    body["units"].setdefault(path[5], []).append(fact)
+                    path.pop()
+                else:
+                    fact[key] = value
+            elif event == "start_map" or event == "start_array":
+                path.append(key)
+                key = None
+                if depth == 6:
+                    fact = {}
+                elif depth == 3 and path[1] == "facts":
+                    body = {"units": {}}
+            elif event == "end_map" or event == "end_array":
+                if depth == 4 and path[1] == "facts":
+                    table.add_concept(path[2], path[3], body)
+                path.pop()
+            elif depth == 4 and key == "label" and path[1] == "facts":
+                body["label"] = value
+            elif depth == 1 and key == "entityName":
+                table.entity_name = value
+        return table
+
+    # --- Consultas ---------------------------------------------------------
+    def query(
+        self,
+        concepts: Iterable[str],
+        units: Optional[Sequence[str]] = None,
+        fy_range: Optional[Sequence[int]] = None,
+        forms: Optional[Sequence[str]] = None,
+        limit: int = 5000,
+    ) -> List[Dict]:
+        """Filas de ``concepts`` (``Revenues`` o ``us-gaap:Revenues``) filtradas y proyectadas."""
+        wanted = set()
+        for name in concepts:
+            taxonomy, _, concept = name.rpartition(":")
+            wanted.add((taxonomy or None, concept))
+        unit_set = set(units) if units else None
+        form_codes = None
+        if forms:
+            form_codes = {code for code in (self.forms.lookup(form) for form in forms) if code is not None}
+        fy_lo, fy_hi = (fy_range[0], fy_range[-1]) if fy_range else (None, None)
+
+        rows: List[Dict] = []
+        for (taxonomy, concept, unit), (first, last) in self.ranges.items():
+            if (taxonomy, concept) not in wanted and (None, concept) not in wanted:
+                continue
+            if unit_set is not None and unit not in unit_set:
+                continue
+            for idx in range(first, last):
+                if form_codes is not None and self.form[idx] not in form_codes:
+                    continue
+                fy = self.fy[idx]
+                if fy_lo is not None and not fy_lo <= fy <= fy_hi:
+                    continue
+                rows.append(
+                    {
+                        "concept": f"{taxonomy}:{concept}",
+                        "unit": unit,
+                        "val": self.val[idx],
+                        "fy": fy or None,
+                        "fp": self.periods.values[self.fp[idx]] or None,
+                        "form": self.forms.values[self.form[idx]],
+                        "filed": self.filed[idx],
+                        "start": self.start[idx] or None,
+                        "end": self.end[idx],
+                        "accn": self.accn[idx],
+                        "frame": self.frame[idx] or None,
+                    }
+                )
+                if len(rows) >= limit:
+                    return rows
+        return rows
+
+
+__all__ = ["FactsTable"]
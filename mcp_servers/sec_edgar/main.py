@@ -1,51 +1,182 @@
-from __future__ import annotations
-
 import asyncio
 import json
 import os
-import re
+import tempfile
 import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
 from typing import Dict, List, Optional
 
 import httpx
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 try:
-    import mcp
+    from mcp.server.fastmcp import FastMCP
 except ImportError as exc:  # noqa: BLE001
     raise RuntimeError("La librería MCP es obligatoria para ejecutar el servidor SEC") from exc
 
+try:
+    import duckdb
+except ImportError:  # catálogo local opcional
+    duckdb = None
+
+try:
+    from redis import asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # límite compartido opcional
+    aioredis = None
+    RedisError = OSError
+
+if __package__:
+    # Cargado como paquete (transporte inprocess de SECTools): imports relativos,
+    # sin añadir este directorio a sys.path del proceso que lo importa
+    from .company_index import CompanyIndex, build_and_save
+    from .facts_table import FactsTable
+    from .http_cache import RevalidatingCache
+    from .paragraph_diff import PARAGRAPH_VERSION, Paragraph, diff_paragraphs, paragraph_index
+    from .section_cache import SectionCache, content_digest, extractor_version
+    from .segmenter import SEGMENTER_VERSION, SectionSegmenter
+else:  # python main.py: los módulos hermanos se importan por nombre
+    from company_index import CompanyIndex, build_and_save
+    from facts_table import FactsTable
+    from http_cache import RevalidatingCache
+    from paragraph_diff import PARAGRAPH_VERSION, Paragraph, diff_paragraphs, paragraph_index
+    from section_cache import SectionCache, content_digest, extractor_version
+    from segmenter import SEGMENTER_VERSION, SectionSegmenter
+
+
+@asynccontextmanager
+async def _lifespan(_server):
+    # El mapa de compañías se carga al arrancar y se refresca en segundo plano
+    refresher = asyncio.create_task(_company_refresher())
+    try:
+        yield {}
+    finally:
+        refresher.cancel()
+
+
+mcp = FastMCP("sec_edgar", lifespan=_lifespan)
+
 SEC_BASE = "https://data.sec.gov"
 UA = os.getenv("SEC_USER_AGENT", "xFinance/1.0 (contact: you@example.com)")
 COMPANY_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+CATALOG_PATH = os.getenv("DUCKDB_PATH")
+CATALOG_MAX_AGE = float(os.getenv("FILING_CATALOG_MAX_AGE_HOURS", "36")) * 3600
+REDIS_URL = os.getenv("REDIS_URL")
+# Peticiones/s a sec.gov de este proceso (o del conjunto, si hay Redis)
+SEC_RATE_LIMIT = float(os.getenv("SEC_RATE_LIMIT", "8"))
+COMPANY_MAP_PATH = os.getenv(
+    "COMPANY_MAP_PATH",
+    str(Path(__file__).resolve().parents[2] / "storage" / "company_map.bin"),
+)
+SECTION_CACHE_PATH = os.getenv(
+    "SECTION_CACHE_PATH",
+    str(Path(__file__).resolve().parents[2] / "storage" / "sections.sqlite"),
+)
+# Tope del almacén de secciones (cuerpos, índices de párrafos y diffs); se poda por LRU
+SECTION_CACHE_MAX_BYTES = int(os.getenv("SECTION_CACHE_MAX_BYTES", str(1024**3)))
 
 
 class TokenBucket:
+    """Cubeta de tokens por reservas: sin sondeo y en orden de llegada.
+
+    Cada llamada reserva el siguiente hueco libre y duerme hasta él fuera de
+    cualquier lock; se permiten ráfagas de hasta ``capacity`` permisos.
+    """
+
     def __init__(self, capacity: float, refill_rate: float) -> None:
         self.capacity = capacity
         self.refill_rate = refill_rate
-        self.tokens = capacity
-        self.timestamp = time.monotonic()
-        self.lock = asyncio.Lock()
+        self.interval = 1.0 / refill_rate
+        self.tolerance = self.interval * (capacity - 1)
+        self.next_slot = 0.0
 
     async def acquire(self) -> None:
-        while True:
-            async with self.lock:
-                now = time.monotonic()
-                elapsed = now - self.timestamp
-                if elapsed > 0:
-                    self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
-                    self.timestamp = now
-                if self.tokens >= 1:
-                    self.tokens -= 1
-                    return
-            await asyncio.sleep(0.05)
-
-
-bucket = TokenBucket(capacity=8, refill_rate=8)
+        now = time.monotonic()
+        slot = max(self.next_slot, now)
+        self.next_slot = slot + self.interval
+        delay = slot - self.tolerance - now
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                if self.next_slot == slot + self.interval:
+                    self.next_slot = slot
+                raise
+
+
+# GCRA en modo reserva: copia literal del script del backend
+# (backend/app/core/utils/gcra_reserve.lua), así ambos reservan sobre el mismo
+# calendario, el mismo ritmo publicado y la misma compuerta tras un 429 para el
+# presupuesto de sec.gov. Sin el fichero se limita sólo en local.
+try:
+    _GCRA_RESERVE: Optional[str] = Path(__file__).with_name("gcra_reserve.lua").read_text(encoding="utf-8")
+except OSError:
+    _GCRA_RESERVE = None
+
+
+class SharedBucket:
+    """Límite por host compartido entre procesos vía Redis.
+
+    Si no hay ``REDIS_URL`` o Redis no responde se usa el ``TokenBucket``
+    local y se reintenta Redis pasados ``retry_after`` segundos.
+    """
+
+    def __init__(self, name: str, rate: float, redis_url: Optional[str], retry_after: float = 30.0) -> None:
+        key = f"ratelimit:{name}"
+        self.keys = [key, f"{key}:interval", f"{key}:gate"]
+        self.local = TokenBucket(capacity=max(rate, 1.0), refill_rate=rate)
+        # interval, ráfaga, periodo; sin publicar ritmo ni cerrar la compuerta; reserva
+        self.args = [int(1_000_000 / rate), int(rate), 1_000_000, 0, 0, 1, 0]
+        self.retry_after = retry_after
+        self.redis_down_until = 0.0
+        self.script = None
+        if redis_url and aioredis is not None and _GCRA_RESERVE is not None:
+            client = aioredis.Redis.from_url(redis_url, socket_connect_timeout=0.5, socket_timeout=1.0)
+            self.script = client.register_script(_GCRA_RESERVE)
+
+    async def acquire(self) -> None:
+        if self.script is not None and time.monotonic() >= self.redis_down_until:
+            try:
+                wait_us, _interval_us = await self.script(keys=self.keys, args=self.args)
+            except (RedisError, OSError):
+                self.redis_down_until = time.monotonic() + self.retry_after
+            else:
+                if wait_us > 0:
+                    await asyncio.sleep(wait_us / 1_000_000)
+                return
+        await self.local.acquire()
+
+
+bucket = SharedBucket("sec.gov", rate=SEC_RATE_LIMIT, redis_url=REDIS_URL)
 _client: Optional[httpx.AsyncClient] = None
-_company_cache: Optional[Dict[str, Dict[str, str]]] = None
+
+
+@retry(
+    wait=wait_exponential(multiplier=1, min=1, max=8),
+    stop=stop_after_attempt(4),
+    retry=retry_if_exception_type(httpx.HTTPError),
+    reraise=True,
+)
+async def _conditional_get(url: str, headers: Dict[str, str]) -> httpx.Response:
+    # Misma política que _get_json; los 304 y los 4xx los interpreta la caché
+    await bucket.acquire()
+    client = await _client_factory()
+    resp = await client.get(url, headers={"User-Agent": UA, "Accept-Encoding": "gzip", **headers})
+    if resp.status_code == 429 or resp.status_code >= 500:
+        resp.raise_for_status()
+    return resp
+
+
+# http_cache.py es copia literal de backend/app/core/utils/http_cache.py: el servidor
+# se despliega sin el backend y test_shared_copies.py impide que diverjan
+_json_cache = RevalidatingCache(_conditional_get, ttl=300, stale_ttl=3600)
+COMPANY_MAP_TTL = 24 * 3600
+# Instantánea local mapeada en memoria: disponible sin red desde el arranque
+_company_index: Optional[CompanyIndex] = CompanyIndex.load(COMPANY_MAP_PATH)
+_company_payload: Optional[Dict] = None
+_company_refresh: Optional[asyncio.Task] = None
 
 
 async def _client_factory() -> httpx.AsyncClient:
@@ -63,78 +194,215 @@ async def _get_json(client: httpx.AsyncClient, url: str) -> Dict:
     return resp.json()
 
 
-async def _get_text(client: httpx.AsyncClient, url: str) -> str:
+async def _segment_document(client: httpx.AsyncClient, url: str, segmenter: SectionSegmenter) -> None:
+    """Descarga en streaming y alimenta el segmentador; corta la lectura cuando ya tiene todo."""
     await bucket.acquire()
-    resp = await client.get(url, headers={"User-Agent": UA, "Accept-Encoding": "gzip"})
-    resp.raise_for_status()
-    return resp.text
+    async with client.stream("GET", url, headers={"User-Agent": UA, "Accept-Encoding": "gzip"}) as resp:
+        resp.raise_for_status()
+        async for chunk in resp.aiter_text(STREAM_CHUNK):
+            if await asyncio.to_thread(segmenter.feed, chunk):
+                break
+
+
+async def _refresh_company_map() -> CompanyIndex:
+    global _company_index, _company_payload
+    payload = (await _json_cache.revalidate(COMPANY_TICKERS_URL)).payload
+    if _company_index is None or payload is not _company_payload:
+        _company_index = await asyncio.to_thread(build_and_save, payload, COMPANY_MAP_PATH)
+        _company_payload = payload
+    else:
+        _company_index.fetched_at = time.time()  # 304: el índice sigue vigente
+    return _company_index
+
+
+def _schedule_company_refresh() -> asyncio.Task:
+    global _company_refresh
+    if _company_refresh is None or _company_refresh.done():
+        _company_refresh = asyncio.create_task(_refresh_company_map())
+    return _company_refresh
+
+
+async def _company_refresher() -> None:
+    while True:
+        if _company_index is None or time.time() - _company_index.fetched_at >= COMPANY_MAP_TTL:
+            try:
+                await _schedule_company_refresh()
+            except Exception:  # noqa: BLE001 - se reintenta en la siguiente vuelta
+                await asyncio.sleep(300)
+                continue
+        await asyncio.sleep(max(60.0, _company_index.fetched_at + COMPANY_MAP_TTL - time.time()))
 
 
-async def _load_company_map() -> Dict[str, Dict[str, str]]:
-    global _company_cache
-    if _company_cache is not None:
-        return _company_cache
-    client = await _client_factory()
-    data = await _get_json(client, COMPANY_TICKERS_URL)
-    cache: Dict[str, Dict[str, str]] = {}
-    for entry in data.values():
-        ticker = (entry.get("ticker") or "").upper()
-        if not ticker:
-            continue
-        cache[ticker] = {
-            "cik": str(entry.get("cik_str")),
-            "title": entry.get("title", ""),
-        }
-    _company_cache = cache
-    return cache
+async def _company_map() -> CompanyIndex:
+    if _company_index is None:
+        return await _schedule_company_refresh()
+    if time.time() - _company_index.fetched_at >= COMPANY_MAP_TTL:
+        _schedule_company_refresh()
+    return _company_index
 
 
 @mcp.tool()
 async def get_cik(ticker: str) -> Dict[str, str]:
-    mapping = await _load_company_map()
-    info = mapping.get(ticker.upper())
+    info = (await _company_map()).ticker(ticker)
     if not info:
         raise ValueError(f"Ticker {ticker} no encontrado en el índice SEC")
-    return {"ticker": ticker.upper(), "cik": str(info["cik"]).zfill(10)}
+    return {"ticker": info["ticker"], "cik": info["cik"]}
 
 
 @mcp.tool()
 async def ticker_from_cik(cik: str) -> Dict[str, str]:
-    mapping = await _load_company_map()
-    target = str(int(cik)).zfill(10)
-    for ticker, info in mapping.items():
-        if str(info["cik"]).zfill(10) == target:
-            return {"ticker": ticker, "cik": target}
-    raise ValueError(f"CIK {cik} no encontrado")
+    info = (await _company_map()).cik(cik)
+    if not info:
+        raise ValueError(f"CIK {cik} no encontrado")
+    return {"ticker": info["ticker"], "cik": info["cik"]}
 
 
 @mcp.tool()
-async def list_filings(cik: str, forms: List[str], years: List[int]) -> List[Dict]:
-    cik10 = str(int(cik)).zfill(10)
-    client = await _client_factory()
-    submissions = await _get_json(client, f"{SEC_BASE}/submissions/CIK{cik10}.json")
+async def search_company(query: str, limit: int = 5) -> List[Dict]:
+    """Busca compañías por nombre aproximado (índice de trigramas de títulos)."""
+    return (await _company_map()).search(query, limit=limit)
+
+
+BATCH_CONCURRENCY = 8
+
+
+def _batch_error(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"
+
+
+async def _run_batch(keys: List[str], fn) -> Dict[str, Dict]:
+    """Ejecuta ``fn(key)`` para cada clave en paralelo; los fallos se devuelven por clave."""
+    in_flight = asyncio.Semaphore(BATCH_CONCURRENCY)
+    results: Dict[str, object] = {}
+    errors: Dict[str, str] = {}
+
+    async def run(key: str) -> None:
+        async with in_flight:
+            try:
+                results[key] = await fn(key)
+            except Exception as exc:  # noqa: BLE001
+                errors[key] = _batch_error(exc)
+
+    unique = list(dict.fromkeys(keys))
+    await asyncio.gather(*(run(key) for key in unique))
+    # Se devuelven en el orden de entrada, no en el de llegada
+    return {
+        "results": {key: results[key] for key in unique if key in results},
+        "errors": {key: errors[key] for key in unique if key in errors},
+    }
+
+
+@mcp.tool()
+async def get_ciks(tickers: Optional[List[str]] = None, ciks: Optional[List[str]] = None) -> Dict:
+    """Resuelve en una llamada varios tickers→CIK y CIK→ticker.
+
+    Devuelve ``{"tickers": {ticker: {ticker, cik}}, "ciks": {cik: {ticker, cik}}, "missing": [...]}``
+    con las claves tal como llegaron.
+    """
+    index = await _company_map()
+    by_ticker: Dict[str, Dict[str, str]] = {}
+    by_cik: Dict[str, Dict[str, str]] = {}
+    missing: List[str] = []
+    for ticker in tickers or []:
+        info = index.ticker(ticker)
+        if info:
+            by_ticker[ticker] = {"ticker": info["ticker"], "cik": info["cik"]}
+        else:
+            missing.append(ticker)
+    for cik in ciks or []:
+        try:
+            info = index.cik(cik)
+        except ValueError:
+            info = None
+        if info:
+            by_cik[cik] = {"ticker": info["ticker"], "cik": info["cik"]}
+        else:
+            missing.append(cik)
+    return {"tickers": by_ticker, "ciks": by_cik, "missing": missing}
+
+
+LIST_FILINGS_LIMIT = 20
+PAGE_CONCURRENCY = 4
+
+
+def _match_filings(block: Dict, forms_set: set, years_set: set) -> List[Dict]:
     result: List[Dict] = []
-    filings = submissions.get("filings", {}).get("recent", {})
-    forms_recent = filings.get("form", [])
-    accession = filings.get("accessionNumber", [])
-    filing_date = filings.get("filingDate", [])
-    if not forms_recent:
-        return result
-    forms_set = {f.upper() for f in forms}
-    years_set = {int(y) for y in years}
-    for idx, form in enumerate(forms_recent):
+    accession = block.get("accessionNumber", [])
+    filing_date = block.get("filingDate", [])
+    for idx, form in enumerate(block.get("form", [])):
         if form.upper() not in forms_set:
             continue
-        acc = accession[idx]
         date = filing_date[idx]
         if years_set and int(date.split("-")[0]) not in years_set:
             continue
-        result.append({"form": form, "accession": acc, "filing_date": date})
-        if len(result) >= 20:
-            break
+        result.append({"form": form, "accession": accession[idx], "filing_date": date})
     return result
 
 
+def _history_pages(files: List[Dict], years_set: set) -> List[Dict]:
+    pages = []
+    for page in files:
+        if years_set:
+            first = int((page.get("filingFrom") or "0000")[:4])
+            last = int((page.get("filingTo") or "9999")[:4])
+            if not any(first <= year <= last for year in years_set):
+                continue
+        pages.append(page)
+    return sorted(pages, key=lambda page: page.get("filingTo", ""), reverse=True)
+
+
+def _catalog_filings(cik: str, forms_set: set, years_set: set) -> Optional[List[Dict]]:
+    """Consulta el catálogo DuckDB cargado desde submissions.zip; None si no puede responder."""
+    if duckdb is None or not CATALOG_PATH or not os.path.exists(CATALOG_PATH) or not forms_set:
+        return None
+    try:
+        with duckdb.connect(CATALOG_PATH, read_only=True) as con:
+            meta = con.execute("SELECT epoch(now() - loaded_at) FROM filing_catalog_meta").fetchone()
+            if not meta or meta[0] > CATALOG_MAX_AGE:
+                return None
+            if not con.execute("SELECT 1 FROM filing_catalog WHERE cik = ? LIMIT 1", [int(cik)]).fetchone():
+                return None
+            sql = (
+                "SELECT form, accession, filing_date FROM filing_catalog WHERE cik = ? "
+                f"AND upper(form) IN ({', '.join('?' for _ in forms_set)})"
+            )
+            params: List = [int(cik), *forms_set]
+            if years_set:
+                sql += f" AND year(filing_date) IN ({', '.join('?' for _ in years_set)})"
+                params.extend(years_set)
+            rows = con.execute(sql + " ORDER BY filing_date DESC LIMIT ?", [*params, LIST_FILINGS_LIMIT]).fetchall()
+    except duckdb.Error:
+        return None
+    return [{"form": form, "accession": acc, "filing_date": filed.isoformat()} for form, acc, filed in rows]
+
+
+@mcp.tool()
+async def list_filings(cik: str, forms: List[str], years: List[int]) -> List[Dict]:
+    cik10 = str(int(cik)).zfill(10)
+    forms_set = {f.upper() for f in forms}
+    years_set = {int(y) for y in years}
+    cataloged = await asyncio.to_thread(_catalog_filings, cik10, forms_set, years_set)
+    if cataloged is not None:
+        return cataloged
+    submissions = await _json_cache.get_json(f"{SEC_BASE}/submissions/CIK{cik10}.json")
+    filings = submissions.get("filings", {})
+    result = _match_filings(filings.get("recent", {}), forms_set, years_set)
+    # "recent" sólo trae ~1000 filings; las páginas históricas (más nuevas primero)
+    # se piden en paralelo y sólo mientras falten resultados.
+    pages = _history_pages(filings.get("files", []), years_set)
+    for offset in range(0, len(pages), PAGE_CONCURRENCY):
+        if len(result) >= LIST_FILINGS_LIMIT:
+            break
+        wave = pages[offset : offset + PAGE_CONCURRENCY]
+        blocks = await asyncio.gather(
+            *(_json_cache.get_json(f"{SEC_BASE}/submissions/{page['name']}") for page in wave)
+        )
+        for block in blocks:
+            result.extend(_match_filings(block, forms_set, years_set))
+    result.sort(key=lambda item: item["filing_date"], reverse=True)
+    return result[:LIST_FILINGS_LIMIT]
+
+
 @mcp.tool()
 async def get_filing_docs(cik: str, accession: str, prefer_html: bool = True) -> List[str]:
     client = await _client_factory()
@@ -154,6 +422,30 @@ async def get_filing_docs(cik: str, accession: str, prefer_html: bool = True) ->
     return docs[:5]
 
 
+@mcp.tool()
+async def list_filings_many(ciks: List[str], forms: List[str], years: List[int]) -> Dict:
+    """``list_filings`` para varios CIK en paralelo.
+
+    Devuelve ``{"filings": {cik: [...]}, "errors": {cik: mensaje}}`` con las claves tal como llegaron.
+    """
+    batch = await _run_batch(ciks, lambda cik: list_filings(cik, forms, years))
+    return {"filings": batch["results"], "errors": batch["errors"]}
+
+
+@mcp.tool()
+async def get_filing_docs_many(filings: List[Dict[str, str]], prefer_html: bool = True) -> Dict:
+    """``get_filing_docs`` para varios ``{"cik", "accession"}`` en paralelo.
+
+    Devuelve ``{"docs": {accession: [urls]}, "errors": {accession: mensaje}}``.
+    """
+    cik_by_accession = {item["accession"]: item["cik"] for item in filings}
+    batch = await _run_batch(
+        list(cik_by_accession),
+        lambda accession: get_filing_docs(cik_by_accession[accession], accession, prefer_html),
+    )
+    return {"docs": batch["results"], "errors": batch["errors"]}
+
+
 ITEM_PATTERNS = {
     "risk_factors": [r"item\s*1a\.?\s*risk\s*factors", r"item\s*3d\.?\s*risk\s*factors"],
     "mdna": [r"item\s*7\.?\s*management's\s*discussion", r"operating\s*and\s*financial\s*review"],
@@ -161,40 +453,306 @@ ITEM_PATTERNS = {
 }
 
 
+EXTRACT_CONCURRENCY = 3
+STREAM_CHUNK = 64 * 1024
+SECTION_MAX_CHARS = 20000
+# Tope propio para las secciones que se comparan con diff_sections: el diff
+# necesita la sección entera, no sus primeros SECTION_MAX_CHARS caracteres
+DIFF_SECTION_LIMITS = {"risk_factors": 400_000}
+# La versión cambia con ITEM_PATTERNS: editar un patrón invalida la caché
+_section_cache = SectionCache(
+    SECTION_CACHE_PATH,
+    extractor_version(ITEM_PATTERNS, SEGMENTER_VERSION, SECTION_MAX_CHARS, DIFF_SECTION_LIMITS),
+    max_bytes=SECTION_CACHE_MAX_BYTES,
+)
+
+
+SECTION_URI = "sec-section://{digest}"
+
+
+def _section_refs(text_by_section: Dict[str, str]) -> Dict[str, Dict]:
+    refs = {}
+    for key, text in text_by_section.items():
+        if text:
+            digest = content_digest(text)
+            refs[key] = {"uri": SECTION_URI.format(digest=digest), "digest": digest, "length": len(text)}
+    return refs
+
+
 @mcp.tool()
-async def extract_sections(urls: List[str], form: str, accession: str, cik: str) -> Dict:
-    text_by_section: Dict[str, str] = {k: "" for k in ITEM_PATTERNS}
+async def extract_sections(
+    urls: List[str],
+    form: str,
+    accession: str,
+    cik: str,
+    sections: Optional[List[str]] = None,
+    inline: bool = True,
+) -> Dict:
+    """Extrae Item 1A / 7 / 8 de los documentos del filing.
+
+    Con ``inline=False`` el texto no viaja en la respuesta: ``section_refs`` trae
+    por sección el URI ``sec-section://<sha256>``, el hash y la longitud, y el
+    cliente lee rangos con ``read_sections`` o el recurso MCP.
+    """
+    wanted = [key for key in ITEM_PATTERNS if sections is None or key in sections]
+    result = {
+        "accession": accession,
+        "form": form,
+        "filing_date": "",
+        "company": {"ticker": "", "cik": str(int(cik)).zfill(10)},
+    }
+    extracted = await asyncio.to_thread(_section_cache.get, accession, wanted)
+    if extracted is None:
+        extracted = await _extract(urls, form, accession, wanted)
+    return await _section_payload(result, extracted, inline)
+
+
+async def _extract(urls: List[str], form: str, accession: str, wanted: List[str]) -> Dict:
+    """Segmenta los documentos y guarda el resultado en la caché de secciones.
+
+    ``sections`` lleva cada sección recortada a ``SECTION_MAX_CHARS``; las de
+    ``DIFF_SECTION_LIMITS`` más largas se guardan enteras en ``section_blobs``
+    y ``full_refs`` apunta a ellas.
+    """
+    text_by_section: Dict[str, str] = {k: "" for k in wanted}
+    full_by_section: Dict[str, str] = {}
     sources: List[Dict] = []
+    failed = False
     client = await _client_factory()
-    for url in urls:
-        if not url.lower().endswith((".htm", ".html")):
-            continue
-        try:
-            html = await _get_text(client, url)
-        except httpx.HTTPStatusError:
-            continue
-        sources.append({"kind": "sec", "title": form, "url": url})
-        soup = BeautifulSoup(html, "lxml")
-        body = soup.get_text("\n", strip=True)
-        lower = body.lower()
-        for key, patterns in ITEM_PATTERNS.items():
-            if text_by_section[key]:
+    html_urls = [url for url in urls if url.lower().endswith((".htm", ".html"))]
+    in_flight = asyncio.Semaphore(EXTRACT_CONCURRENCY)
+
+    async def fetch_and_parse(url: str) -> Optional[Dict[str, str]]:
+        nonlocal failed
+        segmenter = SectionSegmenter(ITEM_PATTERNS, wanted, SECTION_MAX_CHARS, DIFF_SECTION_LIMITS)
+        async with in_flight:
+            try:
+                await _segment_document(client, url, segmenter)
+            except httpx.HTTPStatusError as exc:
+                failed = failed or exc.response.status_code != 404
+                return None
+        text, spans = await asyncio.to_thread(segmenter.close)
+        return {key: text[offset : offset + length] for key, (offset, length) in spans.items()}
+
+    tasks = [asyncio.create_task(fetch_and_parse(url)) for url in html_urls]
+    try:
+        # Se consumen en el orden de ``urls`` para que gane siempre el primer documento
+        for url, task in zip(html_urls, tasks):
+            found = await task
+            if found is None:
                 continue
-            for pattern in patterns:
-                match = re.search(pattern, lower)
-                if match:
-                    start = match.start()
-                    next_match = re.search(r"\nitem\s+\d+[a-z]?\.", lower[start + 10 :])
-                    end = start + 10 + (next_match.start() if next_match else len(lower))
-                    text_by_section[key] = body[start:end][:20000]
-                    break
+            sources.append({"kind": "sec", "title": form, "url": url})
+            for key, text in found.items():
+                if not text_by_section[key]:
+                    text_by_section[key] = text[:SECTION_MAX_CHARS]
+                    if len(text) > SECTION_MAX_CHARS:
+                        full_by_section[key] = text
+            if all(text_by_section.values()):
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if full_by_section:
+        await asyncio.to_thread(_section_cache.put_blobs, full_by_section.values())
+    extracted = {"sections": text_by_section, "sources": sources, "full_refs": _section_refs(full_by_section)}
+    # Ni un fallo transitorio ni una lista de urls equivocada (nada leído o ninguna
+    # sección encontrada) deben quedar fijados para siempre bajo este accession
+    if not failed and sources and any(text_by_section.values()):
+        await asyncio.to_thread(_section_cache.put, accession, wanted, extracted)
+    return extracted
+
+
+async def _section_payload(result: Dict, extracted: Dict, inline: bool) -> Dict:
+    if inline:
+        return {**result, "sections": extracted["sections"], "sources": extracted["sources"]}
+    await asyncio.to_thread(_section_cache.put_blobs, extracted["sections"].values())
     return {
-        "accession": accession,
+        **result,
+        "sections": {},
+        "section_refs": _section_refs(extracted["sections"]),
+        "sources": extracted["sources"],
+    }
+
+
+@mcp.tool()
+async def read_sections(ranges: List[Dict]) -> Dict:
+    """Lee rangos de cuerpos de sección por hash: ``[{digest, offset?, length?}]``.
+
+    Devuelve ``{"ranges": [{digest, offset, text, total}]}`` en el mismo orden;
+    ``text`` es None si el hash no está en el almacén.
+    """
+
+    def read_all() -> List[Dict]:
+        out: List[Dict] = []
+        for item in ranges:
+            digest = item["digest"]
+            offset = max(int(item.get("offset") or 0), 0)
+            length = item.get("length")
+            length = SECTION_MAX_CHARS if length is None else min(max(int(length), 0), SECTION_MAX_CHARS)
+            found = _section_cache.read_blob(digest, offset, length)
+            text, total = found if found is not None else (None, 0)
+            out.append({"digest": digest, "offset": offset, "text": text, "total": total})
+        return out
+
+    return {"ranges": await asyncio.to_thread(read_all)}
+
+
+@mcp.resource(SECTION_URI, mime_type="text/plain")
+async def section_body(digest: str) -> str:
+    found = await asyncio.to_thread(_section_cache.read_blob, digest)
+    if found is None:
+        raise ValueError(f"Sección {digest} no encontrada")
+    return found[0]
+
+
+DIFF_MAX_PARAGRAPHS = 50
+DIFF_LOOKBACK_YEARS = 3
+
+
+def _accession_year(accession: str) -> Optional[int]:
+    # 0000320193-23-000106: los dígitos 11-12 son el año en que se asignó el número
+    digits = accession.replace("-", "")
+    if len(digits) != 18 or not digits.isdigit():
+        return None
+    yy = int(digits[10:12])
+    return 2000 + yy if yy < 80 else 1900 + yy
+
+
+async def _previous_filing(cik: str, accession: str, form: str) -> Optional[str]:
+    year = _accession_year(accession)
+    if year is None:
+        return None
+    filings = await list_filings(cik, [form], [year - offset for offset in range(DIFF_LOOKBACK_YEARS)])
+    wanted = accession.replace("-", "")
+    accessions = [item["accession"] for item in filings]
+    for idx, candidate in enumerate(accessions):
+        if candidate.replace("-", "") == wanted:
+            return accessions[idx + 1] if idx + 1 < len(accessions) else None
+    return None
+
+
+async def _diff_ref(cik: str, accession: str, form: str, section: str) -> Optional[Dict]:
+    """Ref del cuerpo que se compara: la sección entera si se guardó aparte.
+
+    ``partial`` indica que incluso ese cuerpo llegó al tope de caracteres y el
+    diff no cubre el final de la sección.
+    """
+    wanted = list(ITEM_PATTERNS)
+    extracted = await asyncio.to_thread(_section_cache.get, accession, wanted)
+    ref = extracted.get("full_refs", {}).get(section) if extracted is not None else None
+    # La entrada puede sobrevivir a la poda de su cuerpo entero: entonces se re-extrae
+    if extracted is None or (
+        ref is not None and await asyncio.to_thread(_section_cache.read_blob, ref["digest"], 0, 0) is None
+    ):
+        docs = await get_filing_docs(cik, accession)
+        extracted = await _extract(docs, form, accession, wanted)
+        ref = extracted["full_refs"].get(section)
+    if ref is None:
+        text = extracted["sections"].get(section)
+        if not text:
+            return None
+        await asyncio.to_thread(_section_cache.put_blobs, [text])
+        ref = _section_refs({section: text})[section]
+    return {**ref, "partial": ref["length"] >= DIFF_SECTION_LIMITS.get(section, SECTION_MAX_CHARS)}
+
+
+def _paragraphs(digest: str) -> List[Paragraph]:
+    paragraphs = _section_cache.get_paragraphs(digest, PARAGRAPH_VERSION)
+    if paragraphs is None:
+        found = _section_cache.read_blob(digest)
+        if found is None:
+            raise ValueError(f"Sección {digest} no encontrada")
+        paragraphs = paragraph_index(found[0])
+        _section_cache.put_paragraphs(digest, PARAGRAPH_VERSION, paragraphs)
+    return paragraphs
+
+
+def _build_diff(base_digest: str, digest: str) -> Dict:
+    base, new = _paragraphs(base_digest), _paragraphs(digest)
+    changes = diff_paragraphs(base, new)
+
+    def text(source: str, paragraph: Paragraph) -> str:
+        # Sólo se leen del almacén los rangos de los párrafos que cambiaron
+        found = _section_cache.read_blob(source, paragraph[0], paragraph[1])
+        return found[0] if found else ""
+
+    return {
+        "stats": {
+            "paragraphs": len(new),
+            "base_paragraphs": len(base),
+            "unchanged": changes["unchanged"],
+            "moved": len(changes["moved"]),
+            "added": len(changes["added"]),
+            "removed": len(changes["removed"]),
+            "modified": len(changes["modified"]),
+        },
+        "added": [{"index": idx, "text": text(digest, new[idx])} for idx in changes["added"]],
+        "removed": [{"index": idx, "text": text(base_digest, base[idx])} for idx in changes["removed"]],
+        "modified": [
+            {
+                "index": new_idx,
+                "base_index": base_idx,
+                "similarity": score,
+                "text": text(digest, new[new_idx]),
+                "base_text": text(base_digest, base[base_idx]),
+            }
+            for base_idx, new_idx, score in changes["modified"]
+        ],
+    }
+
+
+@mcp.tool()
+async def diff_sections(
+    cik: str,
+    accession: str,
+    base_accession: Optional[str] = None,
+    form: str = "10-K",
+    section: str = "risk_factors",
+) -> Dict:
+    """Párrafos añadidos, eliminados y modificados de ``section`` respecto a otro filing.
+
+    Sin ``base_accession`` se compara con el filing anterior del mismo ``form``.
+    La comparación usa sólo los hashes por párrafo; el texto se lee únicamente
+    para los párrafos que cambiaron. El diff queda guardado por hash de contenido.
+    ``truncated`` indica que las listas se cortaron a ``DIFF_MAX_PARAGRAPHS``;
+    ``partial``, que alguna de las dos secciones superaba su tope de caracteres.
+    """
+    if section not in ITEM_PATTERNS:
+        raise ValueError(f"Sección desconocida: {section}")
+    if base_accession is None:
+        base_accession = await _previous_filing(cik, accession, form)
+        if base_accession is None:
+            raise ValueError(f"No hay {form} anterior a {accession} para el CIK {cik}")
+    ref, base_ref = await asyncio.gather(
+        _diff_ref(cik, accession, form, section),
+        _diff_ref(cik, base_accession, form, section),
+    )
+    digest = ref["digest"] if ref else None
+    base_digest = base_ref["digest"] if base_ref else None
+    result = {
+        "cik": str(int(cik)).zfill(10),
+        "section": section,
         "form": form,
-        "filing_date": "",
-        "company": {"ticker": "", "cik": str(int(cik)).zfill(10)},
-        "sections": text_by_section,
-        "sources": sources,
+        "accession": accession,
+        "base_accession": base_accession,
+        "digest": digest,
+        "base_digest": base_digest,
+    }
+    if digest is None or base_digest is None:
+        missing = accession if digest is None else base_accession
+        raise ValueError(f"{section} no encontrada en {missing}")
+    diff = await asyncio.to_thread(_section_cache.get_diff, base_digest, digest, PARAGRAPH_VERSION)
+    if diff is None:
+        diff = await asyncio.to_thread(_build_diff, base_digest, digest)
+        await asyncio.to_thread(_section_cache.put_diff, base_digest, digest, PARAGRAPH_VERSION, diff)
+    truncated = any(len(diff[kind]) > DIFF_MAX_PARAGRAPHS for kind in ("added", "removed", "modified"))
+    return {
+        **result,
+        **diff,
+        **{kind: diff[kind][:DIFF_MAX_PARAGRAPHS] for kind in ("added", "removed", "modified")},
+        "truncated": truncated,
+        "partial": ref["partial"] or base_ref["partial"],
     }
 
 
@@ -205,5 +763,89 @@ async def get_companyfacts(cik: str) -> Dict:
     return await _get_json(client, f"{SEC_BASE}/api/xbrl/companyfacts/CIK{cik10}.json")
 
 
+FACTS_CACHE_SIZE = 16
+FACTS_TTL = 6 * 3600
+FACTS_ROW_LIMIT = 5000
+_facts_tables: "OrderedDict[str, FactsTable]" = OrderedDict()
+_facts_loading: Dict[str, asyncio.Task] = {}
+_facts_stats = {"hits": 0, "builds": 0}
+
+
+async def _build_facts_table(cik10: str) -> FactsTable:
+    client = await _client_factory()
+    # El JSON se vuelca a un temporal (en disco a partir de 1 MB) y se parsea en streaming en un hilo
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spool:
+        await bucket.acquire()
+        url = f"{SEC_BASE}/api/xbrl/companyfacts/CIK{cik10}.json"
+        async with client.stream("GET", url, headers={"User-Agent": UA, "Accept-Encoding": "gzip"}) as resp:
+            resp.raise_for_status()
+            async for chunk in resp.aiter_bytes():
+                spool.write(chunk)
+        spool.seek(0)
+        table = await asyncio.to_thread(FactsTable.from_file, cik10, spool)
+    table.built_at = time.monotonic()
+    return table
+
+
+async def _facts_table(cik10: str) -> FactsTable:
+    table = _facts_tables.get(cik10)
+    if table is not None and time.monotonic() - table.built_at < FACTS_TTL:
+        _facts_tables.move_to_end(cik10)
+        _facts_stats["hits"] += 1
+        return table
+    task = _facts_loading.get(cik10)
+    if task is None:
+        task = asyncio.create_task(_build_facts_table(cik10))
+        _facts_loading[cik10] = task
+        task.add_done_callback(lambda _t, key=cik10: _facts_loading.pop(key, None))
+    table = await asyncio.shield(task)
+    if _facts_tables.get(cik10) is not table:
+        _facts_stats["builds"] += 1
+        _facts_tables[cik10] = table
+        _facts_tables.move_to_end(cik10)
+        while len(_facts_tables) > FACTS_CACHE_SIZE:
+            _facts_tables.popitem(last=False)
+    return table
+
+
+@mcp.tool()
+async def get_facts(
+    cik: str,
+    concepts: List[str],
+    units: Optional[List[str]] = None,
+    fy_range: Optional[List[int]] = None,
+    forms: Optional[List[str]] = None,
+) -> Dict:
+    """Hechos XBRL proyectados: sólo los conceptos, unidades, años fiscales y formularios pedidos.
+
+    ``concepts`` admite ``Revenues`` o ``us-gaap:Revenues``; ``fy_range`` es ``[desde, hasta]``.
+    """
+    cik10 = str(int(cik)).zfill(10)
+    table = await _facts_table(cik10)
+    rows = table.query(concepts, units, fy_range, forms, limit=FACTS_ROW_LIMIT)
+    returned = {row["concept"] for row in rows}
+    labels = {f"{tax}:{name}": label for (tax, name), label in table.labels.items() if f"{tax}:{name}" in returned}
+    return {
+        "cik": cik10,
+        "entityName": table.entity_name,
+        "labels": labels,
+        "rows": rows,
+        "truncated": len(rows) >= FACTS_ROW_LIMIT,
+    }
+
+
+@mcp.tool()
+async def cache_stats() -> Dict:
+    company = {"entries": 0, "age_s": None}
+    if _company_index is not None:
+        company = {"entries": len(_company_index), "age_s": round(time.time() - _company_index.fetched_at)}
+    return {
+        "json": _json_cache.snapshot(),
+        "company_map": company,
+        "sections": _section_cache.snapshot(),
+        "facts": {"tables": len(_facts_tables), **_facts_stats},
+    }
+
+
 if __name__ == "__main__":
     mcp.run()
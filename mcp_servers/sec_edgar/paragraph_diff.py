@@ -0,0 +1,194 @@
+"""Diff de secciones por párrafos usando sólo hashes.
+
+Cada sección se parte en párrafos (las líneas del texto segmentado, unidas
+mientras no acaben en puntuación final; los encabezados cortos sin puntuación
+van aparte) y de cada párrafo se guarda:
+
+* ``digest``: hash polinómico rodante (módulo ``2**61 - 1``) del texto
+  normalizado (minúsculas, espacios colapsados); dos párrafos iguales dan
+  el mismo hash sin comparar texto.
+* ``sketch``: los ``SKETCH_SIZE`` menores hashes de los *shingles* de
+  ``SHINGLE_WORDS`` palabras, calculados rodando la ventana palabra a
+  palabra (bottom-k MinHash). Estima la similitud de Jaccard entre dos
+  párrafos para emparejar los modificados.
+
+El diff alinea las secuencias de ``digest`` con ``difflib`` y, dentro de cada
+bloque cambiado, empareja eliminados y añadidos por similitud de ``sketch``;
+el texto sólo se lee después, y sólo para los párrafos que cambiaron.
+"""
+
+import difflib
+import re
+from typing import Dict, List, Sequence, Tuple
+
+PARAGRAPH_VERSION = "2"  # súbelo si cambia la partición, la normalización o los hashes
+SHINGLE_WORDS = 5
+SKETCH_SIZE = 16
+MODIFIED_THRESHOLD = 0.5
+MAX_PARAGRAPH_CHARS = 4000
+HEADING_MAX_CHARS = 150
+
+_MOD = (1 << 61) - 1
+_BASE = 1_000_003
+_WORD_BASE = 0x100000001B3
+_SPACES = re.compile(r"\s+")
+_TERMINAL = tuple(".:;!?)\"”")
+_CONTINUED = tuple(",-–—(/&")
+# Una línea que acaba en una de estas palabras sigue en la siguiente (<a>, <b>, ...)
+_JOINING_WORDS = frozenset(
+    "a an and as at by for from in into is are of on or our such than that the their to with".split()
+)
+
+# (offset, longitud, digest, sketch)
+Paragraph = Tuple[int, int, int, List[int]]
+
+
+def _normalize(text: str) -> str:
+    return _SPACES.sub(" ", text).strip().lower()
+
+
+def _rolling_hash(text: str) -> int:
+    value = 0
+    for char in text:
+        value = (value * _BASE + ord(char)) % _MOD
+    return value
+
+
+def _sketch(words: Sequence[str], digest: int) -> List[int]:
+    if len(words) < SHINGLE_WORDS:
+        return [digest]
+    word_hashes = [_rolling_hash(word) for word in words]
+    top = pow(_WORD_BASE, SHINGLE_WORDS - 1, _MOD)
+    window = 0
+    for value in word_hashes[:SHINGLE_WORDS]:
+        window = (window * _WORD_BASE + value) % _MOD
+    shingles = {window}
+    # La ventana rueda: sale la palabra más antigua, entra la siguiente
+    for out_hash, in_hash in zip(word_hashes, word_hashes[SHINGLE_WORDS:]):
+        window = ((window - out_hash * top) * _WORD_BASE + in_hash) % _MOD
+        shingles.add(window)
+    return sorted(shingles)[:SKETCH_SIZE]
+
+
+def _is_heading(line: str, following: str) -> bool:
+    # Línea corta sin puntuación seguida de otra que empieza frase: "Risks Related to ..."
+    return (
+        len(line) <= HEADING_MAX_CHARS
+        and not line.endswith(_TERMINAL + _CONTINUED)
+        and line.rsplit(" ", 1)[-1].lower() not in _JOINING_WORDS
+        and (following[:1].isupper() or following[:1].isdigit())
+    )
+
+
+def split_paragraphs(text: str) -> List[Tuple[int, int]]:
+    """Spans ``(offset, longitud)`` de los párrafos de ``text``."""
+    lines: List[Tuple[int, str]] = []
+    offset = 0
+    for line in text.split("\n"):
+        stripped = line.strip()
+        if stripped:
+            lines.append((offset + (len(line) - len(line.lstrip())), stripped))
+        offset += len(line) + 1
+
+    spans: List[Tuple[int, int]] = []
+    start = end = None
+    for idx, (line_start, stripped) in enumerate(lines):
+        following = lines[idx + 1][1] if idx + 1 < len(lines) else ""
+        if start is None and _is_heading(stripped, following):
+            # Un encabezado editado no debe arrastrar al párrafo que le sigue
+            spans.append((line_start, len(stripped)))
+            continue
+        if start is None:
+            start = line_start
+        end = line_start + len(stripped)
+        # Los nodos de texto partidos por <b>, <a>, ... se unen hasta cerrar la frase
+        if stripped.endswith(_TERMINAL) or end - start >= MAX_PARAGRAPH_CHARS:
+            spans.append((start, end - start))
+            start = None
+    if start is not None:
+        spans.append((start, end - start))
+    return spans
+
+
+def paragraph_index(text: str) -> List[Paragraph]:
+    paragraphs: List[Paragraph] = []
+    for offset, length in split_paragraphs(text):
+        normalized = _normalize(text[offset : offset + length])
+        digest = _rolling_hash(normalized)
+        paragraphs.append((offset, length, digest, _sketch(normalized.split(" "), digest)))
+    return paragraphs
+
+
+def similarity(left: Sequence[int], right: Sequence[int]) -> float:
+    """Estimación bottom-k de Jaccard entre dos sketches."""
+    union = sorted(set(left) | set(right))[:SKETCH_SIZE]
+    if not union:
+        return 0.0
+    both = set(left) & set(right)
+    return sum(1 for value in union if value in both) / len(union)
+
+
+def diff_paragraphs(
+    base: Sequence[Paragraph], new: Sequence[Paragraph], threshold: float = MODIFIED_THRESHOLD
+) -> Dict[str, object]:
+    """Índices de párrafos añadidos, eliminados, modificados y movidos entre ``base`` y ``new``."""
+    matcher = difflib.SequenceMatcher(None, [p[2] for p in base], [p[2] for p in new], autojunk=False)
+    removed: List[int] = []
+    added: List[int] = []
+    unchanged = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            unchanged += i2 - i1
+        else:
+            removed.extend(range(i1, i2))
+            added.extend(range(j1, j2))
+
+    # Un párrafo idéntico en otra posición cuenta como movido, no como cambio
+    pending: Dict[int, List[int]] = {}
+    for idx in removed:
+        pending.setdefault(base[idx][2], []).append(idx)
+    moved: List[Tuple[int, int]] = []
+    still_added: List[int] = []
+    for idx in added:
+        same = pending.get(new[idx][2])
+        if same:
+            moved.append((same.pop(0), idx))
+        else:
+            still_added.append(idx)
+    moved_base = {base_idx for base_idx, _ in moved}
+    still_removed = [idx for idx in removed if idx not in moved_base]
+
+    # Emparejamiento voraz por similitud (mejores parejas primero)
+    candidates = []
+    for new_idx in still_added:
+        for base_idx in still_removed:
+            score = similarity(base[base_idx][3], new[new_idx][3])
+            if score >= threshold:
+                candidates.append((score, base_idx, new_idx))
+    candidates.sort(key=lambda item: (-item[0], item[1], item[2]))
+    modified: List[Tuple[int, int, float]] = []
+    used_base, used_new = set(), set()
+    for score, base_idx, new_idx in candidates:
+        if base_idx in used_base or new_idx in used_new:
+            continue
+        used_base.add(base_idx)
+        used_new.add(new_idx)
+        modified.append((base_idx, new_idx, round(score, 3)))
+    modified.sort(key=lambda item: item[1])
+    return {
+        "unchanged": unchanged,
+        "moved": moved,
+        "modified": modified,
+        "added": [idx for idx in still_added if idx not in used_new],
+        "removed": [idx for idx in still_removed if idx not in used_base],
+    }
+
+
+__all__ = [
+    "PARAGRAPH_VERSION",
+    "Paragraph",
+    "diff_paragraphs",
+    "paragraph_index",
+    "similarity",
+    "split_paragraphs",
+]
@@ -0,0 +1,329 @@
+"""Caché persistente de secciones extraídas, por (accession, secciones, versión).
+
+Los filings son inmutables: una vez segmentado un accession, el resultado
+sirve para siempre mientras no cambie el extractor. La versión es un hash de
+``ITEM_PATTERNS``, ``SEGMENTER_VERSION`` y los topes de caracteres, de modo que
+cambiar cualquier patrón invalida la caché sin intervención manual; las filas
+de versiones antiguas se purgan al abrir el fichero.
+
+Los cuerpos de sección se guardan además por contenido (``sha256`` del texto)
+en ``section_blobs``: el cliente recibe el hash y lee sólo el rango de
+caracteres que necesita (``substr`` de SQLite, sin cargar el texto entero).
+Los índices de párrafos y los diffs entre secciones (``paragraph_diff``) se
+guardan también por hash de contenido.
+
+Cada fila guarda su tamaño y la última vez que se usó (``used_at``, con
+granularidad de ``TOUCH_INTERVAL`` para no escribir en cada lectura). Cuando
+el total supera ``max_bytes`` se borran las filas menos usadas de todas las
+tablas, igual que la ``ArchiveCache`` del backend con sus blobs; un cuerpo
+podado se vuelve a extraer si alguien lo pide por su accession. El total en
+memoria sólo cuenta lo que escribe este proceso, así que se relee de disco al
+menos cada ``rescan_interval`` segundos.
+
+SQLite en modo WAL permite varios procesos del servidor MCP leyendo a la vez.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Súbelo si cambian las tablas: los ficheros de otra versión se recrean (es una caché)
+_SCHEMA_VERSION = 2
+_TABLES = ("section_cache", "section_blobs", "paragraph_index", "section_diffs")
+TOUCH_INTERVAL = 3600.0
+
+_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS section_cache (
+    accession   TEXT    NOT NULL,
+    section_set TEXT    NOT NULL,
+    version     TEXT    NOT NULL,
+    payload     BLOB    NOT NULL,
+    created_at  REAL    NOT NULL,
+    size        INTEGER NOT NULL,
+    used_at     REAL    NOT NULL,
+    PRIMARY KEY (accession, section_set, version)
+)
+""",
+    """
+CREATE TABLE IF NOT EXISTS section_blobs (
+    digest      TEXT    PRIMARY KEY,
+    body        TEXT    NOT NULL,
+    created_at  REAL    NOT NULL,
+    size        INTEGER NOT NULL,
+    used_at     REAL    NOT NULL
+)
+""",
+    """
+CREATE TABLE IF NOT EXISTS paragraph_index (
+    digest      TEXT    NOT NULL,
+    version     TEXT    NOT NULL,
+    payload     BLOB    NOT NULL,
+    size        INTEGER NOT NULL,
+    used_at     REAL    NOT NULL,
+    PRIMARY KEY (digest, version)
+)
+""",
+    """
+CREATE TABLE IF NOT EXISTS section_diffs (
+    base_digest TEXT    NOT NULL,
+    digest      TEXT    NOT NULL,
+    version     TEXT    NOT NULL,
+    payload     BLOB    NOT NULL,
+    created_at  REAL    NOT NULL,
+    size        INTEGER NOT NULL,
+    used_at     REAL    NOT NULL,
+    PRIMARY KEY (base_digest, digest, version)
+)
+""",
+)
+
+
+def extractor_version(
+    patterns: Dict[str, List[str]],
+    segmenter_version: str,
+    max_chars: int,
+    limits: Optional[Dict[str, int]] = None,
+) -> str:
+    raw = json.dumps([patterns, segmenter_version, max_chars, limits or {}], sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def content_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SectionCache:
+    def __init__(self, path: str, version: str, max_bytes: int = 1024**3, rescan_interval: float = 60.0) -> None:
+        self.path = path
+        self.version = version
+        self.max_bytes = max_bytes
+        self.rescan_interval = rescan_interval
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "purged": 0,
+            "evicted": 0,
+            "blob_writes": 0,
+            "blob_reads": 0,
+        }
+        self._local = threading.local()
+        self._ready = False
+        self._init_lock = threading.Lock()
+        self._approx_bytes: Optional[int] = None
+        self._scanned_at = 0.0
+        self._prune_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        con = getattr(self._local, "con", None)
+        if con is None:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            except OSError as exc:
+                # Quien llama sólo captura sqlite3.Error: sin directorio, la caché no está
+                raise sqlite3.OperationalError(str(exc)) from exc
+            con = sqlite3.connect(self.path, timeout=5.0)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        if not self._ready:
+            with self._init_lock:
+                if not self._ready:
+                    if con.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+                        for table in _TABLES:
+                            con.execute(f"DROP TABLE IF EXISTS {table}")
+                        con.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                    for statement in _SCHEMA:
+                        con.execute(statement)
+                    purged = con.execute("DELETE FROM section_cache WHERE version != ?", [self.version]).rowcount
+                    con.commit()
+                    self.stats["purged"] += max(purged, 0)
+                    self._ready = True
+        return con
+
+    @staticmethod
+    def _key(accession: str, sections: Iterable[str]) -> List[str]:
+        return [accession.replace("-", ""), ",".join(sorted(sections))]
+
+    @staticmethod
+    def _touch(con: sqlite3.Connection, table: str, rowid: int, used_at: float) -> None:
+        now = time.time()
+        if now - used_at < TOUCH_INTERVAL:
+            return
+        try:
+            con.execute(f"UPDATE {table} SET used_at = ? WHERE rowid = ?", [now, rowid])
+            con.commit()
+        except sqlite3.Error:
+            pass  # otro proceso escribe: la fila se marcará en la próxima lectura
+
+    def _wrote(self, size: int) -> None:
+        if self._approx_bytes is not None:
+            self._approx_bytes += size
+        stale = time.monotonic() - self._scanned_at >= self.rescan_interval
+        if self._approx_bytes is None or self._approx_bytes > self.max_bytes or stale:
+            try:
+                self.prune()
+            except sqlite3.Error:
+                pass
+
+    def prune(self) -> int:
+        """Borra las filas menos usadas hasta que el total quepa en ``max_bytes``."""
+        with self._prune_lock:
+            self._scanned_at = time.monotonic()
+            con = self._connect()
+            total = sum(con.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0] for table in _TABLES)
+            doomed: Dict[str, List[Tuple[int]]] = {table: [] for table in _TABLES}
+            if total > self.max_bytes:
+                rows = con.execute(
+                    " UNION ALL ".join(f"SELECT '{table}', rowid, size, used_at FROM {table}" for table in _TABLES)
+                    + " ORDER BY used_at"
+                )
+                for table, rowid, size, _used_at in rows:
+                    if total <= self.max_bytes:
+                        break
+                    doomed[table].append((rowid,))
+                    total -= size
+                rows.close()
+                for table, rowids in doomed.items():
+                    con.executemany(f"DELETE FROM {table} WHERE rowid = ?", rowids)
+                con.commit()
+            evicted = sum(len(rowids) for rowids in doomed.values())
+            self._approx_bytes = total
+            self.stats["evicted"] += evicted
+            return evicted
+
+    def get(self, accession: str, sections: Iterable[str]) -> Optional[Dict]:
+        try:
+            con = self._connect()
+            row = con.execute(
+                "SELECT payload, rowid, used_at FROM section_cache"
+                " WHERE accession = ? AND section_set = ? AND version = ?",
+                [*self._key(accession, sections), self.version],
+            ).fetchone()
+        except sqlite3.Error:
+            row = None
+        if row is None:
+            self.stats["misses"] += 1
+            return None
+        self._touch(con, "section_cache", row[1], row[2])
+        self.stats["hits"] += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, accession: str, sections: Iterable[str], payload: Dict) -> None:
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"), 6)
+        now = time.time()
+        try:
+            con = self._connect()
+            con.execute(
+                "INSERT OR REPLACE INTO section_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [*self._key(accession, sections), self.version, blob, now, len(blob), now],
+            )
+            con.commit()
+        except sqlite3.Error:
+            return  # la caché es una optimización; un fallo de escritura no rompe la extracción
+        self.stats["writes"] += 1
+        self._wrote(len(blob))
+
+    def put_blobs(self, texts: Iterable[str]) -> Dict[str, str]:
+        """Guarda cada texto por su hash (idempotente); devuelve ``{digest: texto}``."""
+        blobs = {content_digest(text): text for text in texts if text}
+        if not blobs:
+            return blobs
+        now = time.time()
+        rows = [(digest, text, now, len(text.encode("utf-8")), now) for digest, text in blobs.items()]
+        written = written_bytes = 0
+        try:
+            con = self._connect()
+            for row in rows:
+                if con.execute("INSERT OR IGNORE INTO section_blobs VALUES (?, ?, ?, ?, ?)", row).rowcount > 0:
+                    written += 1
+                    written_bytes += row[3]
+            con.commit()
+        except sqlite3.Error:
+            return {}
+        self.stats["blob_writes"] += written
+        if written:
+            self._wrote(written_bytes)
+        return blobs
+
+    def read_blob(self, digest: str, offset: int = 0, length: Optional[int] = None) -> Optional[Tuple[str, int]]:
+        """Devuelve ``(texto[offset:offset + length], longitud total)`` o None si no existe."""
+        offset = max(int(offset), 0)
+        columns = "length(body), rowid, used_at FROM section_blobs WHERE digest = ?"
+        if length is None:
+            sql, params = f"SELECT substr(body, ?), {columns}", [offset + 1]
+        else:
+            sql, params = f"SELECT substr(body, ?, ?), {columns}", [offset + 1, max(int(length), 0)]
+        try:
+            con = self._connect()
+            row = con.execute(sql, [*params, digest]).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        self._touch(con, "section_blobs", row[2], row[3])
+        self.stats["blob_reads"] += 1
+        return row[0], row[1]
+
+    def _get_packed(self, table: str, where: str, params: List[str]) -> Optional[object]:
+        try:
+            con = self._connect()
+            row = con.execute(f"SELECT payload, rowid, used_at FROM {table} WHERE {where}", params).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        self._touch(con, table, row[1], row[2])
+        return json.loads(zlib.decompress(row[0]))
+
+    def _put_packed(self, table: str, columns: List[str], params: List[object], payload: object) -> None:
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"), 6)
+        names = ", ".join([*columns, "payload", "size", "used_at"])
+        marks = ", ".join("?" * (len(columns) + 3))
+        try:
+            con = self._connect()
+            con.execute(
+                f"INSERT OR REPLACE INTO {table} ({names}) VALUES ({marks})",
+                [*params, blob, len(blob), time.time()],
+            )
+            con.commit()
+        except sqlite3.Error:
+            return
+        self._wrote(len(blob))
+
+    def get_paragraphs(self, digest: str, version: str) -> Optional[List]:
+        return self._get_packed("paragraph_index", "digest = ? AND version = ?", [digest, version])
+
+    def put_paragraphs(self, digest: str, version: str, paragraphs: List) -> None:
+        self._put_packed("paragraph_index", ["digest", "version"], [digest, version], paragraphs)
+
+    def get_diff(self, base_digest: str, digest: str, version: str) -> Optional[Dict]:
+        return self._get_packed(
+            "section_diffs", "base_digest = ? AND digest = ? AND version = ?", [base_digest, digest, version]
+        )
+
+    def put_diff(self, base_digest: str, digest: str, version: str, diff: Dict) -> None:
+        self._put_packed(
+            "section_diffs",
+            ["base_digest", "digest", "version", "created_at"],
+            [base_digest, digest, version, time.time()],
+            diff,
+        )
+
+    def snapshot(self) -> Dict:
+        return {
+            "path": self.path,
+            "version": self.version,
+            "max_bytes": self.max_bytes,
+            "approx_bytes": self._approx_bytes,
+            **self.stats,
+        }
+
+
+__all__ = ["SectionCache", "content_digest", "extractor_version"]
@@ -0,0 +1,220 @@
+"""Segmentador de secciones en una sola pasada para HTML de 10-K/10-Q/20-F.
+
+El HTML se alimenta por trozos a ``lxml.etree.HTMLPullParser``; el texto se
+emite en orden de documento con la misma forma que
+``BeautifulSoup(...).get_text("\\n", strip=True)`` y se vuelca a un único
+búfer. Sobre cada bloque nuevo corre un autómata compilado con todos los
+encabezados de ``ITEM_PATTERNS`` (alternancia con grupos con nombre) y, para
+las secciones abiertas, la expresión de fin de sección. Las secciones se
+devuelven como ``(offset, longitud)`` en ese búfer y la lectura se corta en
+cuanto todas las pedidas están cerradas.
+
+Semántica idéntica a la extracción original: por sección gana el primer
+patrón de la lista que aparezca (su primera aparición) y el texto llega hasta
+el siguiente ``\\nitem N.`` o ``max_chars`` caracteres. ``limits`` sube ese
+tope para secciones concretas (p. ej. el Item 1A completo para los diffs).
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lxml import etree
+
+SEGMENTER_VERSION = "1"  # súbelo si cambia el texto o los spans que se emiten
+BOUNDARY_RE = re.compile(r"\nitem\s+\d+[a-z]?\.", re.IGNORECASE)
+_SKIP_TEXT = frozenset({"script", "style"})
+_FLUSH_CHARS = 32_768
+_OVERLAP = 512  # más largo que cualquier encabezado que cruce dos bloques
+
+Span = Tuple[int, int]
+
+
+class SectionSegmenter:
+    def __init__(
+        self,
+        patterns: Dict[str, List[str]],
+        sections: Optional[Iterable[str]] = None,
+        max_chars: int = 20000,
+        limits: Optional[Dict[str, int]] = None,
+    ) -> None:
+        wanted = list(patterns) if sections is None else [key for key in patterns if key in set(sections)]
+        self.patterns = {key: list(patterns[key]) for key in wanted}
+        self.max_chars = max_chars
+        self.limits = {key: (limits or {}).get(key, max_chars) for key in wanted}
+        self._parser = etree.HTMLPullParser(events=("start", "end", "comment", "pi"))
+        self._carry = ""
+        self._parts: List[str] = []
+        self._pending: List[str] = []
+        self._pending_chars = 0
+        self._length = 0  # caracteres ya volcados a ``_parts``
+        self._emitted = 0  # caracteres emitidos (volcados + pendientes)
+        self._tail = ""
+        # (clave, índice de patrón) -> inicio; y fin cuando la sección se cierra
+        self._starts: Dict[Tuple[str, int], int] = {}
+        self._ends: Dict[Tuple[str, int], int] = {}
+        self._automaton: Optional["re.Pattern[str]"] = None
+        self._groups: Dict[str, Tuple[str, int]] = {}
+        self._rebuild_automaton()
+        self.done = not self.patterns
+
+    # --- Autómata de encabezados ----------------------------------------
+    def _live_patterns(self) -> List[Tuple[str, int]]:
+        live = []
+        for key, pats in self.patterns.items():
+            for idx in range(len(pats)):
+                if (key, idx) in self._starts:
+                    break  # los de menor prioridad ya no pueden ganar
+                live.append((key, idx))
+        return live
+
+    def _rebuild_automaton(self) -> None:
+        live = self._live_patterns()
+        self._groups = {f"p{n}": item for n, item in enumerate(live)}
+        if not live:
+            self._automaton = None
+            return
+        self._automaton = re.compile(
+            "|".join(f"(?P<{name}>{self.patterns[key][idx]})" for name, (key, idx) in self._groups.items()),
+            re.IGNORECASE,
+        )
+
+    # --- Entrada ---------------------------------------------------------
+    def feed(self, chunk: str) -> bool:
+        """Procesa un trozo de HTML; devuelve True cuando ya no hace falta leer más."""
+        if self.done:
+            return True
+        # El parser incremental de libxml2 no reconoce un "</script>" partido entre
+        # dos feed(); nunca se corta dentro de una etiqueta.
+        chunk = self._carry + chunk
+        cut = chunk.rfind("<")
+        if cut > chunk.rfind(">"):
+            chunk, self._carry = chunk[:cut], chunk[cut:]
+        else:
+            self._carry = ""
+        if chunk:
+            self._parser.feed(chunk)
+        self._drain()
+        if self._pending_chars >= _FLUSH_CHARS:
+            self._flush()
+        return self.done
+
+    def close(self) -> Tuple[str, Dict[str, Span]]:
+        """Termina el análisis y devuelve el búfer de texto y los spans por sección."""
+        if not self.done:
+            try:
+                if self._carry:
+                    self._parser.feed(self._carry)
+                self._parser.close()
+            except etree.XMLSyntaxError:
+                pass
+            self._drain()
+        self._flush(final=True)
+        text = "".join(self._parts)
+        spans: Dict[str, Span] = {}
+        for key, pats in self.patterns.items():
+            for idx in range(len(pats)):
+                start = self._starts.get((key, idx))
+                if start is not None:
+                    end = self._ends.get((key, idx), len(text))
+                    spans[key] = (start, min(end - start, self.limits[key]))
+                    break
+        return text, spans
+
+    # --- Texto en orden de documento -------------------------------------
+    def _emit(self, value: Optional[str]) -> None:
+        if not value:
+            return
+        value = value.strip()
+        if not value:
+            return
+        if self._emitted:
+            self._pending.append("\n")
+            self._emitted += 1
+            self._pending_chars += 1
+        self._pending.append(value)
+        self._emitted += len(value)
+        self._pending_chars += len(value)
+
+    def _emit_before(self, node: "etree._Element") -> None:
+        # Al abrirse un nodo están completos el .tail del hermano previo o el .text del padre
+        previous = node.getprevious()
+        if previous is not None:
+            self._emit(previous.tail)
+            parent = node.getparent()
+            # Los hermanos anteriores ya emitidos no se vuelven a necesitar
+            while parent is not None and parent[0] is not node and parent[0] is not previous:
+                del parent[0]
+        else:
+            parent = node.getparent()
+            if parent is not None and parent.tag not in _SKIP_TEXT:
+                self._emit(parent.text)
+
+    def _drain(self) -> None:
+        for event, node in self._parser.read_events():
+            if event == "start":
+                self._emit_before(node)
+            elif event == "end":
+                if len(node):
+                    self._emit(node[-1].tail)
+                elif node.tag not in _SKIP_TEXT:
+                    self._emit(node.text)
+            else:  # comentario o instrucción de proceso: sólo cuenta su .tail
+                self._emit_before(node)
+
+    # --- Búsqueda por bloques ---------------------------------------------
+    def _flush(self, final: bool = False) -> None:
+        if not self._pending and not final:
+            return
+        block = "".join(self._pending)
+        self._pending = []
+        self._pending_chars = 0
+        window = self._tail + block
+        base = self._length - len(self._tail)
+        self._parts.append(block)
+        self._length += len(block)
+        self._tail = window[-_OVERLAP:]
+        self._scan(window, base)
+
+    def _scan(self, window: str, base: int) -> None:
+        pos = 0
+        while self._automaton is not None:
+            match = self._automaton.search(window, pos)
+            if match is None:
+                break
+            name = next(group for group, value in match.groupdict().items() if value is not None)
+            item = self._groups[name]
+            if item not in self._starts:
+                self._starts[item] = base + match.start()
+                self._rebuild_automaton()
+            pos = match.start() + 1
+        for item, start in self._starts.items():
+            if item in self._ends:
+                continue
+            boundary = BOUNDARY_RE.search(window, max(start + 10 - base, 0))
+            if boundary is not None:
+                self._ends[item] = base + boundary.start()
+            elif self._length >= start + self.limits[item[0]]:
+                self._ends[item] = start + self.limits[item[0]]
+        self.done = self.done or self._settled()
+
+    def _settled(self) -> bool:
+        # Una sección queda fijada cuando su patrón preferido apareció y está cerrada
+        return all((key, 0) in self._ends for key in self.patterns)
+
+
+def segment_html(
+    html: str,
+    patterns: Dict[str, List[str]],
+    sections: Optional[Iterable[str]] = None,
+    max_chars: int = 20000,
+    chunk_size: int = 65_536,
+    limits: Optional[Dict[str, int]] = None,
+) -> Tuple[str, Dict[str, Span]]:
+    segmenter = SectionSegmenter(patterns, sections, max_chars, limits)
+    for offset in range(0, len(html), chunk_size):
+        if segmenter.feed(html[offset : offset + chunk_size]):
+            break
+    return segmenter.close()
+
+
+__all__ = ["SectionSegmenter", "segment_html", "BOUNDARY_RE", "SEGMENTER_VERSION"]
@@ -0,0 +1,8 @@
+"""Los módulos del servidor se importan por nombre, igual que al ejecutar ``python main.py``."""
+
+import os
+import sys
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
@@ -0,0 +1,57 @@
+import asyncio
+
+import main
+from company_index import CompanyIndex
+
+PAYLOAD = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+}
+
+
+def test_list_filings_many_isolates_errors_and_keeps_input_order(monkeypatch):
+    delays = {"1": 0.03, "2": 0.0, "3": 0.01}
+    calls = []
+
+    async def list_filings(cik, forms, years):
+        calls.append(cik)
+        await asyncio.sleep(delays[cik])
+        if cik == "3":
+            raise ValueError("CIK 3 sin submissions")
+        return [{"accession": f"acc-{cik}", "form": forms[0]}]
+
+    monkeypatch.setattr(main, "list_filings", list_filings)
+    result = asyncio.run(main.list_filings_many(["1", "2", "3", "1"], ["10-K"], [2023]))
+
+    assert sorted(calls) == ["1", "2", "3"]  # el duplicado se pide una vez
+    assert list(result["filings"]) == ["1", "2"]  # orden de entrada aunque "2" termine antes
+    assert result["filings"]["2"] == [{"accession": "acc-2", "form": "10-K"}]
+    assert result["errors"] == {"3": "ValueError: CIK 3 sin submissions"}
+
+
+def test_get_filing_docs_many_maps_each_accession_to_its_cik(monkeypatch):
+    async def get_filing_docs(cik, accession, prefer_html=True):
+        await asyncio.sleep(0.02 if accession == "a-1" else 0.0)
+        if accession == "a-2":
+            raise KeyError("directory")
+        return [f"https://x/{cik}/{accession}.htm"]
+
+    monkeypatch.setattr(main, "get_filing_docs", get_filing_docs)
+    filings = [{"cik": "1", "accession": "a-1"}, {"cik": "2", "accession": "a-2"}, {"cik": "3", "accession": "a-3"}]
+    result = asyncio.run(main.get_filing_docs_many(filings))
+
+    assert result["docs"] == {"a-1": ["https://x/1/a-1.htm"], "a-3": ["https://x/3/a-3.htm"]}
+    assert list(result["docs"]) == ["a-1", "a-3"]
+    assert result["errors"] == {"a-2": "KeyError: 'directory'"}
+
+
+def test_get_ciks_resolves_both_directions_and_reports_missing(monkeypatch):
+    async def company_map():
+        return CompanyIndex.from_payload(PAYLOAD)
+
+    monkeypatch.setattr(main, "_company_map", company_map)
+    result = asyncio.run(main.get_ciks(tickers=["msft", "NOPE"], ciks=["320193", "not-a-cik"]))
+
+    assert result["tickers"] == {"msft": {"ticker": "MSFT", "cik": "0000789019"}}
+    assert result["ciks"] == {"320193": {"ticker": "AAPL", "cik": "0000320193"}}
+    assert result["missing"] == ["NOPE", "not-a-cik"]
@@ -0,0 +1,125 @@
+from company_index import MAGIC, CompanyIndex, trigrams
+
+PAYLOAD = {
+    "0": {"cik_str": 320193, "ticker": "AAPL", "title": "Apple Inc."},
+    "1": {"cik_str": 789019, "ticker": "MSFT", "title": "MICROSOFT CORP"},
+    "2": {"cik_str": 1652044, "ticker": "GOOGL", "title": "Alphabet Inc."},
+    "3": {"cik_str": 1652044, "ticker": "GOOG", "title": "Alphabet Inc."},
+    "4": {"cik_str": 1018724, "ticker": "AMZN", "title": "AMAZON COM INC"},
+    "5": {"cik_str": 1, "ticker": "", "title": "No ticker"},
+}
+
+
+def test_trigrams_are_normalized_and_padded():
+    assert trigrams("a.b") == trigrams("A B")
+    assert "  A" in trigrams("Apple")
+
+
+def test_lookups_by_ticker_and_cik():
+    index = CompanyIndex.from_payload(PAYLOAD, fetched_at=123.0)
+    assert len(index) == 5
+    assert index.ticker(" aapl ") == {"ticker": "AAPL", "cik": "0000320193", "title": "Apple Inc."}
+    assert index.ticker("NOPE") is None
+    # El ticker principal es el primero en el orden de la SEC
+    assert index.cik("0001652044") == {
+        "ticker": "GOOGL",
+        "cik": "0001652044",
+        "title": "Alphabet Inc.",
+        "tickers": ["GOOGL", "GOOG"],
+    }
+    assert index.cik("42") is None
+
+
+def test_trigram_search_ranks_by_dice_score():
+    index = CompanyIndex.from_payload(PAYLOAD)
+    results = index.search("microsoft")
+    assert results[0]["ticker"] == "MSFT"
+    assert 0 < results[0]["score"] <= 1
+    assert [r["ticker"] for r in index.search("alphabet", limit=1)] == ["GOOGL"]
+    assert index.search("zzzzqqq") == []
+
+
+def test_snapshot_round_trip_through_mmap(tmp_path):
+    path = str(tmp_path / "company_map.bin")
+    index = CompanyIndex.from_payload(PAYLOAD, fetched_at=123.0)
+    index.save(path)
+
+    loaded = CompanyIndex.load(path)
+    assert loaded is not None and loaded._backing is not None
+    assert loaded.fetched_at == 123.0
+    assert loaded.rows == index.rows
+    assert {gram: list(ids) for gram, ids in loaded.grams.items()} == {
+        gram: list(ids) for gram, ids in index.grams.items()
+    }
+    for query in ("apple", "amazon com", "alphabet"):
+        assert loaded.search(query) == index.search(query)
+    assert loaded.cik("1652044")["tickers"] == ["GOOGL", "GOOG"]
+
+
+def test_load_rejects_missing_or_foreign_files(tmp_path):
+    assert CompanyIndex.load(str(tmp_path / "missing.bin")) is None
+    bogus = tmp_path / "bogus.bin"
+    bogus.write_bytes(b"NOTAMAP\n" + bytes(64))
+    assert CompanyIndex.load(str(bogus)) is None
+    truncated = tmp_path / "truncated.bin"
+    truncated.write_bytes(MAGIC + bytes(4))
+    assert CompanyIndex.load(str(truncated)) is None
+
+
+def test_company_map_refresh_revalidates_through_shared_cache(tmp_path, monkeypatch):
+    import asyncio
+
+    import httpx
+    import main
+
+    sent = []
+
+    async def fetcher(url, headers):
+        sent.append(dict(headers))
+        request = httpx.Request("GET", url)
+        if headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, request=request)
+        return httpx.Response(200, json=PAYLOAD, headers={"ETag": '"v1"'}, request=request)
+
+    monkeypatch.setattr(main, "COMPANY_MAP_PATH", str(tmp_path / "company_map.bin"))
+    monkeypatch.setattr(main, "_json_cache", main.RevalidatingCache(fetcher, ttl=300, stale_ttl=0))
+    monkeypatch.setattr(main, "_company_index", None)
+    monkeypatch.setattr(main, "_company_payload", None)
+
+    async def run():
+        first = await main._refresh_company_map()
+        second = await main._refresh_company_map()
+        return first, second
+
+    first, second = asyncio.run(run())
+    # El 304 conserva el índice ya construido
+    assert second is first and first.ticker("AAPL")["cik"] == "0000320193"
+    assert sent == [{}, {"If-None-Match": '"v1"'}]
+    assert main._json_cache.snapshot()["not_modified"] == 1
+
+
+def test_conditional_get_retries_transient_failures(monkeypatch):
+    import asyncio
+
+    import httpx
+    import main
+    from tenacity import wait_none
+
+    replies = iter([httpx.ConnectError("reset"), 503, 200])
+
+    def handler(request):
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return httpx.Response(reply, json=PAYLOAD)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def client_factory():
+        return client
+
+    monkeypatch.setattr(main, "_client_factory", client_factory)
+    monkeypatch.setattr(main._conditional_get.retry, "wait", wait_none())
+    monkeypatch.setattr(main, "_json_cache", main.RevalidatingCache(main._conditional_get, ttl=300, stale_ttl=0))
+
+    assert asyncio.run(main._json_cache.get_json(main.COMPANY_TICKERS_URL)) == PAYLOAD
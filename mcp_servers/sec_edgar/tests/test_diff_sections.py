@@ -0,0 +1,81 @@
+import asyncio
+
+import main
+from section_cache import SectionCache
+
+BASE = "0000320193-22-000108"
+NEW = "0000320193-23-000106"
+FILLER = [f"Risk number {n} could adversely affect our results of operations in fiscal {n}." for n in range(400)]
+
+
+def _store(cache, accession, risk_text):
+    # Misma forma que deja _extract: la sección recortada y, si es más larga, la entera aparte
+    refs = {}
+    if len(risk_text) > main.SECTION_MAX_CHARS:
+        cache.put_blobs([risk_text])
+        refs = main._section_refs({"risk_factors": risk_text})
+    sections = {"risk_factors": risk_text[: main.SECTION_MAX_CHARS], "mdna": "", "financials": ""}
+    cache.put(accession, list(main.ITEM_PATTERNS), {"sections": sections, "sources": [], "full_refs": refs})
+
+
+def _cache(tmp_path, monkeypatch):
+    cache = SectionCache(str(tmp_path / "sections.sqlite"), "test")
+    monkeypatch.setattr(main, "_section_cache", cache)
+    return cache
+
+
+def test_diff_sections_compares_past_the_extraction_cut(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, monkeypatch)
+    base_text = "\n".join(FILLER)
+    assert len(base_text) > main.SECTION_MAX_CHARS
+    edited = FILLER[:-1] + ["We now face new export controls on advanced semiconductors."]
+    _store(cache, BASE, base_text)
+    _store(cache, NEW, "\n".join(edited))
+
+    result = asyncio.run(main.diff_sections("320193", NEW, base_accession=BASE))
+
+    assert result["cik"] == "0000320193" and result["base_accession"] == BASE
+    assert result["stats"]["unchanged"] == len(FILLER) - 1
+    assert [item["text"] for item in result["added"]] == [edited[-1]]
+    assert [item["text"] for item in result["removed"]] == [FILLER[-1]]
+    assert result["modified"] == []
+    assert result["truncated"] is False and result["partial"] is False
+    # El diff queda guardado por hash de contenido
+    assert cache.get_diff(result["base_digest"], result["digest"], main.PARAGRAPH_VERSION) is not None
+
+
+def test_diff_sections_marks_partial_when_a_body_hit_its_cap(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, monkeypatch)
+    base_text = " ".join(FILLER[:5])
+    monkeypatch.setattr(main, "DIFF_SECTION_LIMITS", {"risk_factors": len(base_text)})
+    _store(cache, BASE, base_text)
+    _store(cache, NEW, base_text.replace("fiscal 4.", "fiscal 2024."))
+
+    result = asyncio.run(main.diff_sections("320193", NEW, base_accession=BASE))
+
+    assert result["partial"] is True
+    assert [(item["base_index"], item["index"]) for item in result["modified"]] == [(0, 0)]
+
+
+def test_diff_ref_re_extracts_a_pruned_full_body(tmp_path, monkeypatch):
+    cache = _cache(tmp_path, monkeypatch)
+    full_text = "\n".join(FILLER)
+    _store(cache, NEW, full_text)
+    digest = main._section_refs({"risk_factors": full_text})["risk_factors"]["digest"]
+    cache._connect().execute("DELETE FROM section_blobs")
+    cache._connect().commit()
+    calls = []
+
+    async def get_filing_docs(cik, accession):
+        return ["https://www.sec.gov/doc.htm"]
+
+    async def extract(urls, form, accession, wanted):
+        calls.append(accession)
+        cache.put_blobs([full_text])
+        return {"sections": {}, "sources": [], "full_refs": main._section_refs({"risk_factors": full_text})}
+
+    monkeypatch.setattr(main, "get_filing_docs", get_filing_docs)
+    monkeypatch.setattr(main, "_extract", extract)
+    ref = asyncio.run(main._diff_ref("320193", NEW, "10-K", "risk_factors"))
+    assert calls == [NEW]
+    assert ref["digest"] == digest and cache.read_blob(digest, 0, 0) == ("", len(full_text))
@@ -0,0 +1,127 @@
+import asyncio
+
+import main
+from section_cache import SectionCache
+
+ACCESSION = "0000320193-23-000106"
+RISK = "<html><body><p>Item 1A. Risk Factors</p><p>Supply chains may fail.</p></body></html>"
+NO_HEADINGS = "<html><body><p>Exhibit 21. Subsidiaries of the registrant.</p></body></html>"
+
+
+def _serve(monkeypatch, tmp_path, documents):
+    """Sirve ``documents[url]`` (HTML o código de estado) en lugar de sec.gov."""
+    cache = SectionCache(str(tmp_path / "sections.sqlite"), "test")
+    monkeypatch.setattr(main, "_section_cache", cache)
+    fetched = []
+
+    async def client_factory():
+        return None
+
+    async def segment_document(client, url, segmenter):
+        fetched.append(url)
+        body = documents[url]
+        if isinstance(body, int):
+            request = main.httpx.Request("GET", url)
+            response = main.httpx.Response(body, request=request)
+            raise main.httpx.HTTPStatusError("error", request=request, response=response)
+        segmenter.feed(body)
+
+    monkeypatch.setattr(main, "_client_factory", client_factory)
+    monkeypatch.setattr(main, "_segment_document", segment_document)
+    return cache, fetched
+
+
+def test_empty_extractions_are_not_cached(monkeypatch, tmp_path):
+    cache, _ = _serve(
+        monkeypatch,
+        tmp_path,
+        {"https://x/missing.htm": 404, "https://x/exhibit.htm": NO_HEADINGS, "https://x/10k.htm": RISK},
+    )
+    wanted = list(main.ITEM_PATTERNS)
+
+    async def run():
+        for urls in ([], ["https://x/missing.htm"], ["https://x/exhibit.htm"]):
+            extracted = await main._extract(urls, "10-K", ACCESSION, wanted)
+            assert not any(extracted["sections"].values())
+            assert cache.get(ACCESSION, wanted) is None
+        # Con las urls correctas el resultado sí se guarda
+        extracted = await main._extract(["https://x/10k.htm"], "10-K", ACCESSION, wanted)
+        assert "Supply chains may fail." in extracted["sections"]["risk_factors"]
+        assert cache.get(ACCESSION, wanted) == extracted
+
+    asyncio.run(run())
+
+
+def _document(risk):
+    return (
+        "<html><body><p>Item 1A. Risk Factors</p><p>" + risk + "</p>"
+        "<p>Item 7. Management's Discussion and Analysis</p><p>Sales grew.</p>"
+        "<p>Item 8. Financial Statements</p><p>Balance sheet.</p></body></html>"
+    )
+
+
+def _timed(monkeypatch, tmp_path, documents):
+    """Como ``_serve`` pero cada url tarda ``documents[url][0]`` segundos y registra concurrencia."""
+    cache = SectionCache(str(tmp_path / "sections.sqlite"), "test")
+    monkeypatch.setattr(main, "_section_cache", cache)
+    log = {"active": 0, "peak": 0, "cancelled": []}
+
+    async def client_factory():
+        return None
+
+    async def segment_document(client, url, segmenter):
+        delay, body = documents[url]
+        log["active"] += 1
+        log["peak"] = max(log["peak"], log["active"])
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            log["cancelled"].append(url)
+            raise
+        finally:
+            log["active"] -= 1
+        segmenter.feed(body)
+
+    monkeypatch.setattr(main, "_client_factory", client_factory)
+    monkeypatch.setattr(main, "_segment_document", segment_document)
+    return log
+
+
+def test_documents_are_fetched_concurrently(monkeypatch, tmp_path):
+    urls = [f"https://x/{n}.htm" for n in range(3)]
+    log = _timed(monkeypatch, tmp_path, {url: (0.05, NO_HEADINGS) for url in urls})
+    asyncio.run(main._extract(urls, "10-K", ACCESSION, list(main.ITEM_PATTERNS)))
+    assert log["peak"] == min(len(urls), main.EXTRACT_CONCURRENCY)
+
+
+def test_remaining_fetches_are_cancelled_once_every_section_is_found(monkeypatch, tmp_path):
+    log = _timed(
+        monkeypatch,
+        tmp_path,
+        {
+            "https://x/10k.htm": (0.0, _document("Supply chains may fail.")),
+            "https://x/ex99.htm": (10.0, NO_HEADINGS),
+        },
+    )
+    extracted = asyncio.run(
+        main._extract(["https://x/10k.htm", "https://x/ex99.htm"], "10-K", ACCESSION, list(main.ITEM_PATTERNS))
+    )
+    assert all(extracted["sections"].values())
+    assert log["cancelled"] == ["https://x/ex99.htm"]
+    assert [source["url"] for source in extracted["sources"]] == ["https://x/10k.htm"]
+
+
+def test_first_document_in_url_order_wins_even_if_it_finishes_last(monkeypatch, tmp_path):
+    _timed(
+        monkeypatch,
+        tmp_path,
+        {
+            "https://x/first.htm": (0.05, _document("First risk.")),
+            "https://x/second.htm": (0.0, _document("Second risk.")),
+        },
+    )
+    extracted = asyncio.run(
+        main._extract(["https://x/first.htm", "https://x/second.htm"], "10-K", ACCESSION, list(main.ITEM_PATTERNS))
+    )
+    assert "First risk." in extracted["sections"]["risk_factors"]
+    assert "Second risk." not in extracted["sections"]["risk_factors"]
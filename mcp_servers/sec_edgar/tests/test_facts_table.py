@@ -0,0 +1,110 @@
+import io
+import json
+
+import facts_table
+from facts_table import FactsTable
+
+
+def _fact(val, fy, fp="FY", form="10-K", **extra):
+    return {
+        "val": val,
+        "fy": fy,
+        "fp": fp,
+        "form": form,
+        "filed": f"{fy + 1}-02-01",
+        "end": f"{fy}-12-31",
+        "accn": f"0000320193-{fy % 100 + 1:02d}-000001",
+        **extra,
+    }
+
+
+COMPANYFACTS = {
+    "cik": 320193,
+    "entityName": "Apple Inc.",
+    "facts": {
+        "dei": {
+            "EntityRegistrantName": {"label": "Registrant", "units": {"pure": [{"val": "Apple Inc.", "fy": 2023}]}},
+        },
+        "us-gaap": {
+            "Revenues": {
+                "label": "Revenues",
+                "description": "Amount of revenue recognized.",
+                "units": {
+                    "USD": [
+                        _fact(365817e6, 2021, start="2021-01-01", frame="CY2021"),
+                        _fact(394328e6, 2022, start="2022-01-01"),
+                        _fact(90146e6, 2022, fp="Q4", form="10-Q", start="2022-10-01"),
+                        _fact(383285e6, 2023, start="2023-01-01"),
+                    ]
+                },
+            },
+            "EarningsPerShareBasic": {
+                "label": "EPS basic",
+                "units": {"USD/shares": [_fact(6.16, 2023)]},
+            },
+        },
+        "ifrs-full": {"Revenue": {"label": "Revenue", "units": {"EUR": [_fact(1.0, 2023)]}}},
+    },
+    "trailer": {"ignored": [1, 2, 3]},
+}
+
+
+def _table():
+    raw = json.dumps(COMPANYFACTS).encode("utf-8")
+    return FactsTable.from_file("0000320193", io.BytesIO(raw))
+
+
+def _columns(table):
+    return (
+        table.entity_name,
+        table.labels,
+        table.ranges,
+        list(table.val),
+        list(table.fy),
+        [table.periods.values[code] for code in table.fp],
+        [table.forms.values[code] for code in table.form],
+        table.filed,
+        table.start,
+        table.end,
+        table.accn,
+        table.frame,
+    )
+
+
+def test_ijson_columns_match_full_json_parse(monkeypatch):
+    streamed = _table()
+    monkeypatch.setattr(facts_table, "ijson", None)
+    loaded = _table()
+    assert _columns(streamed) == _columns(loaded)
+    assert streamed.entity_name == "Apple Inc."
+    # El hecho de texto de dei no entra en las columnas numéricas
+    assert len(streamed) == 6
+    assert ("dei", "EntityRegistrantName", "pure") not in streamed.ranges
+    assert streamed.ranges[("us-gaap", "Revenues", "USD")] == (0, 4)
+    assert streamed.labels[("us-gaap", "EarningsPerShareBasic")] == "EPS basic"
+
+
+def test_query_projects_concepts_units_years_and_forms():
+    table = _table()
+    rows = table.query(["Revenues"], fy_range=[2022, 2023], forms=["10-K"])
+    assert [(row["fy"], row["val"]) for row in rows] == [(2022, 394328e6), (2023, 383285e6)]
+    assert rows[0] == {
+        "concept": "us-gaap:Revenues",
+        "unit": "USD",
+        "val": 394328e6,
+        "fy": 2022,
+        "fp": "FY",
+        "form": "10-K",
+        "filed": "2023-02-01",
+        "start": "2022-01-01",
+        "end": "2022-12-31",
+        "accn": "0000320193-23-000001",
+        "frame": None,
+    }
+    assert [row["concept"] for row in table.query(["ifrs-full:Revenue", "us-gaap:EarningsPerShareBasic"])] == [
+        "us-gaap:EarningsPerShareBasic",
+        "ifrs-full:Revenue",
+    ]
+    assert table.query(["Revenues"], units=["EUR"]) == []
+    assert table.query(["Revenues"], forms=["20-F"]) == []
+    assert len(table.query(["Revenues"], limit=2)) == 2
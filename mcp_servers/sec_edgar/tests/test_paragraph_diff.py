@@ -0,0 +1,87 @@
+from paragraph_diff import diff_paragraphs, paragraph_index, split_paragraphs
+
+
+def _texts(text):
+    return [text[offset : offset + length] for offset, length in split_paragraphs(text)]
+
+
+def test_short_heading_is_its_own_paragraph():
+    text = "Risks Related to Our Business\nOur revenue depends on \nApple\n products.\nGeneral Risks\nWe may fail."
+    assert _texts(text) == [
+        "Risks Related to Our Business",
+        "Our revenue depends on \nApple\n products.",
+        "General Risks",
+        "We may fail.",
+    ]
+
+
+def test_edited_heading_leaves_following_paragraph_unchanged():
+    body = "Our operations depend on a limited number of suppliers for key components."
+    base = paragraph_index(f"Risks Related to Our Business\n{body}")
+    new = paragraph_index(f"Risks Related to Our Operations\n{body}")
+    changes = diff_paragraphs(base, new)
+    assert changes["unchanged"] == 1
+    assert changes["added"] == [0] and changes["removed"] == [0]
+    assert changes["modified"] == []
+
+
+PARAGRAPHS = [
+    "We depend on third-party manufacturers located in Asia for most of our products.",
+    "Changes in trade policy could raise the cost of components and reduce margins.",
+    "Our business is subject to complex and changing laws and regulations regarding privacy, data "
+    "protection and consumer protection in the jurisdictions where we operate, and any failure to "
+    "comply could result in fines.",
+    "Cybersecurity incidents could disrupt operations and damage our reputation.",
+]
+
+
+def test_paragraph_index_spans_and_normalized_digests():
+    text = "\n".join(PARAGRAPHS)
+    index = paragraph_index(text)
+    assert [text[offset : offset + length] for offset, length, _, _ in index] == PARAGRAPHS
+    # Mayúsculas y espacios no cambian el hash
+    again = paragraph_index("\n".join(p.upper().replace(" ", "  ") for p in PARAGRAPHS))
+    assert [p[2] for p in again] == [p[2] for p in index]
+    assert all(len(p[3]) <= 16 and p[3] == sorted(p[3]) for p in index)
+
+
+def test_diff_paragraphs_identical_sections_are_unchanged():
+    index = paragraph_index("\n".join(PARAGRAPHS))
+    assert diff_paragraphs(index, index) == {
+        "unchanged": 4,
+        "moved": [],
+        "modified": [],
+        "added": [],
+        "removed": [],
+    }
+
+
+def test_diff_paragraphs_added_and_removed():
+    base = paragraph_index("\n".join(PARAGRAPHS))
+    new_paragraph = "Climate change regulations may require significant new capital expenditures."
+    new = paragraph_index("\n".join([PARAGRAPHS[0], new_paragraph] + PARAGRAPHS[2:3]))
+    changes = diff_paragraphs(base, new)
+    assert changes["unchanged"] == 2
+    assert changes["added"] == [1]
+    assert changes["removed"] == [1, 3]
+    assert changes["moved"] == [] and changes["modified"] == []
+
+
+def test_diff_paragraphs_modified_pairs_similar_paragraphs():
+    base = paragraph_index("\n".join(PARAGRAPHS))
+    edited = PARAGRAPHS[2].replace("in fines.", "in significant fines.")
+    new = paragraph_index("\n".join(PARAGRAPHS[:2] + [edited] + PARAGRAPHS[3:]))
+    changes = diff_paragraphs(base, new)
+    assert changes["unchanged"] == 3
+    assert [(b, n) for b, n, _ in changes["modified"]] == [(2, 2)]
+    assert 0.5 <= changes["modified"][0][2] < 1
+    assert changes["added"] == [] and changes["removed"] == []
+
+
+def test_diff_paragraphs_moved_is_not_a_change():
+    base = paragraph_index("\n".join(PARAGRAPHS))
+    new = paragraph_index("\n".join([PARAGRAPHS[3]] + PARAGRAPHS[:3]))
+    changes = diff_paragraphs(base, new)
+    assert changes["unchanged"] == 3
+    assert changes["moved"] == [(3, 0)]
+    assert changes["added"] == [] and changes["removed"] == [] and changes["modified"] == []
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+import main
+from section_cache import SectionCache, content_digest
+
+BODY = "".join(f"{n:05d}" for n in range(10_000))  # 50.000 caracteres
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = SectionCache(str(tmp_path / "sections.sqlite"), "test")
+    monkeypatch.setattr(main, "_section_cache", cache)
+    cache.put_blobs([BODY])
+    return cache
+
+
+def _read(*ranges):
+    return asyncio.run(main.read_sections(list(ranges)))["ranges"]
+
+
+def test_reads_ranges_in_order(cache):
+    digest = content_digest(BODY)
+    first, second, missing = _read(
+        {"digest": digest, "offset": 5, "length": 10},
+        {"digest": digest},
+        {"digest": "0" * 64},
+    )
+    assert first == {"digest": digest, "offset": 5, "text": BODY[5:15], "total": len(BODY)}
+    assert second["text"] == BODY[: main.SECTION_MAX_CHARS]
+    assert missing == {"digest": "0" * 64, "offset": 0, "text": None, "total": 0}
+
+
+def test_clamps_offsets_and_lengths(cache):
+    digest = content_digest(BODY)
+    too_long, negative, past_end, tail, empty = _read(
+        {"digest": digest, "offset": 100, "length": 10**9},
+        {"digest": digest, "offset": -50, "length": 5},
+        {"digest": digest, "offset": len(BODY) + 10, "length": 5},
+        {"digest": digest, "offset": len(BODY) - 3, "length": 10},
+        {"digest": digest, "offset": 0, "length": 0},
+    )
+    assert too_long["text"] == BODY[100 : 100 + main.SECTION_MAX_CHARS]
+    assert negative["offset"] == 0 and negative["text"] == BODY[:5]
+    assert past_end["text"] == "" and past_end["total"] == len(BODY)
+    assert tail["text"] == BODY[-3:]
+    assert empty["text"] == ""
+
+
+def test_refs_payload_and_resource_body(cache):
+    extracted = {"sections": {"risk_factors": "Item 1A. Risk Factors", "mdna": ""}, "sources": []}
+    payload = asyncio.run(main._section_payload({"accession": "x"}, extracted, inline=False))
+    assert payload["sections"] == {}
+    ref = payload["section_refs"]["risk_factors"]
+    assert set(payload["section_refs"]) == {"risk_factors"}
+    assert ref["uri"] == main.SECTION_URI.format(digest=ref["digest"]) and ref["length"] == 21
+    assert asyncio.run(main.section_body(ref["digest"])) == "Item 1A. Risk Factors"
+    with pytest.raises(ValueError):
+        asyncio.run(main.section_body("0" * 64))
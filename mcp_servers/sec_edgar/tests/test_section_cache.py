@@ -0,0 +1,94 @@
+from main import ITEM_PATTERNS
+from section_cache import SectionCache, extractor_version
+from segmenter import SEGMENTER_VERSION
+
+PAYLOAD = {"sections": {"risk_factors": "Item 1A. Risk Factors\nWe may fail."}, "sources": [], "full_refs": {}}
+
+
+def test_hit_and_miss_by_accession_and_section_set(tmp_path):
+    cache = SectionCache(str(tmp_path / "sections.sqlite"), "v1")
+    assert cache.get("0000320193-23-000106", ["risk_factors"]) is None
+    cache.put("0000320193-23-000106", ["risk_factors", "mdna"], PAYLOAD)
+
+    # Mismo accession con o sin guiones y las secciones en cualquier orden
+    assert cache.get("000032019323000106", ["mdna", "risk_factors"]) == PAYLOAD
+    assert cache.get("0000320193-23-000106", ["risk_factors"]) is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 2
+    assert cache.stats["writes"] == 1
+
+
+def test_new_extractor_version_invalidates_and_purges(tmp_path):
+    path = str(tmp_path / "sections.sqlite")
+    old = SectionCache(path, "v1")
+    old.put("0000320193-23-000106", ["risk_factors"], PAYLOAD)
+    assert old.get("0000320193-23-000106", ["risk_factors"]) == PAYLOAD
+
+    new = SectionCache(path, "v2")
+    assert new.get("0000320193-23-000106", ["risk_factors"]) is None
+    assert new.stats["purged"] == 1
+    # Las filas de la versión anterior se borraron al abrir el fichero
+    assert SectionCache(path, "v1").get("0000320193-23-000106", ["risk_factors"]) is None
+
+
+def test_extractor_version_tracks_patterns_and_caps():
+    base = extractor_version(ITEM_PATTERNS, SEGMENTER_VERSION, 20000)
+    assert base == extractor_version(dict(ITEM_PATTERNS), SEGMENTER_VERSION, 20000)
+    edited = {**ITEM_PATTERNS, "mdna": ITEM_PATTERNS["mdna"][:1]}
+    assert extractor_version(edited, SEGMENTER_VERSION, 20000) != base
+    assert extractor_version(ITEM_PATTERNS, SEGMENTER_VERSION + "x", 20000) != base
+    assert extractor_version(ITEM_PATTERNS, SEGMENTER_VERSION, 10000) != base
+    assert extractor_version(ITEM_PATTERNS, SEGMENTER_VERSION, 20000, {"risk_factors": 400_000}) != base
+
+
+def test_unwritable_path_degrades_to_misses(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("not a directory")
+    cache = SectionCache(str(blocker / "sections.sqlite"), "v1")
+    cache.put("0000320193-23-000106", ["risk_factors"], PAYLOAD)
+    assert cache.get("0000320193-23-000106", ["risk_factors"]) is None
+    assert cache.stats["writes"] == 0
+
+
+def test_prune_drops_least_recently_used_rows_across_tables(tmp_path, monkeypatch):
+    import section_cache
+
+    clock = iter(range(1000, 2000))
+    monkeypatch.setattr(section_cache.time, "time", lambda: float(next(clock)))
+    monkeypatch.setattr(section_cache, "TOUCH_INTERVAL", 0.0)
+    cache = SectionCache(str(tmp_path / "sections.sqlite"), "v1", max_bytes=10**9)
+    old, kept = "a" * 3000, "b" * 3000
+    digests = list(cache.put_blobs([old, kept]))
+    cache.put_paragraphs(digests[0], "p1", [[0, 3000, 1, [1]]])
+    assert cache.read_blob(digests[1], 0, 1) == ("b", 3000)  # el segundo cuerpo es el más reciente
+
+    cache.max_bytes = 3000
+    assert cache.prune() == 2
+    assert cache.read_blob(digests[0]) is None
+    assert cache.get_paragraphs(digests[0], "p1") is None
+    assert cache.read_blob(digests[1], 0, 1) == ("b", 3000)
+    assert cache.stats["evicted"] == 2
+
+
+def test_writes_past_the_cap_prune_without_explicit_call(tmp_path):
+    cache = SectionCache(str(tmp_path / "sections.sqlite"), "v1", max_bytes=5000)
+    for n in range(5):
+        cache.put_blobs([str(n) * 2000])
+    assert cache.snapshot()["approx_bytes"] <= 5000
+    assert cache.stats["evicted"] == 3
+
+
+def test_old_schema_is_recreated(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "sections.sqlite")
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE section_blobs (digest TEXT PRIMARY KEY, body TEXT NOT NULL, created_at REAL NOT NULL)")
+    con.execute("INSERT INTO section_blobs VALUES ('x', 'old', 0)")
+    con.commit()
+    con.close()
+
+    cache = SectionCache(path, "v1")
+    assert cache.read_blob("x") is None
+    digest = next(iter(cache.put_blobs(["new body"])))
+    assert cache.read_blob(digest) == ("new body", 8)
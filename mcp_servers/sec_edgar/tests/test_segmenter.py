@@ -0,0 +1,60 @@
+import pytest
+
+from bench_segmenter import beautifulsoup_sections, segmenter_sections, synthetic_10k
+from main import ITEM_PATTERNS
+from segmenter import SectionSegmenter, segment_html
+
+HANDWRITTEN = """<html><head><style>p { color: red }</style>
+<script>var s = "<p>Item 1A. Risk Factors</p>";</script></head><body>
+<!-- Item 7. Management's Discussion (comentario) -->
+<div><p>PART I</p><p><b>Item 1A.</b> Risk <i>Factors</i></p>
+<p>Our business depends on <a href="#x">suppliers</a> abroad.</p>
+<p>Item 1B. Unresolved Staff Comments</p><p>None.</p>
+<p>Item 7. Management's Discussion and Analysis</p><p>Revenue grew 8%.</p>
+<p>Item 8. Financial Statements</p><table><tr><td>Revenue</td><td>394,328</td></tr></table>
+<p>Item 9. Changes in Accountants</p></div></body></html>"""
+
+
+@pytest.mark.parametrize("toc", [True, False])
+@pytest.mark.parametrize("chunk_size", [997, 65_536])
+@pytest.mark.parametrize("size", [120_000, 600_000])  # secciones por debajo y por encima de max_chars
+def test_matches_beautifulsoup_extractor_on_synthetic_10k(toc, chunk_size, size):
+    html = synthetic_10k(size, toc=toc)
+    text, spans = segment_html(html, ITEM_PATTERNS, chunk_size=chunk_size)
+    found = {key: text[offset : offset + length] for key, (offset, length) in spans.items()}
+    assert found == beautifulsoup_sections(html)
+    assert set(found) == set(ITEM_PATTERNS)
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 65_536])
+def test_matches_beautifulsoup_extractor_on_handwritten_html(chunk_size):
+    text, spans = segment_html(HANDWRITTEN, ITEM_PATTERNS, chunk_size=chunk_size)
+    found = {key: text[offset : offset + length] for key, (offset, length) in spans.items()}
+    assert found == beautifulsoup_sections(HANDWRITTEN)
+    # Ni el <script> ni el comentario cuentan como encabezado
+    assert found["risk_factors"].startswith("Item 1A.\nRisk\nFactors\nOur business depends on\nsuppliers")
+    assert found["mdna"].startswith("Item 7. Management's Discussion and Analysis\nRevenue grew 8%.")
+
+
+def test_only_requested_sections_and_early_stop():
+    html = synthetic_10k(400_000)
+    segmenter = SectionSegmenter(ITEM_PATTERNS, ["risk_factors"])
+    fed = 0
+    for offset in range(0, len(html), 4096):
+        fed += 1
+        if segmenter.feed(html[offset : offset + 4096]):
+            break
+    text, spans = segmenter.close()
+    assert list(spans) == ["risk_factors"]
+    # La lectura se corta en cuanto la sección pedida está cerrada
+    assert fed * 4096 < len(html)
+    assert text[spans["risk_factors"][0] :].startswith("Item 1A.")
+
+
+def test_limits_raise_the_cap_for_selected_sections():
+    html = synthetic_10k(1_500_000, toc=False)
+    text, spans = segment_html(html, ITEM_PATTERNS, max_chars=20000, limits={"risk_factors": 10**6})
+    assert spans["risk_factors"][1] > 20000
+    assert spans["mdna"][1] == 20000
+    full = text[spans["risk_factors"][0] :][: spans["risk_factors"][1]]
+    assert full[:20000] == segmenter_sections(html)["risk_factors"]
@@ -0,0 +1,30 @@
+"""El servidor lleva copias de ficheros del backend para poder desplegarse solo.
+
+Se editan en el backend y se copian aquí; este test falla si divergen.
+"""
+
+from pathlib import Path
+
+import pytest
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+BACKEND_UTILS = SERVER_DIR.parents[1] / "backend" / "app" / "core" / "utils"
+
+
+@pytest.mark.parametrize("name", ["http_cache.py", "gcra_reserve.lua"])
+def test_vendored_copy_matches_backend(name):
+    original = BACKEND_UTILS / name
+    if not original.exists():
+        pytest.skip("sin el árbol del backend no hay con qué comparar")
+    assert (SERVER_DIR / name).read_bytes() == original.read_bytes()
+
+
+def test_missing_gcra_script_falls_back_to_local_limiting(monkeypatch):
+    import asyncio
+
+    import main
+
+    monkeypatch.setattr(main, "_GCRA_RESERVE", None)
+    bucket = main.SharedBucket("sec.gov", rate=50, redis_url="redis://localhost:6379/0")
+    assert bucket.script is None
+    asyncio.run(bucket.acquire())